@@ -0,0 +1,325 @@
+"""Two-tier cache shared by every worker: an in-process LRU in front of Redis.
+
+Values are JSON (encoded with orjson), stored in Redis with a hard TTL and
+a soft expiry inside the envelope. Past the soft expiry one caller in the
+cluster recomputes the value (it holds a short Redis lock) while everyone
+else keeps serving the stale copy; on a cold miss the others wait briefly
+for that caller's result instead of all computing it at once.
+
+The local tier only keeps entries for cache_local_ttl_seconds at most, and
+invalidations are broadcast over Redis pub/sub so every worker drops its
+local copy. Without redis_url a MemoryBackend stands in for Redis, which
+makes the cache process-local (and is what the tests use).
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+import orjson
+from app.core.config import settings
+from app.core.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+_INVALIDATION_CHANNEL = "invalidate"
+_WAIT_INTERVAL = 0.02  # Seconds between checks while another caller computes a missing value
+
+class _Entry(NamedTuple):
+    value: Any
+    soft_expires_at: float  # Past this the value is stale: still served, but due for a refresh
+    expires_at: float  # Past this the value is gone
+
+class MemoryBackend:
+    """Redis stand-in for tests and single-process deployments: key/values with TTLs, locks and pub/sub"""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._values: Dict[str, tuple] = {}  # key -> (bytes, expires at)
+        self._subscribers: Dict[str, List[Callable[[bytes], None]]] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None or item[1] <= self.clock():
+                self._values.pop(key, None)
+                return None
+            return item[0]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._values[key] = (value, self.clock() + ttl)
+
+    def delete(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def acquire(self, key: str, ttl: float) -> Optional[str]:
+        """SET NX with a TTL: a token if the lock was free, else None"""
+        token = uuid.uuid4().hex
+        with self._lock:
+            item = self._values.get(key)
+            if item is not None and item[1] > self.clock():
+                return None
+            self._values[key] = (token.encode(), self.clock() + ttl)
+        return token
+
+    def release(self, key: str, token: str):
+        with self._lock:
+            item = self._values.get(key)
+            if item is not None and item[0] == token.encode():
+                del self._values[key]
+
+    def publish(self, channel: str, message: bytes):
+        for callback in list(self._subscribers.get(channel, ())):
+            callback(message)
+
+    def subscribe(self, channel: str, callback: Callable[[bytes], None]):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+class RedisBackend:
+    """Redis, with errors logged and treated as misses so an outage only costs the cache"""
+
+    # Delete the lock only if it still holds our token
+    _RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url: str):
+        import redis
+        self._errors = redis.RedisError
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5, health_check_interval=30)
+        # Subscribers block on reads, so they get their own client without a read timeout
+        self._subscriber = redis.Redis.from_url(url, socket_connect_timeout=0.5, health_check_interval=30)
+        self._release = self.client.register_script(self._RELEASE_SCRIPT)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(key)
+        except self._errors as e:
+            logger.warning("Cache read failed: %s", e, extra={"fields": {"key": key}})
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float):
+        try:
+            self.client.set(key, value, px=int(ttl * 1000))
+        except self._errors as e:
+            logger.warning("Cache write failed: %s", e, extra={"fields": {"key": key}})
+
+    def delete(self, keys: Iterable[str]):
+        keys = list(keys)
+        try:
+            if keys:
+                self.client.delete(*keys)
+        except self._errors as e:
+            logger.warning("Cache delete failed: %s", e, extra={"fields": {"keys": keys}})
+
+    def acquire(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        try:
+            return token if self.client.set(key, token, nx=True, px=int(ttl * 1000)) else None
+        except self._errors:
+            return token  # Without Redis every worker computes for itself
+
+    def release(self, key: str, token: str):
+        try:
+            self._release(keys=[key], args=[token])
+        except self._errors:
+            pass
+
+    def publish(self, channel: str, message: bytes):
+        try:
+            self.client.publish(channel, message)
+        except self._errors as e:
+            logger.warning("Cache invalidation publish failed: %s", e, extra={"fields": {"channel": channel}})
+
+    def subscribe(self, channel: str, callback: Callable[[bytes], None]):
+        """Deliver the channel's messages to callback from a background thread, reconnecting as needed"""
+        def listen():
+            delay = 1
+            while True:
+                try:
+                    pubsub = self._subscriber.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(channel)
+                    delay = 1
+                    for message in pubsub.listen():
+                        if message["type"] == "message":
+                            callback(message["data"])
+                except self._errors as e:
+                    logger.warning("Cache invalidation listener disconnected: %s", e, extra={"fields": {"channel": channel}})
+                # Messages may have been missed while disconnected
+                callback(b"*")
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+
+        threading.Thread(target=listen, name="cache-invalidation", daemon=True).start()
+
+class TwoTierCache:
+    """Local LRU tier over a shared backend, with soft expiry, refresh locks and broadcast invalidation"""
+
+    def __init__(
+        self,
+        backend,
+        namespace: Optional[str] = None,
+        local_size: Optional[int] = None,
+        local_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.backend = backend
+        self.prefix = f"{namespace or settings.cache_namespace}:"
+        self.local_size = local_size or settings.cache_local_size
+        self.local_ttl = settings.cache_local_ttl_seconds if local_ttl is None else local_ttl
+        self.clock = clock
+        self.origin = uuid.uuid4().hex
+        self._local: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.backend.subscribe(self.prefix + _INVALIDATION_CHANNEL, self._on_invalidate)
+
+    # Local tier
+
+    def _local_get(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self.clock():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry
+
+    def _local_put(self, key: str, entry: _Entry):
+        # Bounded by local_ttl so a missed invalidation cannot pin a value here
+        entry = entry._replace(expires_at=min(entry.expires_at, self.clock() + self.local_ttl))
+        with self._lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _drop_local(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+    def _on_invalidate(self, message: bytes):
+        if message == b"*":
+            with self._lock:
+                self._local.clear()
+            return
+        payload = orjson.loads(message)
+        if payload["origin"] != self.origin:
+            self._drop_local(payload["keys"])
+
+    # Both tiers
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        entry = self._local_get(key)
+        if entry is not None:
+            CACHE_LOOKUPS.labels("local", "hit").inc()
+            return entry
+        raw = self.backend.get(self.prefix + key)
+        if raw is None:
+            CACHE_LOOKUPS.labels("redis", "miss").inc()
+            return None
+        CACHE_LOOKUPS.labels("redis", "hit").inc()
+        envelope = orjson.loads(raw)
+        entry = _Entry(envelope["v"], envelope["s"], envelope["h"])
+        self._local_put(key, entry)
+        return entry
+
+    def get(self, key: str, default=None):
+        """The cached value, stale or not, or default"""
+        entry = self._lookup(key)
+        return entry.value if entry is not None else default
+
+    def set(self, key: str, value, ttl: Optional[float] = None, soft_ttl: Optional[float] = None) -> _Entry:
+        """Store a JSON-serializable value; it turns stale after soft_ttl (default: half the TTL)"""
+        ttl = ttl or settings.cache_default_ttl_seconds
+        now = self.clock()
+        soft_expires_at, expires_at = now + (soft_ttl if soft_ttl is not None else ttl / 2), now + ttl
+        encoded = orjson.dumps({"v": value, "s": soft_expires_at, "h": expires_at}, option=_ORJSON_OPTIONS)
+        self.backend.set(self.prefix + key, encoded, ttl)
+        # The decoded copy, as other workers read it from Redis: same types, and not the caller's object
+        entry = _Entry(orjson.loads(encoded)["v"], soft_expires_at, expires_at)
+        self._local_put(key, entry)
+        return entry
+
+    def invalidate(self, *keys: str):
+        """Drop keys from Redis and from every worker's local tier"""
+        self.backend.delete(self.prefix + key for key in keys)
+        self._drop_local(keys)
+        self.backend.publish(self.prefix + _INVALIDATION_CHANNEL, orjson.dumps({"origin": self.origin, "keys": keys}))
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            if len(self._key_locks) > self.local_size:
+                # Drop idle locks; a lock in use is kept by whoever holds or waits on it
+                self._key_locks = {k: lock for k, lock in self._key_locks.items() if lock.locked()}
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _recompute(self, key: str, compute: Callable[[], Any], ttl, soft_ttl, block: bool) -> Optional[_Entry]:
+        """Compute and store the value if this caller wins the refresh locks (this process's, then the cluster's).
+
+        None when another caller holds them. With block, callers in this
+        process queue for the local lock and then find the winner's value.
+        """
+        local_lock = self._key_lock(key)
+        acquired = local_lock.acquire(timeout=settings.cache_lock_timeout_seconds) if block else local_lock.acquire(blocking=False)
+        if not acquired:
+            return None
+        try:
+            entry = self._lookup(key)
+            if entry is not None and entry.soft_expires_at > self.clock():
+                return entry  # Refreshed by whoever held the lock before us
+            lock_key = self.prefix + "lock:" + key
+            token = self.backend.acquire(lock_key, settings.cache_lock_timeout_seconds)
+            if token is None:
+                return None
+            try:
+                return self.set(key, compute(), ttl, soft_ttl)
+            finally:
+                self.backend.release(lock_key, token)
+        finally:
+            local_lock.release()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: Optional[float] = None, soft_ttl: Optional[float] = None):
+        """Cached value for key, computing it at most once across the cluster at a time.
+
+        Fresh values are returned as is. Stale ones are returned too, after the
+        one caller that wins the refresh lock has recomputed them. On a miss,
+        callers that lose the lock wait up to cache_lock_timeout_seconds for
+        the winner's value before computing it themselves.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            if entry.soft_expires_at > self.clock():
+                return entry.value
+            try:
+                refreshed = self._recompute(key, compute, ttl, soft_ttl, block=False)
+            except Exception as e:
+                logger.warning("Cache refresh failed, serving stale value: %s", e, extra={"fields": {"key": key}})
+                refreshed = None
+            return (refreshed or entry).value
+        refreshed = self._recompute(key, compute, ttl, soft_ttl, block=True)
+        if refreshed is not None:
+            return refreshed.value
+        deadline = time.monotonic() + settings.cache_lock_timeout_seconds
+        while time.monotonic() < deadline:
+            time.sleep(_WAIT_INTERVAL)
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry.value
+        return self.set(key, compute(), ttl, soft_ttl).value
+
+_cache: Optional[TwoTierCache] = None
+
+def get_cache() -> TwoTierCache:
+    """The process-wide cache, backed by Redis when redis_url is set"""
+    global _cache
+    if _cache is None:
+        _cache = TwoTierCache(RedisBackend(settings.redis_url) if settings.redis_url else MemoryBackend())
+    return _cache
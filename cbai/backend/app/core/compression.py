@@ -0,0 +1,102 @@
+import gzip
+import zlib
+from typing import Iterable, Iterator, List, Optional, Tuple
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # Optional: without it responses are only gzip-compressed
+    brotli = None
+
+_COMPRESSIBLE_TYPES = (
+    b"text/", b"application/json", b"application/problem+json", b"application/javascript",
+    b"application/xml", b"application/x-ndjson",
+)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick brotli or gzip from an Accept-Encoding header, honouring q-values (q=0 refuses)"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best = max(candidates, key=lambda name: accepted.get(name, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.compression_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+def gzip_stream(chunks: Iterable[bytes], level: Optional[int] = None) -> Iterator[bytes]:
+    """Gzip a stream of chunks as it is produced, for streamed responses the middleware leaves alone"""
+    compressor = zlib.compressobj(settings.compression_gzip_level if level is None else level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+class CompressionMiddleware:
+    """Compress complete JSON and text responses larger than a threshold with brotli or gzip.
+
+    Streamed responses (more than one body message, e.g. NDJSON feedback)
+    pass through untouched so their chunks still arrive as they are produced.
+    Strong ETags get an encoding suffix, as each encoding is its own
+    representation; app.core.etags strips it again when comparing.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.compression_min_size if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+            pending, start = start, None
+            body = message.get("body", b"")
+            response_headers: List[Tuple[bytes, bytes]] = list(pending.get("headers") or [])
+            names = {name.lower() for name, _ in response_headers}
+            content_type = next((value for name, value in response_headers if name.lower() == b"content-type"), b"")
+            compressible = content_type.startswith(_COMPRESSIBLE_TYPES) and b"content-encoding" not in names
+            if compressible:
+                # Even uncompressed, the response depends on the header for caches
+                response_headers.append((b"vary", b"Accept-Encoding"))
+            if compressible and encoding and not message.get("more_body") and len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                response_headers = [
+                    _with_encoding_suffix(name, value, encoding)
+                    for name, value in response_headers if name.lower() != b"content-length"
+                ]
+                response_headers += [(b"content-encoding", encoding.encode()), (b"content-length", str(len(body)).encode())]
+                message = {**message, "body": body}
+            await send({**pending, "headers": response_headers})
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+def _with_encoding_suffix(name: bytes, value: bytes, encoding: str) -> Tuple[bytes, bytes]:
+    if name.lower() == b"etag" and value.startswith(b'"'):
+        value = value[:-1] + f'-{encoding}"'.encode()
+    return name, value
@@ -3,8 +3,13 @@ from typing import Optional
 
 class Settings(BaseSettings):
     # Database - Using SQLite for development
-    database_url: str = "sqlite:///./cbai.db"
-    direct_url: Optional[str] = None
+    database_url: str = "sqlite:///./cbai.db"  # Pooled URL; read-only endpoints use it when direct_url is set
+    direct_url: Optional[str] = None  # The primary, for writes and read-your-writes
+    read_replica_url: Optional[str] = None  # Preferred over database_url for read-only endpoints
+    replica_max_lag_seconds: float = 2.0  # Reads fall back to the primary beyond this
+    replica_lag_check_seconds: float = 5.0
+    read_your_writes_seconds: float = 10.0  # Reads go to the primary this long after the caller's last write
+    # (remembered in the cache: set redis_url when running several workers, or each only knows its own)
     
     # JWT
     secret_key: str = "your-secret-key-here-change-in-production"
@@ -15,11 +20,72 @@ class Settings(BaseSettings):
     app_name: str = "CBAI API"
     debug: bool = True
     
+    # Logging: prompts and LLM responses are only logged at DEBUG, for a sample of calls
+    log_level: str = "INFO"
+    log_payload_sample_rate: float = 0.01
+    log_payload_max_chars: int = 2000
+    
+    # Prometheus /metrics: not served unless enabled; with metrics_token, scrapes must send it as a bearer token
+    metrics_enabled: bool = False
+    metrics_token: Optional[str] = None
+    
+    # SQL instrumentation
+    slow_query_ms: float = 200.0
+    n_plus_one_threshold: int = 5  # Same statement shape this many times in one request
+    
     # External APIs
     groq_api_key: Optional[str] = None
+    groq_base_url: str = "https://api.groq.com/openai/v1"
+    
+    # Uploaded resumes (defaults to backend/uploads)
+    upload_dir: Optional[str] = None
+    
+    # Resume parsing budgets; extraction stops early and flags truncation
+    resume_max_pages: int = 40
+    resume_max_chars: int = 60000
+    skill_taxonomy_path: Optional[str] = None  # Defaults to app/data/skill_taxonomy.json
+    
+    # Response compression (brotli when installed and accepted, else gzip)
+    compression_min_size: int = 1024  # Smaller bodies gain little and cost a round of CPU
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4  # Close to gzip's ratio at much lower CPU than the default 11
+    
+    # Account deletion: larger accounts are purged in the background, in batches of interviews
+    purge_inline_max_rows: int = 2000
+    purge_batch_size: int = 200
+    purge_claim_timeout_seconds: float = 600.0  # A purge claim not renewed for this long is taken over
+    
+    # Bulk user import: rows per transaction; processes hashing passwords and parsing resumes for
+    # the CLI (0: one per CPU) and for each web worker (one long-lived pool, started by its first
+    # import; 1: inline); rows per API request, larger cohorts go through the CLI
+    import_batch_size: int = 500
+    import_workers: int = 0
+    import_api_workers: int = 2
+    import_max_rows: int = 1000
+    
+    # Interview export: rows fetched per cursor batch, and bytes written per streamed chunk
+    export_batch_size: int = 500
+    export_chunk_size: int = 64 * 1024
+    
+    # Interviews
+    guided_question_count: int = 8
+    
+    # LLM usage ledger and token quotas (0 disables a quota)
+    llm_user_token_quota: int = 200000
+    llm_guest_token_quota: int = 20000
+    llm_quota_window_hours: int = 24
+    usage_flush_interval_seconds: float = 2.0
+    usage_flush_batch_size: int = 100
     
-    # Redis
+    # Redis, and the two-tier cache in front of it (process-local without redis_url)
     redis_url: Optional[str] = None
+    cache_namespace: str = "cbai:v1"  # Bump to orphan entries written in an old format
+    cache_local_size: int = 1024
+    cache_local_ttl_seconds: float = 30.0  # Bounds staleness if an invalidation message is missed
+    cache_default_ttl_seconds: float = 3600.0
+    cache_lock_timeout_seconds: float = 10.0  # Longest a refresh may hold its lock or others wait for it
+    cache_response_ttl_seconds: float = 600.0  # Serialized profiles and interviews, keyed by ETag
+    cache_resume_ttl_seconds: float = 86400.0  # Parsed resumes, keyed by file hash
     
     class Config:
         env_file = ".env"
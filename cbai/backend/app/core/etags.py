@@ -0,0 +1,41 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response
+
+# Appended to the ETag by CompressionMiddleware, since each encoding is a different representation
+ENCODING_SUFFIXES = ("-gzip", "-br")
+CACHE_CONTROL = "private, no-cache"  # Browsers keep the response but revalidate it every time
+
+def make_etag(kind: str, *validators) -> str:
+    """Strong ETag for a representation, from values that change whenever it does (ids, row versions)"""
+    digest = hashlib.sha1(repr((kind, validators)).encode()).hexdigest()
+    return f'"{digest}"'
+
+def _opaque(tag: str) -> str:
+    """An entity tag without its weak prefix or encoding suffix, for If-None-Match's weak comparison"""
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix + '"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+def matching_etag(request: Request, etag: str) -> Optional[str]:
+    """The If-None-Match tag the current ETag matches, if any; a 304 should echo it back"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    if header.strip() == "*":
+        return etag
+    for tag in header.split(","):
+        if _opaque(tag) == etag:
+            return tag.strip()
+    return None
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
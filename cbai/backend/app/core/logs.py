@@ -0,0 +1,115 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterable, Optional
+from app.core.config import settings
+
+# Request id of the request being handled, for every record logged while handling it
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_URL_RE = re.compile(r"https?://\S+")
+
+_listener: Optional[QueueListener] = None
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any `fields` passed through `extra`"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def setup_logging():
+    """Route the app's logs through a queue so formatting and stdout writes happen off the request path"""
+    global _listener
+    if _listener is not None:
+        return
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    queue_handler = QueueHandler(log_queue)
+    # Filters run on the caller's thread, where the request context is still set
+    queue_handler.addFilter(RequestIdFilter())
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.log_level.upper())
+    app_logger.addHandler(queue_handler)
+    app_logger.propagate = False
+
+def redact(text: str, secrets: Iterable[Optional[str]] = ()) -> str:
+    """Mask known sensitive values (e.g. resume content) and anything that looks like contact details"""
+    for secret in secrets:
+        # Very short values would mask unrelated text
+        if secret and len(secret) >= 8:
+            text = text.replace(secret, f"[REDACTED {len(secret)} chars]")
+    text = _EMAIL_RE.sub("[EMAIL]", text)
+    text = _PHONE_RE.sub("[PHONE]", text)
+    return _URL_RE.sub("[URL]", text)
+
+def log_payload(
+    logger: logging.Logger,
+    label: str,
+    payload: str,
+    secrets: Iterable[Optional[str]] = ()
+):
+    """Log a prompt or LLM response for a sample of calls only, redacted and size-capped"""
+    if not logger.isEnabledFor(logging.DEBUG) or random.random() >= settings.log_payload_sample_rate:
+        return
+    text = redact(payload, secrets)
+    truncated = len(text) > settings.log_payload_max_chars
+    logger.debug(label, extra={"fields": {
+        "payload": text[:settings.log_payload_max_chars],
+        "payload_chars": len(payload),
+        "truncated": truncated,
+    }})
+
+class RequestIdMiddleware:
+    """Assign each request a request id (or reuse X-Request-ID) and echo it in the response"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,115 @@
+import os
+import time
+from typing import List, Optional
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+    CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+from starlette.routing import BaseRoute, Match
+from app.core.query_tracking import current_query_stats
+
+# Buckets tuned for API latencies: sub-millisecond DB work up to slow LLM calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+    ["method", "route"], multiprocess_mode="livesum"
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "Database queries issued while serving a request",
+    ["route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+DB_QUERY_DURATION_PER_REQUEST = Histogram(
+    "db_query_duration_per_request_seconds", "Total database time spent serving a request",
+    ["route"], buckets=LATENCY_BUCKETS
+)
+GROQ_REQUEST_DURATION = Histogram(
+    "groq_request_duration_seconds", "Groq API call latency",
+    ["method"], buckets=LATENCY_BUCKETS
+)
+GROQ_REQUESTS = Counter(
+    "groq_requests_total", "Groq API calls by outcome",
+    ["method", "outcome"]
+)
+GROQ_TOKENS = Counter(
+    "groq_tokens_total", "Tokens used by Groq API calls",
+    ["method", "kind"]
+)
+RESUME_PARSE_DURATION = Histogram(
+    "resume_parse_duration_seconds", "Resume parsing time",
+    ["format"], buckets=LATENCY_BUCKETS
+)
+DB_READ_SESSIONS = Counter(
+    "db_read_sessions_total", "Read-only sessions by the database they were routed to",
+    ["target"]
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Two-tier cache lookups by tier and outcome",
+    ["tier", "outcome"]
+)
+
+def observe_groq_call(method: str, duration: float, usage: Optional[dict] = None, error: bool = False):
+    GROQ_REQUEST_DURATION.labels(method).observe(duration)
+    GROQ_REQUESTS.labels(method, "error" if error else "success").inc()
+    if usage:
+        GROQ_TOKENS.labels(method, "prompt").inc(usage.get("prompt_tokens", 0))
+        GROQ_TOKENS.labels(method, "completion").inc(usage.get("completion_tokens", 0))
+
+def render_metrics() -> bytes:
+    """Exposition text for /metrics, aggregated across workers when running multi-process"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+class MetricsMiddleware:
+    """Record latency, in-flight requests and DB work per route template.
+
+    DB work is read from the QueryStats set up by QueryTrackingMiddleware.
+    """
+
+    def __init__(self, app, routes: List[BaseRoute]):
+        self.app = app
+        # The application's live route list, so routers included later are seen too
+        self.routes = routes
+
+    def _route_label(self, scope) -> str:
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "unmatched")
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = self._route_label(scope)
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, route, status).observe(time.perf_counter() - started)
+            in_flight.dec()
+            stats = current_query_stats.get()
+            if stats is not None:
+                DB_QUERIES_PER_REQUEST.labels(route).observe(stats.queries)
+                DB_QUERY_DURATION_PER_REQUEST.labels(route).observe(stats.duration)
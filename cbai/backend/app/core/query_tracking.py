@@ -0,0 +1,104 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_PLACEHOLDER_LIST_RE = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+)\s*\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+class QueryStats:
+    """Database work done on behalf of one request"""
+    __slots__ = ("queries", "duration", "shapes")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def repeated_shapes(self) -> Dict[str, int]:
+        """Statement shapes run often enough in one request to look like an N+1"""
+        return {
+            shape: count for shape, count in self.shapes.items()
+            if count >= settings.n_plus_one_threshold
+        }
+
+# Shared by the request's event loop task and the worker threads it hands work to
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so the same query with different values counts as one shape"""
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_LIST_RE.sub("(?)", shape)
+    return _LITERAL_RE.sub("?", shape)
+
+def redact_parameters(parameters):
+    """Keep parameter types, drop their values"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: summarize instead of listing every row
+            return [redact_parameters(parameters[0]), f"... {len(parameters)} rows"]
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.duration += elapsed
+        stats.shapes[statement_shape(statement)] += 1
+    if elapsed * 1000 >= settings.slow_query_ms:
+        logger.warning("Slow query", extra={"fields": {
+            "duration_ms": round(elapsed * 1000, 1),
+            "statement": statement_shape(statement),
+            "parameters": redact_parameters(parameters),
+        }})
+
+class QueryTrackingMiddleware:
+    """Count queries per request, flag N+1 patterns and, in debug mode, report totals in headers"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_totals(message):
+            if message["type"] == "http.response.start" and settings.debug:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-query-count", str(stats.queries).encode()),
+                    (b"x-db-query-time-ms", f"{stats.duration * 1000:.1f}".encode()),
+                    (b"x-db-repeated-queries", str(len(stats.repeated_shapes())).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_totals)
+        finally:
+            current_query_stats.reset(token)
+            repeated = stats.repeated_shapes()
+            if repeated:
+                logger.warning("Possible N+1 queries", extra={"fields": {
+                    "path": scope.get("path"),
+                    "queries": stats.queries,
+                    "repeated": repeated,
+                }})
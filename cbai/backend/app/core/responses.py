@@ -0,0 +1,75 @@
+"""orjson-rendered responses, and a trusted fast path for ORM rows.
+
+A route with a response_model normally validates what it returns against
+the model, dumps it to JSON-ready values, then renders it. For rows the
+route has just loaded itself that validation is redundant. trusted_response
+instead copies the schema's fields straight off the ORM objects and
+renders them with orjson in one step. Routes opt in by returning
+trusted_response(...); they keep response_model for the OpenAPI schema.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# OPT_UTC_Z writes UTC datetimes with a "Z", as Pydantic's JSON mode does
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+def dumps(content: Any) -> bytes:
+    """JSON bytes as the app's responses render them"""
+    return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+class FastJSONResponse(ORJSONResponse):
+    """The app's default response class"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def _nested_schema(annotation) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """The model a field holds (if any), and whether it holds a list of them"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_schema(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, List):
+        schema, _ = _nested_schema(get_args(annotation)[0])
+        return schema, True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+@lru_cache(maxsize=None)
+def _projector(schema: Type[BaseModel]) -> Callable[[Any], Dict]:
+    fields = []
+    for name, field in schema.model_fields.items():
+        nested, many = _nested_schema(field.annotation)
+        fields.append((name, _projector(nested) if nested else None, many))
+
+    def project_one(obj) -> Dict:
+        row = {}
+        for name, nested, many in fields:
+            value = getattr(obj, name)
+            if nested is not None and value is not None:
+                value = [nested(item) for item in value] if many else nested(value)
+            row[name] = value
+        return row
+    return project_one
+
+def project(schema: Type[BaseModel], obj) -> Dict:
+    """The schema's fields of a trusted ORM object (and its nested objects), without validation"""
+    return _projector(schema)(obj)
+
+def trusted_response(
+    schema: Type[BaseModel],
+    content,
+    many: bool = False,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> FastJSONResponse:
+    """Render ORM objects (or dicts already projected) as the schema, skipping response_model validation"""
+    if many:
+        content = [project(schema, obj) if not isinstance(obj, dict) else obj for obj in content]
+    elif not isinstance(content, dict):
+        content = project(schema, content)
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
@@ -1,18 +1,191 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import get_database_url
+import logging
+import threading
+import time
+from typing import Optional
+from starlette.requests import HTTPConnection
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.cache import get_cache
+from app.core.config import settings, get_database_url
+from app.core.metrics import DB_READ_SESSIONS
 from app.models import Base
 
+logger = logging.getLogger(__name__)
+
+def _create_engine(url: str) -> Engine:
+    # SQLite connections are shared with worker threads (sync dependencies, WebSocket write-behind)
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine_options = {}
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        # An in-memory database only exists on its one connection (used by the test suite)
+        engine_options["poolclass"] = StaticPool
+    engine = create_engine(url, connect_args=connect_args, **engine_options)
+    if url.startswith("sqlite"):
+        # SQLite only enforces foreign keys, and so ON DELETE CASCADE, when asked to per connection
+        @event.listens_for(engine, "connect")
+        def _enable_foreign_keys(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+    return engine
+
 # Create SQLAlchemy engine using direct URL
-engine = create_engine(get_database_url())
+database_url = get_database_url()
+engine = _create_engine(database_url)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only endpoints may use a replica, or the pooled database_url when
+# direct_url is the primary; None when both name the primary
+read_database_url = settings.read_replica_url or settings.database_url
+read_engine: Optional[Engine] = None
+if read_database_url != database_url:
+    read_engine = _create_engine(read_database_url)
+    if read_engine.dialect.name == "postgresql":
+        read_engine = read_engine.execution_options(postgresql_readonly=True)
+    if not settings.redis_url:
+        logger.warning(
+            "Reads are routed away from the primary but redis_url is unset: recent writes are only "
+            "remembered per process, so a caller served by another worker may not see their own writes"
+        )
+
+# Postgres replicas report how far replay is behind; caught-up replicas and primaries report 0
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+def _recent_write_key(email: str) -> str:
+    return f"recent-write:{email}"
+
+def recently_wrote(email: Optional[str]) -> bool:
+    """Whether this user committed a write within the read-your-writes window (across all workers)"""
+    return bool(email) and get_cache().get(_recent_write_key(email)) is not None
+
+class ReadRouter:
+    """Chooses the database for read-only sessions.
+
+    Reads go to the replica unless it is lagging by more than
+    replica_max_lag_seconds (checked at most every replica_lag_check_seconds)
+    or the caller wrote recently, so they always see their own writes.
+    """
+
+    def __init__(self, replica_engine: Optional[Engine]):
+        self.replica_engine = replica_engine
+        self.replica_sessions = (
+            sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine is not None else None
+        )
+        self._lock = threading.Lock()
+        self._lag: Optional[float] = None
+        self._checked_at = float("-inf")
+
+    def replica_lag(self) -> Optional[float]:
+        """Seconds the replica is behind, or None if it could not be checked"""
+        with self._lock:
+            if time.monotonic() - self._checked_at < settings.replica_lag_check_seconds:
+                return self._lag
+            self._checked_at = time.monotonic()
+        lag: Optional[float] = 0.0
+        if self.replica_engine.dialect.name == "postgresql":
+            try:
+                with self.replica_engine.connect() as connection:
+                    lag = float(connection.execute(_REPLICA_LAG_SQL).scalar())
+            except Exception as e:
+                logger.warning("Replica lag check failed, reading from the primary: %s", e)
+                lag = None
+        self._lag = lag
+        return lag
+
+    def session(self, email: Optional[str] = None) -> Session:
+        if self.replica_sessions is not None and not recently_wrote(email):
+            lag = self.replica_lag()
+            if lag is not None and lag <= settings.replica_max_lag_seconds:
+                DB_READ_SESSIONS.labels("replica").inc()
+                return self.replica_sessions()
+            DB_READ_SESSIONS.labels("primary_lagging").inc()
+        else:
+            DB_READ_SESSIONS.labels("primary").inc()
+        return SessionLocal()
+
+read_router = ReadRouter(read_engine)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _remember_write(session):
+    # Only needed when reads can be routed away from the primary
+    email = session.info.get("writer")
+    if email and read_router.replica_sessions is not None:
+        get_cache().set(_recent_write_key(email), True, settings.read_your_writes_seconds)
+
 # Dependency to get database session
-def get_db():
+def get_db(connection: HTTPConnection):
+    """Session on the primary, for writes and for reads that must see them"""
     db = SessionLocal()
+    db.info["writer"] = connection.headers.get("X-User-Email")
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db(connection: HTTPConnection):
+    """Session for read-only endpoints: the replica or pooled URL unless lagging or the caller just wrote"""
+    db = read_router.session(connection.headers.get("X-User-Email"))
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def upgrade_schema():
+    """Add columns introduced after a table was first created.
+
+    create_all only creates missing tables, so databases created by an older
+    version would otherwise lack newer columns. Only nullable columns, or
+    columns with a server default to fill existing rows, can be added.
+    """
+    existing_tables = set(inspect(engine).get_table_names())
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                default = column.server_default.arg if column.server_default is not None else None
+                if column.name in present or not (column.nullable or isinstance(default, str)):
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                ddl = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                if isinstance(default, str):
+                    ddl += f" NOT NULL DEFAULT '{default}'" if not column.nullable else f" DEFAULT '{default}'"
+                connection.execute(text(ddl))
+            if engine.dialect.name == "postgresql":
+                _upgrade_foreign_keys(connection, inspector, table)
+
+def _upgrade_foreign_keys(connection, inspector, table):
+    """Recreate Postgres foreign keys whose ON DELETE rule has changed.
+
+    SQLite cannot alter constraints in place, so older SQLite databases keep
+    their rules until recreated; deletes there are set-based either way.
+    """
+    existing = {
+        tuple(fk["constrained_columns"]): fk for fk in inspector.get_foreign_keys(table.name)
+    }
+    for constraint in table.foreign_key_constraints:
+        columns = tuple(constraint.column_keys)
+        current = existing.get(columns)
+        wanted = (constraint.ondelete or "NO ACTION").upper()
+        if current is None or (current["options"].get("ondelete") or "NO ACTION").upper() == wanted:
+            continue
+        referred = constraint.elements[0].column.table.name
+        referred_columns = ", ".join(element.column.name for element in constraint.elements)
+        # NOT VALID skips checking existing rows (orphans are purged separately) but enforces the rule from now on
+        connection.execute(text(f'ALTER TABLE {table.name} DROP CONSTRAINT {current["name"]}'))
+        connection.execute(text(
+            f'ALTER TABLE {table.name} ADD CONSTRAINT {current["name"]} FOREIGN KEY ({", ".join(columns)}) '
+            f'REFERENCES {referred} ({referred_columns}) ON DELETE {wanted} NOT VALID'
+        ))
@@ -1,10 +1,19 @@
 # Models package 
+import secrets
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+def initial_row_version() -> int:
+    """Random starting row_version, so a row re-created under a reused id (SQLite) never repeats an old ETag"""
+    return secrets.randbits(30)
+
 from .user import User
 from .profile import Profile
 from .interview import Interview, InterviewQuestion
+from .llm_usage import LLMUsage
+from .skill import Skill, ProfileSkill
+from .stats import InterviewStats, UserStats
+from . import profile_search  # Registers the full-text index DDL with the metadata
 
-__all__ = ["Base", "User", "Profile", "Interview", "InterviewQuestion"] 
\ No newline at end of file
+__all__ = ["Base", "User", "Profile", "Interview", "InterviewQuestion", "LLMUsage", "Skill", "ProfileSkill", "InterviewStats", "UserStats"] 
\ No newline at end of file
@@ -1,14 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from . import Base
+from . import Base, initial_row_version
 
 class Interview(Base):
     __tablename__ = "interviews"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    profile_id = Column(Integer, ForeignKey("profiles.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    profile_id = Column(Integer, ForeignKey("profiles.id", ondelete="CASCADE"))
     job_role = Column(String)
     job_description = Column(Text, nullable=True)
     interview_mode = Column(String)  # "real" or "guided"
@@ -16,22 +16,24 @@ class Interview(Base):
     is_completed = Column(Boolean, default=False)
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    row_version = Column(Integer, nullable=False, default=initial_row_version, server_default="1", onupdate=text("row_version + 1"))  # Random start, bumped by every UPDATE; ETags
     
     # Relationships
     user = relationship("User", back_populates="interviews")
     profile = relationship("Profile", back_populates="interviews")
-    questions = relationship("InterviewQuestion", back_populates="interview")
+    questions = relationship("InterviewQuestion", back_populates="interview", passive_deletes=True)
 
 class InterviewQuestion(Base):
     __tablename__ = "interview_questions"
     
     id = Column(Integer, primary_key=True, index=True)
-    interview_id = Column(Integer, ForeignKey("interviews.id"))
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"))
     question_text = Column(Text)
-    question_type = Column(String)  # "initial", "follow_up"
+    question_type = Column(String)  # "initial", "guided", "follow_up", or "planned" (guided, not yet asked)
     user_response = Column(Text, nullable=True)
     response_timestamp = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    row_version = Column(Integer, nullable=False, default=initial_row_version, server_default="1", onupdate=text("row_version + 1"))
     
     # Relationships
     interview = relationship("Interview", back_populates="questions") 
\ No newline at end of file
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from . import Base
+
+class LLMUsage(Base):
+    __tablename__ = "llm_usage"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # Kept for totals when users go
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="SET NULL"), nullable=True)
+    model = Column(String)
+    purpose = Column(String)  # "question", "question_stream", "question_set", "evaluation"
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    total_tokens = Column(Integer, default=0)
+    latency_ms = Column(Float)  # Wall-clock time of the call as seen by the API
+    queue_time = Column(Float, nullable=True)  # Groq timings, in seconds
+    prompt_time = Column(Float, nullable=True)
+    completion_time = Column(Float, nullable=True)
+    total_time = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    user = relationship("User")
+    interview = relationship("Interview")
+    
+    __table_args__ = (
+        # Quota checks sum a user's tokens over a recent window
+        Index("ix_llm_usage_user_created", "user_id", "created_at"),
+    )
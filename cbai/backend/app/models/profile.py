@@ -1,22 +1,25 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from . import Base
+from . import Base, initial_row_version
 
 class Profile(Base):
     __tablename__ = "profiles"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     full_name = Column(String)
     career_role = Column(String)
     skills = Column(Text)  # JSON string of skills
     resume_content = Column(Text)
+    resume_sections = Column(Text, nullable=True)  # JSON list of [kind, heading, start, end]
     resume_file_path = Column(String, nullable=True)
     resume_file_name = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    row_version = Column(Integer, nullable=False, default=initial_row_version, server_default="1", onupdate=text("row_version + 1"))  # Random start, bumped by every UPDATE; ETags
     
     # Relationships
     user = relationship("User", back_populates="profiles")
-    interviews = relationship("Interview", back_populates="profile") 
\ No newline at end of file
+    interviews = relationship("Interview", back_populates="profile", passive_deletes=True)
+    skill_links = relationship("ProfileSkill", back_populates="profile", passive_deletes="all")  # Removed in bulk 
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""Full-text index over profiles, maintained by the database itself.
+
+SQLite uses an FTS5 external-content table kept in sync by triggers on
+profiles; Postgres uses a generated, weighted tsvector column with a GIN
+index. Both are installed whenever the metadata is created, so existing
+databases pick them up on the next start.
+"""
+from sqlalchemy import event, text
+from . import Base
+
+SEARCH_TABLE = "profile_search"
+SEARCH_COLUMNS = ("full_name", "career_role", "skills", "resume_content")
+
+_SQLITE_COLUMNS = ", ".join(SEARCH_COLUMNS)
+_SQLITE_NEW = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+_SQLITE_OLD = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+
+# "+" and "#" are word characters so that C++ and C# stay searchable
+_SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+        {_SQLITE_COLUMNS}, content='profiles', content_rowid='id', tokenize="unicode61 tokenchars '+#'"
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS profiles_search_insert AFTER INSERT ON profiles BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, {_SQLITE_COLUMNS}) VALUES (new.id, {_SQLITE_NEW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS profiles_search_delete AFTER DELETE ON profiles BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {_SQLITE_COLUMNS}) VALUES ('delete', old.id, {_SQLITE_OLD});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS profiles_search_update AFTER UPDATE OF {_SQLITE_COLUMNS} ON profiles BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {_SQLITE_COLUMNS}) VALUES ('delete', old.id, {_SQLITE_OLD});
+        INSERT INTO {SEARCH_TABLE}(rowid, {_SQLITE_COLUMNS}) VALUES (new.id, {_SQLITE_NEW});
+    END""",
+    # Index rows that existed before the search table did
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')",
+]
+
+# Name and role rank above declared skills, which rank above resume text
+_POSTGRES_DDL = [
+    """ALTER TABLE profiles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(full_name, '') || ' ' || coalesce(career_role, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(skills, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(resume_content, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_profiles_search_vector ON profiles USING GIN (search_vector)",
+]
+
+def install_search_index(connection):
+    """Create the dialect's full-text index over profiles if it does not exist yet"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SEARCH_TABLE}
+        ).first()
+        if not exists:
+            for statement in _SQLITE_DDL:
+                connection.execute(text(statement))
+    elif dialect == "postgresql":
+        for statement in _POSTGRES_DDL:
+            connection.execute(text(statement))
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    install_search_index(connection)
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    # The Postgres column and index go with the profiles table
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from . import Base
+
+class Skill(Base):
+    __tablename__ = "skills"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True)  # Canonical taxonomy name
+    category = Column(String, default="other")
+    
+    # Relationships
+    profile_links = relationship("ProfileSkill", back_populates="skill")
+
+class ProfileSkill(Base):
+    __tablename__ = "profile_skills"
+    
+    profile_id = Column(Integer, ForeignKey("profiles.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    source = Column(String, default="resume")  # "declared" (profile skills field) or "resume"
+    
+    # Relationships
+    profile = relationship("Profile", back_populates="skill_links")
+    skill = relationship("Skill", back_populates="profile_links")
+    
+    __table_args__ = (
+        # "Profiles with skill X" lookups; the primary key already covers per-profile reads
+        Index("ix_profile_skills_skill_profile", "skill_id", "profile_id"),
+    )
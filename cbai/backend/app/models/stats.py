@@ -0,0 +1,61 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from . import Base
+
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator else None
+
+class InterviewStats(Base):
+    """Running totals for one interview, kept up to date as questions are asked and answered"""
+    __tablename__ = "interview_stats"
+
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    questions_asked = Column(Integer, nullable=False, default=0)  # Planned guided questions count once asked
+    questions_answered = Column(Integer, nullable=False, default=0)
+    answer_chars = Column(Integer, nullable=False, default=0)
+    response_seconds = Column(Float, nullable=False, default=0.0)  # Summed time from question to answer
+    completion_seconds = Column(Float, nullable=True)  # Set once the interview is completed
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def answer_rate(self):
+        return _ratio(self.questions_answered, self.questions_asked)
+
+    @property
+    def average_answer_length(self):
+        return _ratio(self.answer_chars, self.questions_answered)
+
+    @property
+    def average_response_seconds(self):
+        return _ratio(self.response_seconds, self.questions_answered)
+
+class UserStats(Base):
+    """Running totals over all of a user's interviews"""
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    interviews_started = Column(Integer, nullable=False, default=0)
+    interviews_completed = Column(Integer, nullable=False, default=0)
+    questions_asked = Column(Integer, nullable=False, default=0)
+    questions_answered = Column(Integer, nullable=False, default=0)
+    answer_chars = Column(Integer, nullable=False, default=0)
+    response_seconds = Column(Float, nullable=False, default=0.0)
+    completion_seconds = Column(Float, nullable=False, default=0.0)  # Summed over completed interviews
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def answer_rate(self):
+        return _ratio(self.questions_answered, self.questions_asked)
+
+    @property
+    def average_answer_length(self):
+        return _ratio(self.answer_chars, self.questions_answered)
+
+    @property
+    def average_response_seconds(self):
+        return _ratio(self.response_seconds, self.questions_answered)
+
+    @property
+    def average_completion_seconds(self):
+        return _ratio(self.completion_seconds, self.interviews_completed)
@@ -16,7 +16,9 @@ class User(Base):
     is_guest = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    purge_requested_at = Column(DateTime(timezone=True), nullable=True)  # Account deletion queued for the purge job
+    purge_started_at = Column(DateTime(timezone=True), nullable=True)  # Claimed by a purger; renewed after each batch
     
     # Relationships
-    profiles = relationship("Profile", back_populates="user")
-    interviews = relationship("Interview", back_populates="user") 
\ No newline at end of file
+    profiles = relationship("Profile", back_populates="user", passive_deletes=True)
+    interviews = relationship("Interview", back_populates="user", passive_deletes=True) 
\ No newline at end of file
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import List
+from app.database import get_read_db
+from app.models.user import User
+from app.models.profile import Profile
+from app.models.interview import Interview
+from app.schemas.fit import FitRankRequest, FitScoreRequest, ProfileFitResponse, JobFitResponse
+from app.services.fit_scoring import fit_index
+
+router = APIRouter(prefix="/api/v1/fit", tags=["fit"])
+
+@router.post("/rank-profiles", response_model=List[ProfileFitResponse])
+def rank_profiles(
+    body: FitRankRequest,
+    request: Request,
+    db: Session = Depends(get_read_db)
+):
+    """Rank profiles by fit to a job description (all profiles for superusers, else your own)"""
+    email = request.headers.get("X-User-Email")
+    if not email:
+        raise HTTPException(status_code=401, detail="Missing user email header")
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    fit_index.refresh(db)
+    return fit_index.rank_profiles(
+        body.job_description, body.job_role, body.limit, None if user.is_superuser else user.id
+    )
+
+@router.post("/profiles/{profile_id}", response_model=List[JobFitResponse])
+def score_profile(
+    profile_id: int,
+    body: FitScoreRequest,
+    request: Request,
+    db: Session = Depends(get_read_db)
+):
+    """Score one profile against job descriptions, before spending quota on an interview"""
+    email = request.headers.get("X-User-Email")
+    if not email:
+        raise HTTPException(status_code=401, detail="Missing user email header")
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    profile = db.query(Profile).filter(Profile.id == profile_id, Profile.user_id == user.id).first()
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    if body.jobs is not None:
+        jobs = [(job.job_description, job.job_role) for job in body.jobs]
+    else:
+        # Distinct job descriptions from the user's interviews
+        rows = db.execute(
+            select(Interview.job_description, Interview.job_role)
+            .where(Interview.user_id == user.id, Interview.job_description.isnot(None), Interview.job_description != "")
+            .distinct()
+        ).all()
+        jobs = [(job_description, job_role) for job_description, job_role in rows]
+    if not jobs:
+        return []
+    fit_index.refresh(db)
+    try:
+        return fit_index.score_profile(profile.id, jobs)
+    except KeyError:
+        # Deleted since it was looked up above
+        raise HTTPException(status_code=404, detail="Profile not found")
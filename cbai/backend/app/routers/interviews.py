@@ -1,18 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Body, Request
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Body, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.websockets import WebSocketState
+from sqlalchemy import insert, func, select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from datetime import datetime
+import asyncio
 import json
-from app.database import get_db
+import logging
+from app.database import get_db, get_read_db
 from app.models.user import User
 from app.models.profile import Profile
 from app.models.interview import Interview, InterviewQuestion
+from app.models.stats import InterviewStats, UserStats
 from app.schemas.interview import (
     InterviewCreate, InterviewResponse, InterviewWithQuestions,
-    QuestionGenerationRequest, QuestionGenerationResponse
+    QuestionGenerationRequest, QuestionGenerationResponse, InterviewStatsResponse, UserStatsResponse
 )
-from app.core.auth import get_current_active_user
+from app.core.auth import get_current_active_user, verify_token
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.etags import make_etag, matching_etag, not_modified, set_etag
+from app.core.responses import project, trusted_response
 from app.services.groq_service import GroqService
+from app.services.interview_session import InterviewSession
+from app.services.account_deletion import delete_interviews
+from app.services import interview_export, interview_stats
+from app.services.answer_scoring import prescore_answers
+from app.services.resume_sections import profile_sections
+from app.services.usage_ledger import enforce_token_quota
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/interviews", tags=["interviews"])
 
@@ -29,6 +47,8 @@ async def create_interview(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     # Verify profile exists and belongs to user
     profile = db.query(Profile).filter(
         Profile.id == interview.profile_id,
@@ -38,6 +58,9 @@ async def create_interview(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
+    if interview.interview_mode == "guided":
+        enforce_token_quota(db, user)
+    
     # Create interview
     db_interview = Interview(
         user_id=user.id,
@@ -48,7 +71,34 @@ async def create_interview(
         duration_minutes=interview.duration_minutes
     )
     db.add(db_interview)
+    db.flush()
+    interview_stats.start_interview(db, db_interview)
+    # Commit before the LLM call, so no transaction (or SQLite write lock) is held while it runs
+    interview_id, user_id = db_interview.id, user.id
+    resume_content = profile.resume_content or ""
     db.commit()
+    
+    # Guided interviews plan the whole question set up front in a single LLM call
+    if interview.interview_mode == "guided":
+        try:
+            groq_service = GroqService(user_id=user_id, interview_id=interview_id)
+            planned_questions = await groq_service.generate_question_set(
+                resume_content=resume_content,
+                job_role=interview.job_role,
+                num_questions=settings.guided_question_count,
+                job_description=interview.job_description
+            )
+            if planned_questions:
+                db.execute(insert(InterviewQuestion), [
+                    {"interview_id": interview_id, "question_text": text, "question_type": "planned"}
+                    for text in planned_questions
+                ])
+                db.commit()
+        except Exception as e:
+            # Fall back to generating questions turn by turn
+            db.rollback()
+            logger.warning("Error planning guided questions: %s", e, extra={"fields": {"interview_id": interview_id}})
+    
     db.refresh(db_interview)
     
     return db_interview
@@ -56,7 +106,7 @@ async def create_interview(
 @router.get("/", response_model=List[InterviewResponse])
 async def get_user_interviews(
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all interviews for the current user"""
     email = request.headers.get("X-User-Email")
@@ -65,14 +115,94 @@ async def get_user_interviews(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    # Validate against row versions before loading any job descriptions
+    etag = make_etag("interviews", user.id, *db.query(
+        func.count(Interview.id), func.sum(Interview.id), func.sum(Interview.row_version), func.max(Interview.started_at)
+    ).filter(Interview.user_id == user.id).one())
+    matched = matching_etag(request, etag)
+    if matched:
+        return not_modified(matched)
     interviews = db.query(Interview).filter(Interview.user_id == user.id).all()
-    return interviews
+    response = trusted_response(InterviewResponse, interviews, many=True)
+    set_etag(response, etag)
+    return response
+
+@router.get("/export")
+async def export_user_interviews(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    compress: bool = Query(False, alias="gzip"),
+    db: Session = Depends(get_read_db)
+):
+    """Stream the current user's interviews and questions as NDJSON or CSV, optionally gzipped"""
+    email = request.headers.get("X-User-Email")
+    if not email:
+        raise HTTPException(status_code=401, detail="Missing user email header")
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    filename = f"interviews.{format}" + (".gz" if compress else "")
+    return StreamingResponse(
+        interview_export.export_interviews(user.id, format, compress, email),
+        media_type="application/gzip" if compress else interview_export.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/stats", response_model=UserStatsResponse)
+async def get_user_stats(
+    request: Request,
+    db: Session = Depends(get_read_db)
+):
+    """Totals over all of the current user's interviews, read from the maintained stats row"""
+    email = request.headers.get("X-User-Email")
+    if not email:
+        raise HTTPException(status_code=401, detail="Missing user email header")
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    stats = db.query(UserStats).filter(UserStats.user_id == user.id).first()
+    if not stats:
+        # No interviews yet
+        stats = UserStats(
+            user_id=user.id, interviews_started=0, interviews_completed=0, questions_asked=0,
+            questions_answered=0, answer_chars=0, response_seconds=0.0, completion_seconds=0.0
+        )
+    return trusted_response(UserStatsResponse, stats)
+
+@router.get("/{interview_id}/stats", response_model=InterviewStatsResponse)
+async def get_interview_stats(
+    interview_id: int,
+    request: Request,
+    db: Session = Depends(get_read_db)
+):
+    """Statistics of one interview, read from its maintained stats row"""
+    email = request.headers.get("X-User-Email")
+    if not email:
+        raise HTTPException(status_code=401, detail="Missing user email header")
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    stats = db.query(InterviewStats).filter(
+        InterviewStats.interview_id == interview_id,
+        InterviewStats.user_id == user.id
+    ).first()
+    if not stats:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return trusted_response(InterviewStatsResponse, stats)
 
 @router.get("/{interview_id}", response_model=InterviewWithQuestions)
 async def get_interview(
     interview_id: int,
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific interview with all questions"""
     email = request.headers.get("X-User-Email")
@@ -81,15 +211,45 @@ async def get_interview(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    interview = db.query(Interview).filter(
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    # Validate against row versions before loading or serializing the transcript
+    validators = db.query(
+        Interview.row_version, Interview.started_at, func.count(InterviewQuestion.id), func.sum(InterviewQuestion.id),
+        func.sum(InterviewQuestion.row_version), func.max(InterviewQuestion.created_at)
+    ).outerjoin(InterviewQuestion, InterviewQuestion.interview_id == Interview.id).filter(
         Interview.id == interview_id,
         Interview.user_id == user.id
-    ).first()
-    
-    if not interview:
+    ).group_by(Interview.id).first()
+    if not validators:
         raise HTTPException(status_code=404, detail="Interview not found")
-    
-    return interview
+    etag = make_etag("interview", interview_id, *validators)
+    matched = matching_etag(request, etag)
+    if matched:
+        return not_modified(matched)
+    # The ETag pins the content, so a cached copy never needs invalidating
+    cache = get_cache()
+    result = cache.get(f"interview:{etag}")
+    if result is None:
+        interview = db.query(Interview).filter(
+            Interview.id == interview_id,
+            Interview.user_id == user.id
+        ).first()
+        
+        if not interview:
+            raise HTTPException(status_code=404, detail="Interview not found")
+        
+        # Planned guided questions stay hidden until they are asked, and are
+        # ordered by when they were asked rather than when they were planned
+        result = project(InterviewWithQuestions, interview)
+        result["questions"] = sorted(
+            (q for q in result["questions"] if q["question_type"] != "planned"),
+            key=lambda q: (q["created_at"], q["id"])
+        )
+        cache.set(f"interview:{etag}", result, settings.cache_response_ttl_seconds)
+    response = trusted_response(InterviewWithQuestions, result)
+    set_etag(response, etag)
+    return response
 
 @router.post("/{interview_id}/generate-question", response_model=QuestionGenerationResponse)
 async def generate_question(
@@ -105,6 +265,8 @@ async def generate_question(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     interview = db.query(Interview).filter(
         Interview.id == interview_id,
         Interview.user_id == user.id
@@ -118,61 +280,37 @@ async def generate_question(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
+    # Guided mode: serve the next planned question from the database, no LLM call
+    if interview.interview_mode == "guided" and not body.follow_up:
+        planned = db.query(InterviewQuestion).filter(
+            InterviewQuestion.interview_id == interview_id,
+            InterviewQuestion.question_type == "planned"
+        ).order_by(InterviewQuestion.id).first()
+        if planned:
+            planned.question_type = "initial" if not body.conversation_history else "guided"
+            planned.created_at = func.now()
+            interview_stats.record_questions_asked(db, user.id, interview_id)
+            db.commit()
+            return QuestionGenerationResponse(
+                question=planned.question_text,
+                question_type=planned.question_type
+            )
+    
+    enforce_token_quota(db, user)
+    
     try:
         # Generate question using Groq API
-        groq_service = GroqService()
-        
-        if not body.conversation_history:
-            # First question
-            question_text = await groq_service.generate_question(
-                resume_content=body.resume_content,
-                job_role=body.job_role,
-                job_description=body.job_description
-            )
-            question_type = "initial"
-            # Build the same prompt as in GroqService for frontend logging
-            system_prompt = f"""
-            You are a world-class interviewer conducting a technical and behavioral interview.
-
-            CANDIDATE BACKGROUND:
-            - Resume Content: {body.resume_content}
-            - Target Job Role: {body.job_role}
-            {f'- Job Description: {body.job_description}' if body.job_description else ''}
-
-            INTERVIEW CONTEXT:
-            - Here is the full conversation history so far (questions and answers):
-            {json.dumps(body.conversation_history, indent=1) if body.conversation_history else '[]'}
-            - For every question, you must generate a follow-up that references specific details from the candidate's resume and/or their previous answers.
-            - Do not ask generic questions. Every question should be tailored to the candidate's unique background and the flow of the interview so far.
-            - If clarification is needed, ask for it in a way that builds on what the candidate has already said.
-            - Only output the next interview question, nothing else.
-            """
-        else:
-            # Follow-up question
-            question_text = await groq_service.generate_follow_up_question(
-                resume_content=body.resume_content,
-                job_role=body.job_role,
-                conversation_history=body.conversation_history,
-                job_description=body.job_description
-            )
-            question_type = "follow_up"
-            # Build the same prompt as in GroqService for frontend logging
-            system_prompt = f"""
-            You are a world-class interviewer conducting a technical and behavioral interview.
-
-            CANDIDATE BACKGROUND:
-            - Resume Content: {body.resume_content}
-            - Target Job Role: {body.job_role}
-            {f'- Job Description: {body.job_description}' if body.job_description else ''}
-
-            INTERVIEW CONTEXT:
-            - Here is the full conversation history so far (questions and answers):
-            {json.dumps(body.conversation_history, indent=1) if body.conversation_history else '[]'}
-            - For every question, you must generate a follow-up that references specific details from the candidate's resume and/or their previous answers.
-            - Do not ask generic questions. Every question should be tailored to the candidate's unique background and the flow of the interview so far.
-            - If clarification is needed, ask for it in a way that builds on what the candidate has already said.
-            - Only output the next interview question, nothing else.
-            """
+        groq_service = GroqService(user_id=user.id, interview_id=interview_id)
+        question_type = "follow_up" if body.conversation_history else "initial"
+        generated = await groq_service.generate_question(
+            resume_content=body.resume_content,
+            job_role=body.job_role,
+            job_description=body.job_description,
+            conversation_history=body.conversation_history,
+            return_prompt=body.include_prompt
+        )
+        # Echo back the exact prompt that was sent, only when the client asks for it
+        question_text, prompt = generated if body.include_prompt else (generated, None)
         
         # Save question to database
         db_question = InterviewQuestion(
@@ -181,17 +319,19 @@ async def generate_question(
             question_type=question_type
         )
         db.add(db_question)
+        interview_stats.record_questions_asked(db, user.id, interview_id)
         db.commit()
         db.refresh(db_question)
         
         return QuestionGenerationResponse(
             question=question_text,
             question_type=question_type,
-            prompt=system_prompt
+            prompt=prompt.text if prompt else None,
+            prompt_version=prompt.version if prompt else None
         )
         
     except Exception as e:
-        print("Error generating question:", str(e))  # DEBUG: print the real error
+        logger.error("Error generating question: %s", e, extra={"fields": {"interview_id": interview_id}})
         raise HTTPException(status_code=500, detail=f"Error generating question: {str(e)}")
 
 @router.post("/{interview_id}/questions/{question_id}/respond")
@@ -209,6 +349,8 @@ async def respond_to_question(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     interview = db.query(Interview).filter(
         Interview.id == interview_id,
         Interview.user_id == user.id
@@ -226,8 +368,13 @@ async def respond_to_question(
         raise HTTPException(status_code=404, detail="Question not found")
     
     # Update question with response
+    answered_at = datetime.utcnow()
+    interview_stats.record_answer(
+        db, user.id, interview_id, question.created_at, response, answered_at,
+        previous_answer=question.user_response, previous_answered_at=question.response_timestamp
+    )
     question.user_response = response
-    question.response_timestamp = datetime.utcnow()
+    question.response_timestamp = answered_at
     db.commit()
     
     return {"message": "Response recorded successfully"}
@@ -245,6 +392,8 @@ async def complete_interview(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     interview = db.query(Interview).filter(
         Interview.id == interview_id,
         Interview.user_id == user.id
@@ -253,8 +402,12 @@ async def complete_interview(
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
+    completed_at = datetime.utcnow()
+    interview_stats.record_completion(
+        db, user.id, interview_id, interview.started_at, completed_at, previous_completed_at=interview.completed_at
+    )
     interview.is_completed = True
-    interview.completed_at = datetime.utcnow()
+    interview.completed_at = completed_at
     db.commit()
     
     return {"message": "Interview completed successfully"}
@@ -272,15 +425,14 @@ async def delete_interview(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    interview = db.query(Interview).filter(
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    deleted = delete_interviews(db, select(Interview.id).where(
         Interview.id == interview_id,
         Interview.user_id == user.id
-    ).first()
-    
-    if not interview:
+    ))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Interview not found")
-    
-    db.delete(interview)
     db.commit()
     
     return {"message": "Interview deleted successfully"}
@@ -289,15 +441,23 @@ async def delete_interview(
 async def generate_feedback(
     interview_id: int,
     request: Request,
+    progressive: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Generate feedback for each answer in the interview."""
+    """Generate feedback for each answer in the interview.
+
+    Answers are pre-scored locally first. With ?progressive=true the response is
+    NDJSON: the pre-score is sent immediately and the LLM feedback follows once
+    Groq has finished.
+    """
     email = request.headers.get("X-User-Email")
     if not email:
         raise HTTPException(status_code=401, detail="Missing user email header")
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     interview = db.query(Interview).filter(
         Interview.id == interview_id,
         Interview.user_id == user.id
@@ -309,17 +469,141 @@ async def generate_feedback(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     # Get all questions and answers
-    questions = db.query(InterviewQuestion).filter(InterviewQuestion.interview_id == interview_id).all()
+    questions = db.query(InterviewQuestion).filter(
+        InterviewQuestion.interview_id == interview_id,
+        InterviewQuestion.question_type != "planned"
+    ).all()
     qa_pairs = [
         {"question": q.question_text, "answer": q.user_response or ""} for q in questions
     ]
+    # Fast local pre-score while the LLM evaluation runs
+    prescore = prescore_answers(questions, profile.resume_content, profile_sections(profile))
     # Generate feedback using GroqService
-    groq_service = GroqService()
-    feedback, raw_response = await groq_service.evaluate_answers(
+    enforce_token_quota(db, user)
+    groq_service = GroqService(user_id=user.id, interview_id=interview_id)
+    evaluation = asyncio.create_task(groq_service.evaluate_answers(
         qa_pairs,
         resume_content=str(profile.resume_content) if profile.resume_content is not None else None,
         job_role=str(interview.job_role) if interview.job_role is not None else None,
         job_description=str(interview.job_description) if interview.job_description is not None else None,
         return_raw_response=True
-    )
-    return {"feedback": feedback, "raw_response": raw_response} 
\ No newline at end of file
+    ))
+    
+    if progressive:
+        async def stream_feedback():
+            yield json.dumps({"type": "prescore", **prescore}) + "\n"
+            feedback, raw_response = await evaluation
+            yield json.dumps({"type": "feedback", "feedback": feedback, "raw_response": raw_response}) + "\n"
+        return StreamingResponse(stream_feedback(), media_type="application/x-ndjson")
+    
+    feedback, raw_response = await evaluation
+    return {"feedback": feedback, "raw_response": raw_response, "prescore": prescore}
+
+def _websocket_email(websocket: WebSocket) -> Optional[str]:
+    """Resolve the user's email from a bearer token (query param, as browsers cannot set headers) or X-User-Email"""
+    token = websocket.query_params.get("token")
+    if token:
+        try:
+            return verify_token(token, HTTPException(status_code=401)).email
+        except HTTPException:
+            return None
+    return websocket.headers.get("X-User-Email")
+
+async def _push_next_question(websocket: WebSocket, session: InterviewSession, follow_up: bool = False):
+    """Send the next question to the client, streaming it as it is generated"""
+    if session.planned and not follow_up:
+        # Guided mode: the question is already planned, no LLM call
+        turn = session.ask_planned()
+        await websocket.send_json({"type": "question_start", "question_type": turn["question_type"]})
+        await websocket.send_json({"type": "question_delta", "delta": turn["question"]})
+    else:
+        question_type = "follow_up" if session.turns else "initial"
+        await websocket.send_json({"type": "question_start", "question_type": question_type})
+        await asyncio.to_thread(session.enforce_token_quota)
+        groq_service = GroqService(user_id=session.user_id, interview_id=session.interview_id)
+        chunks = []
+        async for delta in groq_service.stream_follow_up_question(
+            resume_content=session.resume_content,
+            job_role=session.job_role,
+            conversation_history=session.conversation_history,
+            job_description=session.job_description
+        ):
+            chunks.append(delta)
+            await websocket.send_json({"type": "question_delta", "delta": delta})
+        turn = session.ask("".join(chunks).strip(), question_type)
+    await websocket.send_json({
+        "type": "question_end",
+        "question": turn["question"],
+        "question_type": turn["question_type"],
+        "index": len(session.turns) - 1
+    })
+
+@router.websocket("/{interview_id}/session")
+async def interview_session(websocket: WebSocket, interview_id: int):
+    """Stateful interview session.
+
+    Authenticates once (?token= or X-User-Email), keeps the interview context
+    in memory, streams each next question and persists turns in the
+    background. Client messages: {"type": "next", "follow_up": false},
+    {"type": "answer", "answer": "...", "next": true} and {"type": "complete"}.
+    If a background write fails the client gets {"type": "error", "fatal": true}
+    and the socket is closed (1011), as later turns could not be saved.
+    """
+    email = _websocket_email(websocket)
+    session = await asyncio.to_thread(InterviewSession.load, email, interview_id) if email else None
+    if session is None:
+        await websocket.close(code=4404 if email else 4401)
+        return
+    
+    await websocket.accept()
+
+    async def write_failed(error: Exception):
+        if websocket.client_state == WebSocketState.CONNECTED:
+            try:
+                await websocket.send_json({"type": "error", "fatal": True, "detail": "Could not save the interview"})
+                await websocket.close(code=1011)
+            except Exception:
+                pass  # The client went away meanwhile
+
+    session.start(on_write_error=write_failed)
+    try:
+        await websocket.send_json({
+            "type": "session",
+            "interview_id": session.interview_id,
+            "job_role": session.job_role,
+            "interview_mode": session.interview_mode,
+            "questions": [
+                {"question": t["question"], "question_type": t["question_type"], "answer": t["answer"]}
+                for t in session.turns
+            ]
+        })
+        while session.write_error is None:
+            message = await websocket.receive_json()
+            message_type = message.get("type")
+            try:
+                if message_type == "next":
+                    await _push_next_question(websocket, session, follow_up=bool(message.get("follow_up")))
+                elif message_type == "answer":
+                    session.answer(str(message.get("answer", "")))
+                    await websocket.send_json({"type": "answer_recorded", "index": len(session.turns) - 1})
+                    if message.get("next", True):
+                        await _push_next_question(websocket, session, follow_up=bool(message.get("follow_up")))
+                elif message_type == "complete":
+                    session.complete()
+                    # Confirm only once everything is saved
+                    await session.flush()
+                    if session.write_error is None:
+                        await websocket.send_json({"type": "completed"})
+                    break
+                else:
+                    await websocket.send_json({"type": "error", "detail": f"Unknown message type: {message_type}"})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.close()
+    if websocket.client_state == WebSocketState.CONNECTED:
+        await websocket.close()
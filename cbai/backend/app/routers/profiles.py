@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from typing import List
 import json
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User
 from app.models.profile import Profile
-from app.schemas.profile import ProfileCreate, ProfileUpdate, ProfileResponse, GuestProfileCreate
+from app.models.skill import ProfileSkill, Skill
+from app.schemas.profile import ProfileCreate, ProfileUpdate, ProfileResponse, GuestProfileCreate, ProfileSkillResponse, ProfileSearchResponse
 from app.core.auth import get_current_active_user
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.etags import make_etag, matching_etag, not_modified, set_etag
+from app.core.responses import project, trusted_response
+from app.services import profile_search
+from app.services.account_deletion import delete_profiles
 from app.services.resume_parser import ResumeParser
+from app.services.resume_sections import apply_resume_sections
+from app.services.skill_index import sync_profile_skills
 import os
 import uuid
 
 router = APIRouter(prefix="/api/v1/profiles", tags=["profiles"])
 
-UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'uploads')
+UPLOAD_DIR = settings.upload_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'uploads')
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 @router.post("/", response_model=ProfileResponse)
@@ -29,6 +39,8 @@ async def create_profile(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     db_profile = Profile(
         user_id=user.id,
         full_name=profile.full_name,
@@ -38,7 +50,10 @@ async def create_profile(
         resume_file_path=profile.resume_file_path,
         resume_file_name=profile.resume_file_name
     )
+    apply_resume_sections(db_profile)
     db.add(db_profile)
+    db.flush()
+    sync_profile_skills(db, [db_profile], replace=False)
     db.commit()
     db.refresh(db_profile)
     return db_profile
@@ -56,6 +71,8 @@ async def create_guest_profile(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     if user.is_guest != True:
         raise HTTPException(status_code=400, detail="This endpoint is for guest users only")
     
@@ -68,7 +85,10 @@ async def create_guest_profile(
         resume_file_path=profile.resume_file_path,
         resume_file_name=profile.resume_file_name
     )
+    apply_resume_sections(db_profile)
     db.add(db_profile)
+    db.flush()
+    sync_profile_skills(db, [db_profile], replace=False)
     db.commit()
     db.refresh(db_profile)
     return db_profile
@@ -94,7 +114,7 @@ async def upload_resume(
     try:
         # Parse resume content
         resume_parser = ResumeParser()
-        resume_content = await resume_parser.parse_file(file)
+        parsed = await resume_parser.parse_upload(file)
         file.file.seek(0)  # Reset file pointer after reading
         # Save the file to disk
         file_location = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}_{file.filename}")
@@ -102,8 +122,10 @@ async def upload_resume(
             f.write(await file.read())
         return {
             "message": "Resume uploaded and parsed successfully",
-            "resume_content": resume_content,
-            "filename": file.filename
+            "resume_content": parsed.text,
+            "filename": file.filename,
+            "pages_parsed": parsed.pages,
+            "truncated": parsed.truncated
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
@@ -111,7 +133,7 @@ async def upload_resume(
 @router.get("/", response_model=List[ProfileResponse])
 async def get_user_profiles(
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all profiles for the current user"""
     email = request.headers.get("X-User-Email")
@@ -120,14 +142,44 @@ async def get_user_profiles(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    # Validate against row versions before loading any resumes
+    etag = make_etag("profiles", user.id, *db.query(
+        func.count(Profile.id), func.sum(Profile.id), func.sum(Profile.row_version), func.max(Profile.created_at)
+    ).filter(Profile.user_id == user.id).one())
+    matched = matching_etag(request, etag)
+    if matched:
+        return not_modified(matched)
     profiles = db.query(Profile).filter(Profile.user_id == user.id).all()
-    return profiles
+    response = trusted_response(ProfileResponse, profiles, many=True)
+    set_etag(response, etag)
+    return response
+
+@router.get("/search", response_model=ProfileSearchResponse)
+async def search_profiles(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=500),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """Full-text search over profiles, best matches first (all profiles for superusers, else your own)"""
+    email = request.headers.get("X-User-Email")
+    if not email:
+        raise HTTPException(status_code=401, detail="Missing user email header")
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return profile_search.search_profiles(db, q, page, page_size, None if user.is_superuser else user.id)
 
 @router.get("/{profile_id}", response_model=ProfileResponse)
 async def get_profile(
     profile_id: int,
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific profile"""
     email = request.headers.get("X-User-Email")
@@ -136,15 +188,36 @@ async def get_profile(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    profile = db.query(Profile).filter(
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    # Validate against the row version before loading the resume
+    validators = db.query(Profile.row_version, Profile.created_at).filter(
         Profile.id == profile_id,
         Profile.user_id == user.id
     ).first()
-    
-    if not profile:
+    if not validators:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    return profile
+    etag = make_etag("profile", profile_id, *validators)
+    matched = matching_etag(request, etag)
+    if matched:
+        return not_modified(matched)
+    # The ETag pins the content, so a cached copy never needs invalidating
+    cache = get_cache()
+    result = cache.get(f"profile:{etag}")
+    if result is None:
+        profile = db.query(Profile).filter(
+            Profile.id == profile_id,
+            Profile.user_id == user.id
+        ).first()
+        
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        
+        result = project(ProfileResponse, profile)
+        cache.set(f"profile:{etag}", result, settings.cache_response_ttl_seconds)
+    response = trusted_response(ProfileResponse, result)
+    set_etag(response, etag)
+    return response
 
 @router.put("/{profile_id}", response_model=ProfileResponse)
 async def update_profile(
@@ -160,6 +233,8 @@ async def update_profile(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     db_profile = db.query(Profile).filter(
         Profile.id == profile_id,
         Profile.user_id == user.id
@@ -172,6 +247,10 @@ async def update_profile(
     update_data = profile_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_profile, field, value)
+    if "resume_content" in update_data:
+        apply_resume_sections(db_profile)
+    if "resume_content" in update_data or "skills" in update_data:
+        sync_profile_skills(db, [db_profile])
     
     db.commit()
     db.refresh(db_profile)
@@ -190,14 +269,37 @@ async def delete_profile(
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    db_profile = db.query(Profile).filter(
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    deleted = delete_profiles(db, select(Profile.id).where(
         Profile.id == profile_id,
         Profile.user_id == user.id
-    ).first()
-    
-    if not db_profile:
+    ))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    db.delete(db_profile)
     db.commit()
-    return {"message": "Profile deleted successfully"} 
\ No newline at end of file
+    return {"message": "Profile deleted successfully"}
+
+@router.get("/{profile_id}/skills", response_model=List[ProfileSkillResponse])
+async def get_profile_skills(
+    profile_id: int,
+    request: Request,
+    db: Session = Depends(get_read_db)
+):
+    """Get the normalized skills of a profile"""
+    email = request.headers.get("X-User-Email")
+    if not email:
+        raise HTTPException(status_code=401, detail="Missing user email header")
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    rows = db.execute(
+        select(Skill.name, Skill.category, ProfileSkill.source)
+        .join(ProfileSkill, ProfileSkill.skill_id == Skill.id)
+        .join(Profile, Profile.id == ProfileSkill.profile_id)
+        .where(Profile.id == profile_id, Profile.user_id == user.id)
+        .order_by(Skill.name)
+    ).all()
+    return [ProfileSkillResponse(name=name, category=category, source=source) for name, category, source in rows] 
\ No newline at end of file
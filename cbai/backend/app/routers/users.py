@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from app.core.auth import get_current_active_user
+from app.core.config import settings
 from app.database import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse
+from app.schemas.user import UserCreate, UserImportResponse, UserResponse
+from app.services import bulk_import
+from app.services.account_deletion import request_account_deletion
 from passlib.context import CryptContext
 
 router = APIRouter(prefix="/api/v1/users", tags=["users"])
@@ -46,4 +52,52 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user 
\ No newline at end of file
+    return user
+
+@router.delete("/me")
+def delete_current_user(user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
+    """Delete the calling user's account and everything it owns (bearer token required).
+
+    Small accounts are deleted before responding; larger ones are deactivated
+    and purged in the background (202).
+    """
+    db.info["writer"] = user.email
+    if request_account_deletion(db, user):
+        return {"message": "Account deleted successfully"}
+    return JSONResponse(status_code=202, content={"message": "Account deletion scheduled"})
+
+@router.post("/import", response_model=UserImportResponse)
+def import_users(
+    request: Request,
+    file: UploadFile = File(...),
+    resumes: List[UploadFile] = File([]),
+    db: Session = Depends(get_db)
+):
+    """Create users, with optional profiles, from a CSV or JSONL file (superusers only).
+
+    Rows name their resume in resume_file, matched against the uploaded
+    resumes' file names. Rows that fail are listed in errors; the rest are
+    created. Files over import_max_rows rows are refused (413): import
+    those with `python -m app.services.bulk_import`.
+    """
+    email = request.headers.get("X-User-Email")
+    if not email:
+        raise HTTPException(status_code=401, detail="Missing user email header")
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    if not user.is_superuser:
+        raise HTTPException(status_code=403, detail="Only superusers can import users")
+    try:
+        records, errors = bulk_import.read_records(file.file.read(), file.filename or "")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(records) + len(errors) > settings.import_max_rows:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.import_max_rows} rows per request; import larger files with the CLI"
+        )
+    files = {resume.filename: resume.file.read() for resume in resumes if resume.filename}
+    return bulk_import.import_users(db, records, files, errors, pool=bulk_import.shared_pool())
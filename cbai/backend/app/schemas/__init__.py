@@ -1,16 +1,24 @@
 # Schemas package 
 from .user import UserBase, UserCreate, UserLogin, UserResponse, Token, TokenData
-from .profile import ProfileBase, ProfileCreate, ProfileUpdate, ProfileResponse, GuestProfileCreate
+from .profile import (
+    ProfileBase, ProfileCreate, ProfileUpdate, ProfileResponse, GuestProfileCreate, ProfileSkillResponse,
+    ProfileSearchResult, ProfileSearchResponse
+)
 from .interview import (
     InterviewBase, InterviewCreate, InterviewResponse, 
     InterviewQuestionBase, InterviewQuestionCreate, InterviewQuestionResponse,
     InterviewWithQuestions, QuestionGenerationRequest, QuestionGenerationResponse
 )
+from .fit import (
+    JobDescriptionIn, FitRankRequest, FitScoreRequest, SkillFit, ProfileFitResponse, JobFitResponse
+)
 
 __all__ = [
     "UserBase", "UserCreate", "UserLogin", "UserResponse", "Token", "TokenData",
-    "ProfileBase", "ProfileCreate", "ProfileUpdate", "ProfileResponse", "GuestProfileCreate",
+    "ProfileBase", "ProfileCreate", "ProfileUpdate", "ProfileResponse", "GuestProfileCreate", "ProfileSkillResponse",
+    "ProfileSearchResult", "ProfileSearchResponse",
     "InterviewBase", "InterviewCreate", "InterviewResponse",
     "InterviewQuestionBase", "InterviewQuestionCreate", "InterviewQuestionResponse",
-    "InterviewWithQuestions", "QuestionGenerationRequest", "QuestionGenerationResponse"
+    "InterviewWithQuestions", "QuestionGenerationRequest", "QuestionGenerationResponse",
+    "JobDescriptionIn", "FitRankRequest", "FitScoreRequest", "SkillFit", "ProfileFitResponse", "JobFitResponse"
 ] 
\ No newline at end of file
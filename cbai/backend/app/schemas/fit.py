@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+class JobDescriptionIn(BaseModel):
+    job_description: str = Field(..., min_length=1)
+    job_role: Optional[str] = None
+
+class FitRankRequest(JobDescriptionIn):
+    limit: int = Field(20, ge=1, le=100)
+
+class FitScoreRequest(BaseModel):
+    jobs: Optional[List[JobDescriptionIn]] = None  # Defaults to the job descriptions of your interviews
+
+class SkillFit(BaseModel):
+    score: float  # Cosine similarity of the TF-IDF vectors, 0-100
+    matching_skills: List[str]
+    missing_skills: List[str]
+
+class ProfileFitResponse(SkillFit):
+    profile_id: int
+    full_name: Optional[str] = None
+    career_role: Optional[str] = None
+
+class JobFitResponse(SkillFit):
+    jd_hash: str
+    job_role: Optional[str] = None
@@ -24,7 +24,7 @@ class InterviewResponse(InterviewBase):
 
 class InterviewQuestionBase(BaseModel):
     question_text: str
-    question_type: str  # "initial" or "follow_up"
+    question_type: str  # "initial", "guided", "follow_up" or "planned"
 
 class InterviewQuestionCreate(InterviewQuestionBase):
     interview_id: int
@@ -47,8 +47,36 @@ class QuestionGenerationRequest(BaseModel):
     resume_content: str
     job_role: str
     job_description: Optional[str] = None
+    follow_up: bool = False  # Guided mode: ask an answer-driven follow-up instead of the next planned question
+    include_prompt: bool = False  # Echo back the exact prompt sent to Groq
 
 class QuestionGenerationResponse(BaseModel):
     question: str
     question_type: str
-    prompt: Optional[str] = None 
\ No newline at end of file
+    prompt: Optional[str] = None
+    prompt_version: Optional[str] = None
+
+class InterviewStatsResponse(BaseModel):
+    interview_id: int
+    questions_asked: int
+    questions_answered: int
+    answer_rate: Optional[float] = None  # Answered / asked, null before the first question
+    average_answer_length: Optional[float] = None  # Characters
+    average_response_seconds: Optional[float] = None  # From question to answer
+    completion_seconds: Optional[float] = None
+    
+    class Config:
+        from_attributes = True
+
+class UserStatsResponse(BaseModel):
+    interviews_started: int
+    interviews_completed: int
+    questions_asked: int
+    questions_answered: int
+    answer_rate: Optional[float] = None
+    average_answer_length: Optional[float] = None
+    average_response_seconds: Optional[float] = None
+    average_completion_seconds: Optional[float] = None
+    
+    class Config:
+        from_attributes = True
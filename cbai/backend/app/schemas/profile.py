@@ -35,4 +35,24 @@ class GuestProfileCreate(BaseModel):
     skills: str
     resume_content: Optional[str] = None
     resume_file_path: Optional[str] = None
-    resume_file_name: Optional[str] = None 
\ No newline at end of file
+    resume_file_name: Optional[str] = None 
+
+class ProfileSkillResponse(BaseModel):
+    name: str
+    category: str
+    source: str
+
+class ProfileSearchResult(BaseModel):
+    id: int
+    user_id: int
+    full_name: Optional[str] = None
+    career_role: Optional[str] = None
+    rank: float
+    snippet: Optional[str] = None
+
+class ProfileSearchResponse(BaseModel):
+    query: str
+    page: int
+    page_size: int
+    total: int
+    results: List[ProfileSearchResult]
\ No newline at end of file
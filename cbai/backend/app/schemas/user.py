@@ -10,6 +10,29 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
 
+class UserImportRow(UserCreate):
+    """One user of a bulk import, with an optional profile"""
+    career_role: Optional[str] = None
+    skills: Optional[str] = None  # JSON list or free text, as on profiles
+    resume_file: Optional[str] = None  # Name of one of the uploaded resume files
+    resume_content: Optional[str] = None
+
+class ImportedUser(BaseModel):
+    row: int  # 1-based position in the import file
+    id: int
+    email: str
+    profile_id: Optional[int] = None
+
+class ImportRowError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    error: str
+
+class UserImportResponse(BaseModel):
+    created: int
+    users: List[ImportedUser]
+    errors: List[ImportRowError]
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
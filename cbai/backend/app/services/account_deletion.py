@@ -0,0 +1,222 @@
+"""Set-based deletes of interviews, profiles and whole accounts.
+
+Each function removes a tree with a fixed handful of DELETE statements,
+children first, however many rows are involved. They do not rely on the
+ON DELETE CASCADE rules, so they also work on databases created before
+those rules existed. LLM usage records are kept, with their references
+cleared, so usage totals survive.
+
+Large accounts are purged by AccountPurger on a background thread in
+batches of interviews, each in its own short transaction. A purger first
+claims the account, so when several workers resume pending purges after a
+restart only one of them purges each account.
+
+    python -m app.services.account_deletion purge someone@example.com
+    python -m app.services.account_deletion purge-pending
+    python -m app.services.account_deletion purge-orphans
+"""
+import argparse
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Union
+from sqlalchemy import Select, delete, func, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import Base, SessionLocal, engine, upgrade_schema
+from app.models.interview import Interview, InterviewQuestion
+from app.models.llm_usage import LLMUsage
+from app.models.profile import Profile
+from app.models.skill import ProfileSkill
+from app.models.stats import UserStats
+from app.models.user import User
+from app.services import interview_stats
+from app.services.usage_ledger import usage_ledger
+
+logger = logging.getLogger(__name__)
+
+Ids = Union[Iterable[int], Select]  # Literal ids, or a SELECT of them, run as a subquery of each statement
+
+def _execute(db: Session, statement) -> int:
+    # Nothing deleted here is expected to be loaded in the session, so skip syncing it
+    return db.execute(statement.execution_options(synchronize_session=False)).rowcount
+
+def delete_interviews(db: Session, interview_ids: Ids) -> int:
+    """Delete interviews and their questions; returns the number of interviews deleted"""
+    if not isinstance(interview_ids, Select):
+        interview_ids = list(interview_ids)
+        if not interview_ids:
+            return 0
+    # Records still buffered for these interviews would otherwise be written after they are gone
+    usage_ledger.flush()
+    interview_stats.forget_interviews(db, interview_ids)
+    _execute(db, delete(InterviewQuestion).where(InterviewQuestion.interview_id.in_(interview_ids)))
+    _execute(db, update(LLMUsage).where(LLMUsage.interview_id.in_(interview_ids)).values(interview_id=None))
+    return _execute(db, delete(Interview).where(Interview.id.in_(interview_ids)))
+
+def delete_profiles(db: Session, profile_ids: Ids) -> int:
+    """Delete profiles with their interviews, questions and skill links; returns the number of profiles deleted"""
+    if not isinstance(profile_ids, Select):
+        profile_ids = list(profile_ids)
+        if not profile_ids:
+            return 0
+    delete_interviews(db, select(Interview.id).where(Interview.profile_id.in_(profile_ids)))
+    _execute(db, delete(ProfileSkill).where(ProfileSkill.profile_id.in_(profile_ids)))
+    return _execute(db, delete(Profile).where(Profile.id.in_(profile_ids)))
+
+def delete_user(db: Session, user_id: int) -> int:
+    """Delete a user and everything they own; returns 1 if the user existed"""
+    delete_interviews(db, select(Interview.id).where(Interview.user_id == user_id))
+    delete_profiles(db, select(Profile.id).where(Profile.user_id == user_id))
+    _execute(db, delete(UserStats).where(UserStats.user_id == user_id))
+    _execute(db, update(LLMUsage).where(LLMUsage.user_id == user_id).values(user_id=None))
+    return _execute(db, delete(User).where(User.id == user_id))
+
+def account_size(db: Session, user_id: int) -> int:
+    """Rows a user's deletion would remove, roughly: their interviews' questions plus interviews and profiles"""
+    questions = select(func.count(InterviewQuestion.id)).join(Interview, Interview.id == InterviewQuestion.interview_id)
+    return db.execute(select(
+        questions.where(Interview.user_id == user_id).scalar_subquery()
+        + select(func.count(Interview.id)).where(Interview.user_id == user_id).scalar_subquery()
+        + select(func.count(Profile.id)).where(Profile.user_id == user_id).scalar_subquery()
+    )).scalar()
+
+def purge_orphans(db: Session) -> Dict[str, int]:
+    """Delete rows whose parent is already gone, left behind by deletes before the cascades existed"""
+    missing_interviews = select(Interview.id).where(
+        ~select(User.id).where(User.id == Interview.user_id).exists()
+        | (Interview.profile_id.is_not(None) & ~select(Profile.id).where(Profile.id == Interview.profile_id).exists())
+    )
+    counts = {"interviews": delete_interviews(db, missing_interviews)}
+    counts["profiles"] = delete_profiles(db, select(Profile.id).where(
+        ~select(User.id).where(User.id == Profile.user_id).exists()
+    ))
+    counts["questions"] = _execute(db, delete(InterviewQuestion).where(
+        ~select(Interview.id).where(Interview.id == InterviewQuestion.interview_id).exists()
+    ))
+    counts["profile_skills"] = _execute(db, delete(ProfileSkill).where(
+        ~select(Profile.id).where(Profile.id == ProfileSkill.profile_id).exists()
+    ))
+    return counts
+
+def claim_purge(user_id: int) -> bool:
+    """Claim a pending purge for this process; False if it is gone or another purger holds a live claim"""
+    now = datetime.utcnow()
+    expired = now - timedelta(seconds=settings.purge_claim_timeout_seconds)
+    with SessionLocal() as db:
+        claimed = _execute(db, update(User).where(
+            User.id == user_id,
+            User.purge_requested_at.is_not(None),
+            User.purge_started_at.is_(None) | (User.purge_started_at < expired)
+        ).values(purge_started_at=now))
+        db.commit()
+    return claimed == 1
+
+def purge_user(user_id: int, batch_size: Optional[int] = None) -> bool:
+    """Delete a user's account in batches of interviews, committing after each; False if the user is gone"""
+    batch_size = batch_size or settings.purge_batch_size
+    with SessionLocal() as db:
+        while True:
+            batch = select(Interview.id).where(Interview.user_id == user_id).order_by(Interview.id).limit(batch_size)
+            deleted = delete_interviews(db, batch)
+            # Renew the claim, if any, so a long purge is not taken over
+            _execute(db, update(User).where(User.id == user_id, User.purge_started_at.is_not(None))
+                     .values(purge_started_at=datetime.utcnow()))
+            db.commit()
+            if deleted < batch_size:
+                break
+        found = delete_user(db, user_id)
+        db.commit()
+    logger.info("Purged account", extra={"fields": {"user_id": user_id, "found": bool(found)}})
+    return bool(found)
+
+class AccountPurger:
+    """Purges queued accounts one at a time on a background thread"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[int]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def enqueue(self, user_id: int):
+        self._queue.put(user_id)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="account-purger", daemon=True)
+                self._thread.start()
+
+    def resume_pending(self):
+        """Queue accounts whose purge was requested but not finished (e.g. before a restart)"""
+        with SessionLocal() as db:
+            user_ids = list(db.scalars(select(User.id).where(User.purge_requested_at.is_not(None))))
+        for user_id in user_ids:
+            self.enqueue(user_id)
+
+    def join(self):
+        """Wait until every queued account has been purged"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            user_id = self._queue.get()
+            try:
+                if claim_purge(user_id):
+                    purge_user(user_id)
+            except Exception as e:
+                # The mark stays, so a later resume_pending retries it once the claim expires
+                logger.error("Error purging account: %s", e, extra={"fields": {"user_id": user_id}})
+            finally:
+                self._queue.task_done()
+
+account_purger = AccountPurger()
+
+def request_account_deletion(db: Session, user: User) -> bool:
+    """Delete a user's account now if it is small, else queue it; True when deleted inline.
+
+    A queued account is deactivated immediately and marked, so the purge
+    survives restarts.
+    """
+    if account_size(db, user.id) <= settings.purge_inline_max_rows:
+        delete_user(db, user.id)
+        db.commit()
+        return True
+    db.execute(update(User).where(User.id == user.id).values(is_active=False, purge_requested_at=datetime.utcnow()))
+    db.commit()
+    account_purger.enqueue(user.id)
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete accounts and clean up orphaned rows")
+    parser.add_argument("command", choices=["purge", "purge-pending", "purge-orphans"])
+    parser.add_argument("email", nargs="?", help="Account to purge (purge only)")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+    if args.command == "purge":
+        if not args.email:
+            parser.error("purge needs an email")
+        with SessionLocal() as db:
+            user_id = db.scalar(select(User.id).where(User.email == args.email))
+        if user_id is None:
+            parser.error(f"No user with email {args.email}")
+        purge_user(user_id, args.batch_size)
+        print(f"Purged {args.email}")
+    elif args.command == "purge-pending":
+        with SessionLocal() as db:
+            user_ids = list(db.scalars(select(User.id).where(User.purge_requested_at.is_not(None))))
+        purged = 0
+        for user_id in user_ids:
+            # Skip accounts a running server is purging
+            if claim_purge(user_id):
+                purged += purge_user(user_id, args.batch_size)
+        print(f"Purged {purged} pending accounts")
+    else:
+        with SessionLocal() as db:
+            counts = purge_orphans(db)
+            db.commit()
+        print(", ".join(f"{count} {name}" for name, count in counts.items()) + " orphaned rows deleted")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from scipy import sparse
+from app.services.resume_parser import ResumeParser
+from app.services.resume_sections import SKILL_SECTION_KINDS, ResumeSection, section_text
+from app.services.skill_matcher import get_skill_matcher
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have how i if in into is it its
+me my of on or our so that the their them then there these they this to was we were what when where which
+who why will with would you your about tell describe explain give example walk through time
+""".split())
+
+# Weights of the combined 0-100 pre-score
+_LENGTH_WEIGHT = 0.4
+_OVERLAP_WEIGHT = 0.4
+_SKILL_WEIGHT = 0.2
+_TARGET_WORDS = 80  # answers at or above this length get the full length score
+_TARGET_SKILLS = 2  # resume skills mentioned for the full skill score
+
+def _keywords(text: str) -> set:
+    return {t.strip(".") for t in _TOKEN_RE.findall(text.lower()) if len(t) > 2 and t not in _STOPWORDS}
+
+def _seconds_between(start: Optional[datetime], end: Optional[datetime]) -> float:
+    if start is None or end is None:
+        return np.nan
+    # SQLite returns naive datetimes while responses may be timezone aware
+    if (start.tzinfo is None) != (end.tzinfo is None):
+        start, end = start.replace(tzinfo=None), end.replace(tzinfo=None)
+    return (end - start).total_seconds()
+
+def _incidence(rows: List[List[int]], n_columns: int) -> sparse.csr_matrix:
+    """0/1 matrix with a row per list, set in the columns that list names (each at most once)"""
+    indptr = np.cumsum([0] + [len(columns) for columns in rows])
+    indices = np.fromiter((j for columns in rows for j in columns), dtype=np.int64, count=indptr[-1])
+    return sparse.csr_matrix((np.ones(indptr[-1]), indices, indptr), shape=(len(rows), n_columns))
+
+def prescore_answers(
+    questions: Sequence,
+    resume_content: Optional[str],
+    resume_sections: Optional[List[ResumeSection]] = None
+) -> Dict:
+    """Score answers locally in milliseconds, before (or without) LLM feedback.
+
+    Accepts InterviewQuestion rows (or objects with the same attributes) from
+    one or many interviews. Each answer is tokenized and matched once; the
+    terms and skills found are put in sparse matrices, and every metric is then
+    an array operation over the whole batch. With the profile's stored
+    sections, resume skills are taken from the sections that list them rather
+    than headers and contact lines.
+    """
+    resume_text = resume_content or ""
+    if resume_sections:
+        resume_text = section_text(resume_text, resume_sections, SKILL_SECTION_KINDS) or resume_text
+    resume_skills = ResumeParser().extract_skills(resume_text)
+    n = len(questions)
+    answers = [q.user_response or "" for q in questions]
+
+    # Per-answer token counts and latency
+    word_counts = np.array([len(a.split()) for a in answers], dtype=float)
+    answered = word_counts > 0
+    latency = np.array(
+        [_seconds_between(q.created_at, q.response_timestamp) for q in questions], dtype=float
+    )
+
+    # Keyword overlap: binary answer and question matrices over a shared vocabulary
+    question_terms = [_keywords(q.question_text or "") for q in questions]
+    answer_terms = [_keywords(a) for a in answers]
+    vocabulary = {term: i for i, term in enumerate(set().union(*question_terms))}
+    question_matrix = _incidence([[vocabulary[t] for t in terms] for terms in question_terms], len(vocabulary))
+    answer_matrix = _incidence(
+        [[vocabulary[t] for t in terms if t in vocabulary] for terms in answer_terms], len(vocabulary)
+    )
+    question_sizes = np.asarray(question_matrix.sum(axis=1)).ravel()
+    overlap = np.divide(
+        np.asarray(question_matrix.multiply(answer_matrix).sum(axis=1)).ravel(), question_sizes,
+        out=np.zeros(n), where=question_sizes > 0
+    )
+
+    # Resume skill coverage: answers x resume skills mention matrix
+    matcher = get_skill_matcher()
+    skill_index = {skill: j for j, skill in enumerate(resume_skills)}
+    mentioned = [sorted({skill_index[s] for s in matcher.find(answer) if s in skill_index}) for answer in answers]
+    skill_matrix = _incidence(mentioned, len(resume_skills))
+    skills_mentioned = np.asarray(skill_matrix.sum(axis=1)).ravel()
+
+    score = 100 * (
+        _LENGTH_WEIGHT * np.clip(word_counts / _TARGET_WORDS, 0, 1)
+        + _OVERLAP_WEIGHT * overlap
+        + _SKILL_WEIGHT * np.clip(skills_mentioned / _TARGET_SKILLS, 0, 1)
+    )
+    score[~answered] = 0
+
+    scores = [
+        {
+            "question_id": q.id,
+            "answer_length": int(word_counts[i]),
+            "response_latency_seconds": None if np.isnan(latency[i]) else round(float(latency[i]), 1),
+            "keyword_overlap": round(float(overlap[i]), 3),
+            "skills_mentioned": [resume_skills[j] for j in mentioned[i]],
+            "score": round(float(score[i]), 1),
+        }
+        for i, q in enumerate(questions)
+    ]
+    answered_latency = latency[answered & ~np.isnan(latency)]
+    summary = {
+        "answered": int(answered.sum()),
+        "total": n,
+        "average_answer_length": round(float(word_counts[answered].mean()), 1) if answered.any() else 0.0,
+        "average_response_latency_seconds": round(float(answered_latency.mean()), 1) if answered_latency.size else None,
+        "resume_skill_coverage": round(float((skill_matrix.sum(axis=0) > 0).mean()), 3) if resume_skills else 0.0,
+        "score": round(float(score.mean()), 1) if n else 0.0,
+    }
+    return {"scores": scores, "summary": summary}
@@ -0,0 +1,314 @@
+"""Bulk import of users, each with an optional profile, from CSV or JSONL.
+
+Rows go in batches of import_batch_size, one transaction each:
+
+- one query finds which of the batch's emails and usernames are taken
+- passwords are hashed and resumes parsed in a pool of worker processes:
+  the CLI's own, or a small long-lived pool per web worker for the API
+- users, profiles and skill links are written with one executemany each
+
+A bad row never stops the import; each is reported with its row number.
+The API takes up to import_max_rows rows per request; larger cohorts go
+through the CLI:
+
+    python -m app.services.bulk_import cohort.csv --resumes ./resumes
+"""
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.auth import get_password_hash
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.database import Base, SessionLocal, engine, upgrade_schema
+from app.models.profile import Profile
+from app.models.user import User
+from app.schemas.user import ImportedUser, ImportRowError, UserImportResponse, UserImportRow
+from app.services.resume_parser import ResumeParser, resume_kind
+from app.services.resume_sections import apply_resume_sections
+from app.services.skill_index import sync_profile_skills
+
+PROFILE_FIELDS = ("career_role", "skills", "resume_file", "resume_content")
+PROFILE_COLUMNS = ("user_id", "full_name", "career_role", "skills", "resume_content", "resume_file_name", "resume_sections")
+
+Row = Tuple[int, UserImportRow]  # (row number, validated row)
+
+def read_records(content: bytes, filename: str) -> Tuple[List[Tuple[int, dict]], List[ImportRowError]]:
+    """Numbered records of a .csv or .jsonl file, and the lines that could not be read"""
+    text = content.decode("utf-8-sig")
+    records, errors = [], []
+    if filename.lower().endswith(".csv"):
+        for number, row in enumerate(csv.DictReader(io.StringIO(text)), start=1):
+            # Empty cells mean "not given"; cells past the header have no name
+            records.append((number, {key: value for key, value in row.items() if key and value}))
+    elif filename.lower().endswith((".jsonl", ".ndjson")):
+        lines = (line for line in text.splitlines() if line.strip())
+        for number, line in enumerate(lines, start=1):
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                errors.append(ImportRowError(row=number, error=f"Invalid JSON: {e}"))
+                continue
+            if not isinstance(record, dict):
+                errors.append(ImportRowError(row=number, error="Expected a JSON object"))
+                continue
+            records.append((number, record))
+    else:
+        raise ValueError(f"Unsupported import file: {filename} (expected .csv or .jsonl)")
+    return records, errors
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+
+def _validate(
+    records: Sequence[Tuple[int, dict]],
+    resumes: Dict[str, bytes],
+    errors: List[ImportRowError]
+) -> List[Row]:
+    """Rows that pass validation and are unique within the file"""
+    valid = []
+    emails, usernames = set(), set()
+    for number, record in records:
+        email = record.get("email") if isinstance(record.get("email"), str) else None
+        try:
+            row = UserImportRow.model_validate(record)
+        except ValidationError as e:
+            errors.append(ImportRowError(row=number, email=email, error=_describe(e)))
+            continue
+        if not row.password:
+            problem = "password: must not be empty"
+        elif row.email in emails:
+            problem = "Email appears earlier in the file"
+        elif row.username in usernames:
+            problem = "Username appears earlier in the file"
+        elif row.resume_file and row.resume_file not in resumes:
+            problem = f"Resume file not uploaded: {row.resume_file}"
+        else:
+            problem = None
+        if problem:
+            errors.append(ImportRowError(row=number, email=row.email, error=problem))
+            continue
+        emails.add(row.email)
+        usernames.add(row.username)
+        valid.append((number, row))
+    return valid
+
+def _new_pool(workers: int) -> ProcessPoolExecutor:
+    # Forking a process that runs threads (log listener, cache subscriber) can deadlock the child
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+@contextmanager
+def worker_pool(workers: int) -> Iterator[Optional[Executor]]:
+    """Processes for the CPU-bound steps of one import, or None to run them inline"""
+    if workers <= 1:
+        yield None
+        return
+    with _new_pool(workers) as pool:
+        yield pool
+
+_shared_pool: Optional[ProcessPoolExecutor] = None
+_shared_pool_lock = threading.Lock()
+
+def shared_pool() -> Optional[Executor]:
+    """This process's long-lived pool of import_api_workers processes, started on first use; None for inline"""
+    global _shared_pool
+    if settings.import_api_workers <= 1:
+        return None
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = _new_pool(settings.import_api_workers)
+        return _shared_pool
+
+def _map(pool: Optional[Executor], function: Callable, items: List) -> List:
+    if pool is None or len(items) < 2:
+        return [function(item) for item in items]
+    return list(pool.map(function, items))
+
+def _parse_resume(job: Tuple[str, bytes, int, int]) -> Dict:
+    """Worker: ParsedResume fields of one resume, or its error"""
+    kind, content, max_pages, max_chars = job
+    try:
+        return asdict(ResumeParser(max_pages, max_chars).parse(kind, content))
+    except Exception as e:
+        return {"error": str(e)}
+
+def parse_resumes(pool: Optional[Executor], files: Dict[str, bytes]) -> Dict[str, Dict]:
+    """Parse resumes in parallel, sharing the upload path's cache; filename -> fields or {"error": ...}"""
+    parser = ResumeParser()
+    cache = get_cache()
+    results, jobs = {}, {}
+    for name, content in files.items():
+        try:
+            kind = resume_kind(name)
+        except ValueError as e:
+            results[name] = {"error": str(e)}
+            continue
+        key = parser.cache_key(kind, content)
+        cached = cache.get(key)
+        if cached is not None:
+            results[name] = cached
+        else:
+            jobs[name] = (key, (kind, content, parser.max_pages, parser.max_chars))
+    parsed = _map(pool, _parse_resume, [job for _, job in jobs.values()])
+    for (name, (key, _)), fields in zip(jobs.items(), parsed):
+        results[name] = fields
+        if "error" not in fields:
+            cache.set(key, fields, settings.cache_resume_ttl_seconds)
+    return results
+
+def _drop_taken(db: Session, items: List[tuple], errors: List[ImportRowError]) -> List[tuple]:
+    """Items (row number, row, ...) whose email and username are still free, in one query"""
+    if not items:
+        return items
+    taken = db.execute(select(User.email, User.username).where(or_(
+        User.email.in_([item[1].email for item in items]),
+        User.username.in_([item[1].username for item in items])
+    ))).all()
+    taken_emails = {email for email, _ in taken}
+    taken_usernames = {username for _, username in taken}
+    free = []
+    for item in items:
+        number, row = item[0], item[1]
+        if row.email in taken_emails:
+            errors.append(ImportRowError(row=number, email=row.email, error="Email already registered"))
+        elif row.username in taken_usernames:
+            errors.append(ImportRowError(row=number, email=row.email, error="Username already taken"))
+        else:
+            free.append(item)
+    return free
+
+def _insert(db: Session, ready: List[Tuple[int, UserImportRow, str]], parsed: Dict[str, Dict]) -> List[ImportedUser]:
+    user_ids = dict(db.execute(insert(User).returning(User.email, User.id), [
+        {"email": row.email, "username": row.username, "full_name": row.full_name,
+         "hashed_password": hashed, "is_guest": False}
+        for _, row, hashed in ready
+    ]).all())
+    # Transient profiles: built for section and skill indexing, written with Core
+    profiles = {}
+    for number, row, _ in ready:
+        if any(getattr(row, field) for field in PROFILE_FIELDS):
+            profile = Profile(
+                user_id=user_ids[row.email],
+                full_name=row.full_name,
+                career_role=row.career_role,
+                skills=row.skills,
+                resume_content=parsed[row.resume_file]["text"] if row.resume_file else row.resume_content,
+                resume_file_name=row.resume_file
+            )
+            apply_resume_sections(profile)
+            profiles[number] = profile
+    if profiles:
+        profile_ids = dict(db.execute(insert(Profile).returning(Profile.user_id, Profile.id), [
+            {column: getattr(profile, column) for column in PROFILE_COLUMNS} for profile in profiles.values()
+        ]).all())
+        for profile in profiles.values():
+            profile.id = profile_ids[profile.user_id]
+        sync_profile_skills(db, list(profiles.values()), replace=False)
+    return [
+        ImportedUser(
+            row=number, id=user_ids[row.email], email=row.email,
+            profile_id=profiles[number].id if number in profiles else None
+        )
+        for number, row, _ in ready
+    ]
+
+def _import_batch(
+    db: Session,
+    pool: Optional[Executor],
+    batch: List[Row],
+    resumes: Dict[str, bytes],
+    imported: List[ImportedUser],
+    errors: List[ImportRowError]
+):
+    # Check before the expensive steps, so taken rows are never hashed or parsed
+    batch = _drop_taken(db, batch, errors)
+    parsed = parse_resumes(pool, {row.resume_file: resumes[row.resume_file] for _, row in batch if row.resume_file})
+    usable = []
+    for number, row in batch:
+        if row.resume_file and "error" in parsed[row.resume_file]:
+            errors.append(ImportRowError(row=number, email=row.email, error=parsed[row.resume_file]["error"]))
+        else:
+            usable.append((number, row))
+    # No transaction stays open through the slow steps; the insert re-checks on conflict
+    db.commit()
+    hashes = _map(pool, get_password_hash, [row.password for _, row in usable])
+    ready = [(number, row, hashed) for (number, row), hashed in zip(usable, hashes)]
+    for attempt in range(2):
+        try:
+            created = _insert(db, ready, parsed)
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if attempt:
+                errors.extend(
+                    ImportRowError(row=number, email=row.email, error=f"Could not be saved: {e.orig}")
+                    for number, row, _ in ready
+                )
+                return
+            # Someone registered one of these emails or usernames since the check
+            ready = _drop_taken(db, ready, errors)
+            continue
+        imported.extend(created)
+        return
+
+def import_users(
+    db: Session,
+    records: Sequence[Tuple[int, dict]],
+    resumes: Optional[Dict[str, bytes]] = None,
+    errors: Optional[List[ImportRowError]] = None,
+    batch_size: Optional[int] = None,
+    pool: Optional[Executor] = None
+) -> UserImportResponse:
+    """Create users (and profiles) from numbered records; resumes maps file names to their bytes.
+
+    Passwords are hashed and resumes parsed in pool when given, else inline.
+    """
+    resumes = resumes or {}
+    errors = list(errors or [])
+    batch_size = batch_size or settings.import_batch_size
+    valid = _validate(records, resumes, errors)
+    imported: List[ImportedUser] = []
+    for start in range(0, len(valid), batch_size):
+        _import_batch(db, pool, valid[start:start + batch_size], resumes, imported, errors)
+    errors.sort(key=lambda error: error.row)
+    return UserImportResponse(created=len(imported), users=imported, errors=errors)
+
+def main():
+    parser = argparse.ArgumentParser(description="Create users and profiles in bulk from a CSV or JSONL file")
+    parser.add_argument("path", help="CSV or JSONL file, one user per row")
+    parser.add_argument("--resumes", help="Directory holding the files named in the resume_file column")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Processes for hashing and parsing (default: import_workers)")
+    args = parser.parse_args()
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+    with open(args.path, "rb") as f:
+        records, errors = read_records(f.read(), args.path)
+    resumes = {}
+    if args.resumes:
+        for _, record in records:
+            name = record.get("resume_file")
+            path = os.path.join(args.resumes, name) if isinstance(name, str) else None
+            if path and os.path.isfile(path):
+                with open(path, "rb") as f:
+                    resumes[name] = f.read()
+    workers = args.workers or settings.import_workers or os.cpu_count() or 1
+    with SessionLocal() as db, worker_pool(workers) as pool:
+        result = import_users(db, records, resumes, errors, args.batch_size, pool)
+    for error in result.errors:
+        print(f"row {error.row} ({error.email or '-'}): {error.error}")
+    print(f"Imported {result.created} users, {len(result.errors)} rows failed")
+
+if __name__ == "__main__":
+    main()
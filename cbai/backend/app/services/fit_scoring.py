@@ -0,0 +1,292 @@
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from scipy import sparse
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from app.models.profile import Profile
+from app.models.skill import ProfileSkill, Skill
+from app.services.skill_matcher import get_skill_matcher
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have how i if in into is it its
+me my of on or our so that the their them then there these they this to was we were what when where which
+who why will with would you your about able work working years year experience team teams strong role
+""".split())
+_SKILL_PREFIX = "skill:"
+_SKILL_BOOST = 3  # A taxonomy skill counts as this many plain-word mentions
+_CACHE_SIZE = 256
+
+def document_terms(text: str, skills: Optional[Sequence[str]] = None) -> Tuple[Counter, List[str]]:
+    """Term counts (words plus boosted canonical skills) and the skills, found in the text unless given"""
+    counts = Counter(t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS)
+    skills = list(skills) if skills else get_skill_matcher().find(text)
+    for skill in skills:
+        counts[_SKILL_PREFIX + skill] += _SKILL_BOOST
+    return counts, skills
+
+def jd_hash(job_description: str, job_role: Optional[str] = None) -> str:
+    normalized = " ".join(f"{job_role or ''}\n{job_description}".lower().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+class _LRU(OrderedDict):
+    def __init__(self, size: int):
+        super().__init__()
+        self.size = size
+
+    def get(self, key, default=None):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        return default
+
+    def put(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.size:
+            self.popitem(last=False)
+
+class FitIndex:
+    """TF-IDF matrix of profile resumes for resume-to-job-description fit scoring.
+
+    The vocabulary only grows and document frequencies are updated as
+    profiles are added, changed or removed, so keeping the index current
+    costs work proportional to the changed profiles. The sparse matrix and
+    IDF vector are rebuilt lazily, at most once per change, by concatenating
+    the stored rows. Scoring one JD against every profile (or one profile
+    against many JDs) is a single sparse matrix product.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.vocabulary: Dict[str, int] = {}
+        self._df = np.zeros(0, dtype=np.int64)
+        self._rows: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}  # profile id -> (term columns, counts)
+        self.profile_info: Dict[int, Dict] = {}  # profile id -> user_id, full_name, career_role, skills
+        self.version = 0
+        self._built_version = -1
+        self._matrix: Optional[sparse.csr_matrix] = None
+        self._row_ids = np.zeros(0, dtype=np.int64)
+        self._row_users = np.zeros(0, dtype=np.int64)
+        self._idf = np.zeros(0)
+        self._watermark: Tuple[int, Optional[datetime]] = (0, None)  # (profile count, newest change)
+        self._dirty: Set[int] = set()  # Profiles written by this process since the last refresh
+        self._jd_terms = _LRU(_CACHE_SIZE)
+        self._rankings = _LRU(_CACHE_SIZE)
+
+    def _columns(self, counts: Counter) -> Tuple[np.ndarray, np.ndarray]:
+        for term in counts:
+            if term not in self.vocabulary:
+                self.vocabulary[term] = len(self.vocabulary)
+        if len(self.vocabulary) > len(self._df):
+            self._df = np.concatenate([self._df, np.zeros(len(self.vocabulary) - len(self._df), dtype=np.int64)])
+        columns = np.fromiter((self.vocabulary[t] for t in counts), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=float, count=len(counts))
+        return columns, values
+
+    def upsert(self, profile: Profile, skills: Optional[Set[str]] = None):
+        """Index one profile; skills default to those the resume mentions"""
+        text = "\n".join(filter(None, [profile.career_role, profile.resume_content]))
+        counts, skills = document_terms(text, skills)
+        with self._lock:
+            self._remove(profile.id)
+            columns, values = self._columns(counts)
+            self._df[columns] += 1
+            self._rows[profile.id] = (columns, values)
+            self.profile_info[profile.id] = {
+                "user_id": profile.user_id,
+                "full_name": profile.full_name,
+                "career_role": profile.career_role,
+                "skills": set(skills),
+            }
+            self.version += 1
+
+    def _remove(self, profile_id: int):
+        row = self._rows.pop(profile_id, None)
+        if row is not None:
+            self._df[row[0]] -= 1
+            self.profile_info.pop(profile_id, None)
+            self.version += 1
+
+    def remove(self, profile_id: int):
+        with self._lock:
+            self._remove(profile_id)
+
+    def mark_dirty(self, profile_id: int):
+        with self._lock:
+            self._dirty.add(profile_id)
+
+    def refresh(self, db: Session):
+        """Bring the index up to date with the profiles table, loading only what changed.
+
+        Writes made by this process are tracked exactly; writes by other workers
+        are found through the table's row count and newest change timestamp.
+        """
+        changed_at = func.coalesce(Profile.updated_at, Profile.created_at)
+        count, newest = db.execute(select(func.count(Profile.id), func.max(changed_at))).one()
+        with self._lock:
+            if (count, newest) == self._watermark and count == len(self._rows) and not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, set()
+            query = select(Profile)
+            seen_newest = self._watermark[1]
+            if self._rows:
+                # Timestamps can tie, so the boundary instant is reloaded too
+                query = query.where(
+                    (changed_at >= seen_newest) | (Profile.id > max(self._rows)) | Profile.id.in_(dirty)
+                )
+            full_load = not self._rows
+            loaded = self._load(db, db.scalars(query).all(), full_load)
+            for profile_id in dirty - loaded:
+                self._remove(profile_id)
+            if len(self._rows) != count:
+                # Rows the change queries cannot see: deleted by another worker, or
+                # committed late with a lower id and an older timestamp than the watermark
+                existing = set(db.scalars(select(Profile.id)))
+                for profile_id in set(self._rows) - existing:
+                    self._remove(profile_id)
+                missing = existing - set(self._rows)
+                if missing:
+                    self._load(db, db.scalars(select(Profile).where(Profile.id.in_(missing))).all())
+            self._watermark = (count, newest)
+
+    def _load(self, db: Session, profiles: List[Profile], full_load: bool = False) -> Set[int]:
+        """Index profiles with their linked skills (fetched in one query); returns their ids"""
+        skills_query = select(ProfileSkill.profile_id, Skill.name).join(Skill, Skill.id == ProfileSkill.skill_id)
+        if not full_load:
+            skills_query = skills_query.where(ProfileSkill.profile_id.in_([p.id for p in profiles]))
+        skills: Dict[int, Set[str]] = {}
+        for profile_id, name in db.execute(skills_query):
+            skills.setdefault(profile_id, set()).add(name)
+        for profile in profiles:
+            self.upsert(profile, skills.get(profile.id))
+        return {profile.id for profile in profiles}
+
+    def _build(self):
+        if self._built_version == self.version:
+            return
+        n_docs = len(self._rows)
+        self._idf = np.log((1 + n_docs) / (1 + self._df)) + 1
+        self._row_ids = np.fromiter(self._rows, dtype=np.int64, count=n_docs)
+        self._row_users = np.array([self.profile_info[i]["user_id"] or 0 for i in self._row_ids], dtype=np.int64)
+        if n_docs:
+            columns = np.concatenate([self._rows[i][0] for i in self._row_ids])
+            values = np.concatenate([self._rows[i][1] for i in self._row_ids])
+            indptr = np.concatenate([[0], np.cumsum([len(self._rows[i][0]) for i in self._row_ids])])
+        else:
+            columns, values, indptr = np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(1, dtype=np.int64)
+        # Sublinear term frequency, IDF weighting and L2-normalized rows
+        matrix = sparse.csr_matrix((1 + np.log(values), columns, indptr), shape=(n_docs, len(self.vocabulary)))
+        matrix = matrix.multiply(self._idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        self._matrix = sparse.diags(1 / np.where(norms > 0, norms, 1)) @ matrix
+        self._built_version = self.version
+
+    def _jd_vectors(self, job_descriptions: Sequence[Tuple[str, Optional[str]]]) -> Tuple[sparse.csr_matrix, List[List[str]]]:
+        """TF-IDF rows for job descriptions; tokenization is cached by JD hash"""
+        n_docs = len(self._rows)
+        rows, cols, vals, norms, skills = [], [], [], [], []
+        for i, (job_description, job_role) in enumerate(job_descriptions):
+            key = jd_hash(job_description, job_role)
+            cached = self._jd_terms.get(key)
+            if cached is None:
+                cached = document_terms("\n".join(filter(None, [job_role, job_description])))
+                self._jd_terms.put(key, cached)
+            counts, jd_skills = cached
+            norm = 0.0
+            for term, count in counts.items():
+                column = self.vocabulary.get(term)
+                # Terms no profile has still count toward the JD's norm
+                idf = self._idf[column] if column is not None else np.log(1 + n_docs) + 1
+                weight = (1 + np.log(count)) * idf
+                norm += weight * weight
+                if column is not None:
+                    rows.append(i)
+                    cols.append(column)
+                    vals.append(weight)
+            norms.append(np.sqrt(norm) or 1.0)
+            skills.append(jd_skills)
+        vectors = sparse.csr_matrix((vals, (rows, cols)), shape=(len(job_descriptions), len(self.vocabulary)))
+        return sparse.diags(1 / np.array(norms)) @ vectors, skills
+
+    def _skill_fit(self, profile_id: int, jd_skills: List[str]) -> Dict:
+        """Matching skills and gaps, most distinctive (highest IDF) first"""
+        def weight(skill):
+            column = self.vocabulary.get(_SKILL_PREFIX + skill)
+            return self._idf[column] if column is not None else 0.0
+        ordered = sorted(jd_skills, key=weight, reverse=True)
+        have = self.profile_info[profile_id]["skills"]
+        return {
+            "matching_skills": [s for s in ordered if s in have],
+            "missing_skills": [s for s in ordered if s not in have],
+        }
+
+    def rank_profiles(
+        self,
+        job_description: str,
+        job_role: Optional[str] = None,
+        limit: int = 20,
+        user_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Rank profiles against one JD (optionally only one user's profiles)"""
+        with self._lock:
+            key = (jd_hash(job_description, job_role), self.version, user_id, limit)
+            cached = self._rankings.get(key)
+            if cached is not None:
+                return cached
+            self._build()
+            vectors, skills = self._jd_vectors([(job_description, job_role)])
+            scores = (self._matrix @ vectors.T).toarray().ravel()
+            candidates = np.arange(len(scores))
+            if user_id is not None:
+                candidates = candidates[self._row_users == user_id]
+            top = candidates[np.argsort(-scores[candidates], kind="stable")[:limit]]
+            results = []
+            for row in top:
+                profile_id = int(self._row_ids[row])
+                info = self.profile_info[profile_id]
+                results.append({
+                    "profile_id": profile_id,
+                    "full_name": info["full_name"],
+                    "career_role": info["career_role"],
+                    "score": round(float(scores[row]) * 100, 1),
+                    **self._skill_fit(profile_id, skills[0]),
+                })
+            self._rankings.put(key, results)
+            return results
+
+    def score_profile(self, profile_id: int, job_descriptions: Sequence[Tuple[str, Optional[str]]]) -> List[Dict]:
+        """Score one profile against many JDs, in the order given; KeyError if it is not indexed"""
+        with self._lock:
+            if profile_id not in self._rows:
+                raise KeyError(profile_id)
+            self._build()
+            row = int(np.flatnonzero(self._row_ids == profile_id)[0])
+            vectors, skills = self._jd_vectors(job_descriptions)
+            scores = (vectors @ self._matrix[row].T).toarray().ravel()
+            return [
+                {
+                    "jd_hash": jd_hash(job_description, job_role),
+                    "job_role": job_role,
+                    "score": round(float(scores[i]) * 100, 1),
+                    **self._skill_fit(profile_id, skills[i]),
+                }
+                for i, (job_description, job_role) in enumerate(job_descriptions)
+            ]
+
+    def __contains__(self, profile_id: int) -> bool:
+        return profile_id in self._rows
+
+fit_index = FitIndex()
+
+
+@event.listens_for(Profile, "after_insert")
+@event.listens_for(Profile, "after_update")
+@event.listens_for(Profile, "after_delete")
+def _profile_written(mapper, connection, target):
+    fit_index.mark_dirty(target.id)
@@ -1,149 +1,212 @@
 import httpx
 import json
-from typing import List, Dict, Optional, Union, Tuple
+import logging
+import time
+from typing import List, Dict, Optional, Union, Tuple, AsyncIterator
 from app.core.config import settings
+from app.core.logs import log_payload
+from app.core.metrics import observe_groq_call
+from app.services.prompt_builder import (
+    RenderedPrompt, build_question_prompt, build_question_set_prompt,
+    build_evaluation_prompt, build_messages
+)
+from app.services.usage_ledger import usage_ledger
 import re
 
+logger = logging.getLogger(__name__)
+
 class GroqService:
-    def __init__(self):
+    def __init__(self, user_id: Optional[int] = None, interview_id: Optional[int] = None):
         self.api_key = settings.groq_api_key
-        self.base_url = "https://api.groq.com/openai/v1"
+        self.base_url = settings.groq_base_url
         self.model = "llama3-70b-8192"
-    
+        # Who the calls are made for, recorded with their usage in the ledger
+        self.user_id = user_id
+        self.interview_id = interview_id
+
     async def generate_question(
         self,
         resume_content: str,
         job_role: str,
         job_description: Optional[str] = None,
-        conversation_history: Optional[List[Dict]] = None
-    ) -> str:
-        """Generate an interview question based on resume and job context. Always call Groq API."""
-        # Always build the system prompt using resume, job role, job description, and conversation history
-        system_prompt = f"""
-        You are a world-class interviewer conducting a technical and behavioral interview.
-
-        CANDIDATE BACKGROUND:
-        - Resume Content: {resume_content}
-        - Target Job Role: {job_role}
-        {f'- Job Description: {job_description}' if job_description else ''}
+        conversation_history: Optional[List[Dict]] = None,
+        return_prompt: bool = False
+    ) -> Union[str, Tuple[str, RenderedPrompt]]:
+        """Generate an interview question based on resume and job context. Always call Groq API.
 
-        INTERVIEW CONTEXT:
-        - Here is the full conversation history so far (questions and answers):
-        {json.dumps(conversation_history, indent=1) if conversation_history else '[]'}
-        - For every question, you must generate a follow-up that references specific details from the candidate's resume and/or their previous answers.
-        - Do not ask generic questions. Every question should be tailored to the candidate's unique background and the flow of the interview so far.
-        - If clarification is needed, ask for it in a way that builds on what the candidate has already said.
-        - Only output the next interview question, nothing else.
+        With return_prompt=True, also returns the exact prompt that was sent.
         """
-        print("\n==================== SYSTEM PROMPT SENT TO GROQ ====================\n" + system_prompt + "\n====================================================================\n")
-        messages = [{"role": "system", "content": system_prompt}]
-        if conversation_history:
-            messages.extend(conversation_history)
-        # Defensive: Only allow supported keys in each message and ensure 'role' and 'content' exist
-        allowed_keys = {'role', 'content', 'name'}
-        for msg in messages:
-            keys_to_remove = set(msg.keys()) - allowed_keys
-            for key in keys_to_remove:
-                del msg[key]
-            if 'role' not in msg:
-                msg['role'] = 'user'  # Default to 'user' if missing
-            if 'content' not in msg:
-                msg['content'] = ''  # Default to empty string if missing
-        # Prepare the request payload
+        prompt = build_question_prompt(resume_content, job_role, job_description, conversation_history)
+        log_payload(logger, "System prompt sent to Groq", prompt.text, secrets=(resume_content,))
         payload = {
             "model": self.model,
-            "messages": messages,
+            "messages": build_messages(prompt.text, conversation_history),
             "temperature": 0.7,
             "max_tokens": 500
         }
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                question = result["choices"][0]["message"]["content"].strip()
-                return question
+            result = await self._chat_completion(payload, purpose="question")
+            question = result["choices"][0]["message"]["content"].strip()
+            if return_prompt:
+                return question, prompt
+            return question
         except httpx.HTTPStatusError as e:
             raise Exception(f"Groq API error: {e.response.status_code} - {e.response.text}")
         except Exception as e:
             raise Exception(f"Error generating question: {str(e)}")
-    
+
     async def generate_follow_up_question(
         self,
         resume_content: str,
         job_role: str,
         conversation_history: List[Dict],
-        job_description: Optional[str] = None
-    ) -> str:
+        job_description: Optional[str] = None,
+        return_prompt: bool = False
+    ) -> Union[str, Tuple[str, RenderedPrompt]]:
         """Generate a follow-up question based on conversation history. Always call Groq API."""
-        # Always build the system prompt using resume, job role, job description, and conversation history
-        system_prompt = f"""
-        You are a world-class interviewer conducting a technical and behavioral interview.
+        try:
+            return await self.generate_question(
+                resume_content=resume_content,
+                job_role=job_role,
+                job_description=job_description,
+                conversation_history=conversation_history,
+                return_prompt=return_prompt
+            )
+        except Exception as e:
+            raise Exception(f"Error generating follow-up question: {str(e)}")
 
-        CANDIDATE BACKGROUND:
-        - Resume Content: {resume_content}
-        - Target Job Role: {job_role}
-        {f'- Job Description: {job_description}' if job_description else ''}
+    async def stream_follow_up_question(
+        self,
+        resume_content: str,
+        job_role: str,
+        conversation_history: List[Dict],
+        job_description: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream the next interview question from Groq, yielding text deltas as they arrive."""
+        prompt = build_question_prompt(resume_content, job_role, job_description, conversation_history)
+        payload = {
+            "model": self.model,
+            "messages": build_messages(prompt.text, conversation_history),
+            "temperature": 0.7,
+            "max_tokens": 500,
+            "stream": True
+        }
+        started = time.perf_counter()
+        usage = None
+        try:
+            async with httpx.AsyncClient() as client:
+                async with client.stream(
+                    "POST",
+                    f"{self.base_url}/chat/completions",
+                    headers=self._headers(),
+                    json=payload,
+                    timeout=30.0
+                ) as response:
+                    if response.is_error:
+                        await response.aread()
+                        observe_groq_call("question_stream", time.perf_counter() - started, error=True)
+                    response.raise_for_status()
+                    # Server-sent events: one "data: {...}" chunk per line, ended by "data: [DONE]"
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        chunk = json.loads(data)
+                        # Groq reports usage on the final chunk
+                        usage = (chunk.get("x_groq") or {}).get("usage") or chunk.get("usage") or usage
+                        if not chunk.get("choices"):
+                            continue
+                        delta = chunk["choices"][0].get("delta", {}).get("content")
+                        if delta:
+                            yield delta
+            self._record_usage("question_stream", usage, started)
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Groq API error: {e.response.status_code} - {e.response.text}")
+        except Exception as e:
+            raise Exception(f"Error streaming question: {str(e)}")
 
-        INTERVIEW CONTEXT:
-        - Here is the full conversation history so far (questions and answers):
-        {conversation_history}
-        - For every question, you must generate a follow-up that references specific details from the candidate's resume and/or their previous answers.
-        - Do not ask generic questions. Every question should be tailored to the candidate's unique background and the flow of the interview so far.
-        - If clarification is needed, ask for it in a way that builds on what the candidate has already said.
-        - Only output the next interview question, nothing else.
-        """
-        print("\n==================== SYSTEM PROMPT SENT TO GROQ ====================\n" + system_prompt + "\n====================================================================\n")
-        # Build messages array
-        messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(conversation_history)
-        # Defensive: Only allow supported keys in each message and ensure 'role' and 'content' exist
-        allowed_keys = {'role', 'content', 'name'}
-        for msg in messages:
-            keys_to_remove = set(msg.keys()) - allowed_keys
-            for key in keys_to_remove:
-                del msg[key]
-            if 'role' not in msg:
-                msg['role'] = 'user'  # Default to 'user' if missing
-            if 'content' not in msg:
-                msg['content'] = ''  # Default to empty string if missing
-        # Prepare the request payload
+    async def generate_question_set(
+        self,
+        resume_content: str,
+        job_role: str,
+        num_questions: int,
+        job_description: Optional[str] = None
+    ) -> List[str]:
+        """Generate the full planned question set for a guided interview in a single Groq call."""
+        prompt = build_question_set_prompt(resume_content, job_role, num_questions, job_description)
         payload = {
             "model": self.model,
-            "messages": messages,
+            "messages": build_messages(prompt.text),
             "temperature": 0.7,
-            "max_tokens": 500
+            "max_tokens": 150 * num_questions
         }
-        headers = {
+        try:
+            result = await self._chat_completion(payload, purpose="question_set", timeout=60.0)
+            content = result["choices"][0]["message"]["content"].strip()
+            return self._parse_question_set(content)[:num_questions]
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Groq API error: {e.response.status_code} - {e.response.text}")
+        except Exception as e:
+            raise Exception(f"Error generating question set: {str(e)}")
+
+    def _headers(self) -> Dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+
+    async def _chat_completion(self, payload: Dict, purpose: str, timeout: float = 30.0) -> Dict:
+        """POST a chat completion request to Groq, record its usage and return the decoded JSON body."""
+        started = time.perf_counter()
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.post(
                     f"{self.base_url}/chat/completions",
-                    headers=headers,
+                    headers=self._headers(),
                     json=payload,
-                    timeout=30.0
+                    timeout=timeout
                 )
                 response.raise_for_status()
                 result = response.json()
-                question = result["choices"][0]["message"]["content"].strip()
-                return question
-        except httpx.HTTPStatusError as e:
-            raise Exception(f"Groq API error: {e.response.status_code} - {e.response.text}")
-        except Exception as e:
-            raise Exception(f"Error generating follow-up question: {str(e)}")
-    
+        except Exception:
+            observe_groq_call(purpose, time.perf_counter() - started, error=True)
+            raise
+        self._record_usage(purpose, result.get("usage"), started)
+        return result
+
+    def _record_usage(self, purpose: str, usage: Optional[Dict], started: float):
+        observe_groq_call(purpose, time.perf_counter() - started, usage)
+        usage_ledger.record(
+            user_id=self.user_id,
+            interview_id=self.interview_id,
+            model=self.model,
+            purpose=purpose,
+            usage=usage,
+            latency_ms=(time.perf_counter() - started) * 1000
+        )
+
+    @staticmethod
+    def _parse_question_set(content: str) -> List[str]:
+        """Parse a planned question set, accepting a JSON array or a numbered list."""
+        start, end = content.find('['), content.rfind(']')
+        if start != -1 and end > start:
+            try:
+                questions = json.loads(content[start:end + 1])
+                questions = [str(q).strip() for q in questions if str(q).strip()]
+                if questions:
+                    return questions
+            except ValueError:
+                pass
+        # Fallback: one question per numbered or bulleted line
+        questions = []
+        for line in content.split('\n'):
+            line = re.sub(r'^\s*(\d+[.)]|[-*])\s*', '', line).strip()
+            if line.endswith('?'):
+                questions.append(line)
+        return questions
+
     async def evaluate_answers(
         self,
         qa_pairs: List[Dict],
@@ -153,21 +216,13 @@ class GroqService:
         return_raw_response: bool = False
     ) -> Union[List[str], Tuple[List[str], dict]]:
         """Evaluate each answer for relevance and quality with respect to its question using Groq."""
-        system_prompt = f"""
-        You are an expert technical interviewer and evaluator.
-        For each question and answer pair below, provide a brief, constructive feedback on the answer's relevance, completeness, and quality with respect to the question asked.
-        If the answer is missing, say 'No answer given.'
-        {f'Resume Content: {resume_content}' if resume_content else ''}
-        {f'Target Job Role: {job_role}' if job_role else ''}
-        {f'Job Description: {job_description}' if job_description else ''}
-        Return a numbered list of feedback, one for each answer.
-        """
+        prompt = build_evaluation_prompt(resume_content, job_role, job_description)
         qa_text = "\n".join([
             f"{i+1}. Q: {qa['question']}\nA: {qa.get('answer', '')}" for i, qa in enumerate(qa_pairs)
         ])
         user_prompt = f"Here are the Q&A pairs:\n{qa_text}\n\nProvide feedback as described."
         messages = [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": prompt.text},
             {"role": "user", "content": user_prompt}
         ]
         payload = {
@@ -176,38 +231,25 @@ class GroqService:
             "temperature": 0.3,
             "max_tokens": 600
         }
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                print("[GroqService] Full Groq API response:\n", json.dumps(result, indent=2))
-                feedback_text = result["choices"][0]["message"]["content"].strip()
-                print("[GroqService] Raw feedback from Groq:\n", feedback_text)
-                if not feedback_text:
-                    print("[GroqService] WARNING: feedback_text is empty!")
-                # Improved parsing: split by numbered feedback sections
-                matches = re.split(r'\n\d+\.\s+Feedback:', feedback_text)
-                feedback_lines = []
-                for i, chunk in enumerate(matches[1:], 1):  # skip the first split (before 1.)
-                    feedback_lines.append(chunk.strip())
-                # If still empty, fallback to previous logic
-                if not feedback_lines:
-                    feedback_lines = [line.strip().split('. ', 1)[-1] for line in feedback_text.split('\n') if line.strip() and line[0].isdigit()]
-                if not feedback_lines:
-                    feedback_lines = [feedback_text] * len(qa_pairs)
-                if return_raw_response:
-                    return feedback_lines, result
-                return feedback_lines
+            result = await self._chat_completion(payload, purpose="evaluation", timeout=60.0)
+            feedback_text = result["choices"][0]["message"]["content"].strip()
+            log_payload(logger, "Raw feedback from Groq", feedback_text, secrets=(resume_content,))
+            if not feedback_text:
+                logger.warning("Groq returned empty feedback", extra={"fields": {"interview_id": self.interview_id}})
+            # Improved parsing: split by numbered feedback sections
+            matches = re.split(r'\n\d+\.\s+Feedback:', feedback_text)
+            feedback_lines = []
+            for i, chunk in enumerate(matches[1:], 1):  # skip the first split (before 1.)
+                feedback_lines.append(chunk.strip())
+            # If still empty, fallback to previous logic
+            if not feedback_lines:
+                feedback_lines = [line.strip().split('. ', 1)[-1] for line in feedback_text.split('\n') if line.strip() and line[0].isdigit()]
+            if not feedback_lines:
+                feedback_lines = [feedback_text] * len(qa_pairs)
+            if return_raw_response:
+                return feedback_lines, result
+            return feedback_lines
         except Exception as e:
-            print("Error evaluating answers:", str(e))
-            return ["Feedback not available."] * len(qa_pairs) 
\ No newline at end of file
+            logger.error("Error evaluating answers: %s", e, extra={"fields": {"interview_id": self.interview_id}})
+            return ["Feedback not available."] * len(qa_pairs)
@@ -0,0 +1,105 @@
+"""Streaming export of a user's interview history as NDJSON or CSV.
+
+All interviews and their questions come from one query read through a
+server-side cursor (yield_per), and output is written in fixed-size chunks
+as rows arrive, so memory stays flat however long the history is. NDJSON
+has one line per interview with its questions nested; CSV has one line per
+question, repeating the interview's columns. Planned guided questions that
+were never asked are left out, as in GET /interviews/{id}.
+"""
+import csv
+import io
+from datetime import datetime
+from itertools import groupby
+from typing import Iterable, Iterator, Optional
+from sqlalchemy import and_, select
+from sqlalchemy.engine import Result
+from sqlalchemy.orm import Session
+from app.core.compression import gzip_stream
+from app.core.config import settings
+from app.core.responses import dumps
+from app.database import read_router
+from app.models.interview import Interview, InterviewQuestion
+
+INTERVIEW_COLUMNS = (
+    "interview_id", "profile_id", "job_role", "job_description", "interview_mode",
+    "duration_minutes", "is_completed", "started_at", "completed_at",
+)
+QUESTION_COLUMNS = (
+    "question_id", "question_type", "question_text", "user_response", "asked_at", "response_timestamp",
+)
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _rows(db: Session, user_id: int) -> Result:
+    statement = select(
+        Interview.id.label("interview_id"), Interview.profile_id, Interview.job_role, Interview.job_description,
+        Interview.interview_mode, Interview.duration_minutes, Interview.is_completed, Interview.started_at,
+        Interview.completed_at, InterviewQuestion.id.label("question_id"), InterviewQuestion.question_type,
+        InterviewQuestion.question_text, InterviewQuestion.user_response,
+        InterviewQuestion.created_at.label("asked_at"), InterviewQuestion.response_timestamp,
+    ).outerjoin(InterviewQuestion, and_(
+        InterviewQuestion.interview_id == Interview.id,
+        InterviewQuestion.question_type != "planned"
+    )).where(
+        Interview.user_id == user_id
+    ).order_by(Interview.id, InterviewQuestion.created_at, InterviewQuestion.id)
+    return db.execute(statement.execution_options(yield_per=settings.export_batch_size))
+
+def ndjson_lines(rows: Iterable) -> Iterator[bytes]:
+    # Rows arrive ordered by interview, so each group is one interview's questions
+    for _, group in groupby(rows, key=lambda row: row.interview_id):
+        group = list(group)
+        record = {name: getattr(group[0], name) for name in INTERVIEW_COLUMNS}
+        record["questions"] = [
+            {name: getattr(row, name) for name in QUESTION_COLUMNS} for row in group if row.question_id is not None
+        ]
+        yield dumps(record) + b"\n"
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def csv_lines(rows: Iterable) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(INTERVIEW_COLUMNS + QUESTION_COLUMNS)
+    for row in rows:
+        writer.writerow([_csv_value(getattr(row, name)) for name in INTERVIEW_COLUMNS + QUESTION_COLUMNS])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+def _chunked(pieces: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Join small pieces into chunks of about size bytes"""
+    chunk = bytearray()
+    for piece in pieces:
+        chunk += piece
+        if len(chunk) >= size:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+def export_interviews(user_id: int, format: str = "ndjson", compress: bool = False, email: Optional[str] = None) -> Iterator[bytes]:
+    """Yield a user's interviews as NDJSON or CSV bytes, optionally gzipped.
+
+    The generator opens its own read session, as it runs after the
+    request's dependencies may already have closed theirs.
+    """
+    db = read_router.session(email)
+    try:
+        lines = ndjson_lines if format == "ndjson" else csv_lines
+        chunks = _chunked(lines(_rows(db, user_id)), settings.export_chunk_size)
+        if compress:
+            chunks = gzip_stream(chunks)
+        yield from chunks
+    finally:
+        db.close()
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.user import User
+from app.models.profile import Profile
+from app.models.interview import Interview, InterviewQuestion
+from app.services import interview_stats
+from app.services.usage_ledger import enforce_token_quota
+
+logger = logging.getLogger(__name__)
+
+class InterviewSession:
+    """In-memory interview context for a WebSocket session, persisted with write-behind"""
+
+    def __init__(self, user: User, interview: Interview, resume_content: str, questions: List[InterviewQuestion]):
+        self.user_id = user.id
+        self.email = user.email
+        self.interview_id = interview.id
+        self.job_role = interview.job_role
+        self.job_description = interview.job_description
+        self.interview_mode = interview.interview_mode
+        self.resume_content = resume_content
+        # Asked questions, in order; "id" is filled in once the row has been written
+        self.turns: List[Dict] = [
+            self._turn(q) for q in questions if q.question_type != "planned"
+        ]
+        # Guided interviews: questions planned at creation that have not been asked yet
+        self.planned: List[Dict] = [
+            self._turn(q) for q in questions if q.question_type == "planned"
+        ]
+        self._writes: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
+        self._on_write_error: Optional[Callable[[Exception], Awaitable[None]]] = None
+        # The first write that failed; later writes are dropped, as they may depend on it
+        self.write_error: Optional[Exception] = None
+
+    @staticmethod
+    def _turn(question: InterviewQuestion) -> Dict:
+        return {
+            "id": question.id,
+            "question": question.question_text,
+            "question_type": question.question_type,
+            "answer": question.user_response,
+        }
+
+    @classmethod
+    def load(cls, email: str, interview_id: int) -> Optional["InterviewSession"]:
+        """Resolve user, interview, profile and questions once for the whole session; None if any is missing"""
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.email == email).first()
+            if not user or not user.is_active:
+                return None
+            interview = db.query(Interview).filter(
+                Interview.id == interview_id,
+                Interview.user_id == user.id
+            ).first()
+            if not interview:
+                return None
+            profile = db.query(Profile).filter(Profile.id == interview.profile_id).first()
+            if not profile:
+                return None
+            questions = db.query(InterviewQuestion).filter(
+                InterviewQuestion.interview_id == interview_id
+            ).order_by(InterviewQuestion.created_at, InterviewQuestion.id).all()
+            return cls(user, interview, profile.resume_content or "", questions)
+        finally:
+            db.close()
+
+    @property
+    def conversation_history(self) -> List[Dict]:
+        return [{"question": t["question"], "answer": t["answer"] or ""} for t in self.turns]
+
+    @property
+    def current_turn(self) -> Optional[Dict]:
+        """The latest asked question, if it is still waiting for an answer"""
+        if self.turns and self.turns[-1]["answer"] is None:
+            return self.turns[-1]
+        return None
+
+    def enforce_token_quota(self):
+        """Raise 429 when the session's user is out of LLM tokens"""
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.id == self.user_id).first()
+            enforce_token_quota(db, user)
+        finally:
+            db.close()
+
+    def start(self, on_write_error: Optional[Callable[[Exception], Awaitable[None]]] = None):
+        """Start the writer; on_write_error is awaited once, when a write first fails"""
+        self._on_write_error = on_write_error
+        self._writer = asyncio.create_task(self._drain_writes())
+
+    async def flush(self):
+        """Wait until every queued write has been applied (or dropped after a failure)"""
+        await self._writes.join()
+
+    async def close(self):
+        """Flush pending writes and stop the writer"""
+        if self._writer:
+            await self._writes.put(None)
+            await self._writer
+
+    def ask_planned(self) -> Dict:
+        """Move the next planned question into the conversation"""
+        turn = self.planned.pop(0)
+        turn["question_type"] = "initial" if not self.turns else "guided"
+        self.turns.append(turn)
+        question_type = turn["question_type"]
+
+        def write(db: Session):
+            db.query(InterviewQuestion).filter(InterviewQuestion.id == turn["id"]).update(
+                {"question_type": question_type, "created_at": func.now()},
+                synchronize_session=False
+            )
+            interview_stats.record_questions_asked(db, self.user_id, self.interview_id)
+        self._enqueue(write)
+        return turn
+
+    def ask(self, question_text: str, question_type: str) -> Dict:
+        """Add a freshly generated question to the conversation"""
+        turn = {"id": None, "question": question_text, "question_type": question_type, "answer": None}
+        self.turns.append(turn)
+
+        def write(db: Session):
+            db_question = InterviewQuestion(
+                interview_id=self.interview_id,
+                question_text=question_text,
+                question_type=question_type
+            )
+            db.add(db_question)
+            db.flush()
+            turn["id"] = db_question.id
+            interview_stats.record_questions_asked(db, self.user_id, self.interview_id)
+        self._enqueue(write)
+        return turn
+
+    def answer(self, response: str) -> Dict:
+        """Record the answer to the current question"""
+        turn = self.current_turn
+        if turn is None:
+            raise ValueError("No question is waiting for an answer")
+        turn["answer"] = response
+        response_timestamp = datetime.utcnow()
+
+        def write(db: Session):
+            # Runs after the question's own insert, so turn["id"] is known by now
+            asked_at = db.query(InterviewQuestion.created_at).filter(InterviewQuestion.id == turn["id"]).scalar()
+            db.query(InterviewQuestion).filter(InterviewQuestion.id == turn["id"]).update(
+                {"user_response": response, "response_timestamp": response_timestamp},
+                synchronize_session=False
+            )
+            interview_stats.record_answer(db, self.user_id, self.interview_id, asked_at, response, response_timestamp)
+        self._enqueue(write)
+        return turn
+
+    def complete(self):
+        completed_at = datetime.utcnow()
+
+        def write(db: Session):
+            started_at, previous_completed_at = db.query(Interview.started_at, Interview.completed_at).filter(
+                Interview.id == self.interview_id
+            ).one()
+            interview_stats.record_completion(
+                db, self.user_id, self.interview_id, started_at, completed_at, previous_completed_at
+            )
+            db.query(Interview).filter(Interview.id == self.interview_id).update(
+                {"is_completed": True, "completed_at": completed_at},
+                synchronize_session=False
+            )
+        self._enqueue(write)
+
+    def _enqueue(self, write: Callable[[Session], None]):
+        self._writes.put_nowait(write)
+
+    async def _drain_writes(self):
+        # Writes run one at a time, in order, on a worker thread
+        while True:
+            write = await self._writes.get()
+            try:
+                if write is None:
+                    break
+                if self.write_error is None:
+                    await asyncio.to_thread(self._apply, write)
+            except Exception as e:
+                # e.g. a failed question insert leaves its turn without an id for the answer's update
+                self.write_error = e
+                logger.error("Error persisting interview session write: %s", e, extra={"fields": {"interview_id": self.interview_id}})
+                if self._on_write_error:
+                    await self._on_write_error(e)
+            finally:
+                self._writes.task_done()
+
+    def _apply(self, write: Callable[[Session], None]):
+        db = SessionLocal()
+        # As get_db does for requests: later reads by this user go to the primary
+        db.info["writer"] = self.email
+        try:
+            write(db)
+            db.commit()
+        finally:
+            db.close()
@@ -0,0 +1,201 @@
+"""Incrementally maintained interview and user statistics.
+
+Every change to an interview adjusts its interview_stats row and the user's
+user_stats row with `column = column + delta` updates, so dashboards read
+one row instead of aggregating the question history. rebuild recomputes the
+rows from the interviews with set-based INSERT ... SELECT statements, for
+repair; backfill runs it at startup on databases upgraded from before the
+stats tables existed:
+
+    python -m app.services.interview_stats rebuild [--email someone@example.com]
+"""
+import argparse
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Union
+from sqlalchemy import Select, case, delete, func, insert, select, true, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import Base, SessionLocal, engine, upgrade_schema
+from app.models.interview import Interview, InterviewQuestion
+from app.models.stats import InterviewStats, UserStats
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Totals kept on both tables, and summed from one into the other
+SUMMED_COLUMNS = ("questions_asked", "questions_answered", "answer_chars", "response_seconds")
+
+def _seconds(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    # Postgres hands back aware datetimes, SQLite naive UTC ones
+    if start.tzinfo:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    if end.tzinfo:
+        end = end.astimezone(timezone.utc).replace(tzinfo=None)
+    return (end - start).total_seconds()
+
+def _elapsed(db: Session, start, end):
+    """SQL for the seconds between two timestamp columns"""
+    if db.bind.dialect.name == "postgresql":
+        return func.extract("epoch", end - start)
+    return (func.julianday(end) - func.julianday(start)) * 86400.0
+
+def _bump(db: Session, model, key_column, key: int, **deltas) -> int:
+    values = {name: getattr(model, name) + delta for name, delta in deltas.items() if delta}
+    if not values:
+        return 1
+    return db.execute(
+        update(model).where(key_column == key).values(**values).execution_options(synchronize_session=False)
+    ).rowcount
+
+def _bump_both(db: Session, user_id: int, interview_id: int, **deltas):
+    _bump(db, InterviewStats, InterviewStats.interview_id, interview_id, **deltas)
+    _bump(db, UserStats, UserStats.user_id, user_id, **deltas)
+
+def start_interview(db: Session, interview: Interview):
+    """Create the stats row of a new (flushed) interview and count it for its user"""
+    db.execute(insert(InterviewStats).values(interview_id=interview.id, user_id=interview.user_id))
+    if _bump(db, UserStats, UserStats.user_id, interview.user_id, interviews_started=1):
+        return
+    # The user's first interview; a concurrent first interview may create the row too
+    dialect_insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    db.execute(dialect_insert(UserStats).values(user_id=interview.user_id).on_conflict_do_nothing())
+    _bump(db, UserStats, UserStats.user_id, interview.user_id, interviews_started=1)
+
+def record_questions_asked(db: Session, user_id: int, interview_id: int, count: int = 1):
+    _bump_both(db, user_id, interview_id, questions_asked=count)
+
+def record_answer(
+    db: Session,
+    user_id: int,
+    interview_id: int,
+    asked_at: Optional[datetime],
+    answer: str,
+    answered_at: datetime,
+    previous_answer: Optional[str] = None,
+    previous_answered_at: Optional[datetime] = None
+):
+    """Count an answer; a revised answer replaces the previous one's length and latency"""
+    _bump_both(
+        db, user_id, interview_id,
+        questions_answered=0 if previous_answer is not None else 1,
+        answer_chars=len(answer) - len(previous_answer or ""),
+        response_seconds=(_seconds(asked_at, answered_at) or 0.0) - (_seconds(asked_at, previous_answered_at) or 0.0),
+    )
+
+def record_completion(
+    db: Session,
+    user_id: int,
+    interview_id: int,
+    started_at: Optional[datetime],
+    completed_at: datetime,
+    previous_completed_at: Optional[datetime] = None
+):
+    """Record an interview's completion time; completing it again replaces the earlier time"""
+    seconds = _seconds(started_at, completed_at) or 0.0
+    db.execute(
+        update(InterviewStats).where(InterviewStats.interview_id == interview_id)
+        .values(completion_seconds=seconds).execution_options(synchronize_session=False)
+    )
+    _bump(
+        db, UserStats, UserStats.user_id, user_id,
+        interviews_completed=0 if previous_completed_at is not None else 1,
+        completion_seconds=seconds - (_seconds(started_at, previous_completed_at) or 0.0),
+    )
+
+def forget_interviews(db: Session, interview_ids: Union[list, Select]):
+    """Take interviews about to be deleted out of their users' totals, and drop their rows"""
+    scoped = InterviewStats.interview_id.in_(interview_ids)
+
+    def removed(expression):
+        return select(func.coalesce(expression, 0)).where(
+            InterviewStats.user_id == UserStats.user_id, scoped
+        ).scalar_subquery()
+
+    values = {name: getattr(UserStats, name) - removed(func.sum(getattr(InterviewStats, name))) for name in SUMMED_COLUMNS}
+    values["interviews_started"] = UserStats.interviews_started - removed(func.count())
+    values["interviews_completed"] = UserStats.interviews_completed - removed(func.count(InterviewStats.completion_seconds))
+    values["completion_seconds"] = UserStats.completion_seconds - removed(func.sum(InterviewStats.completion_seconds))
+    db.execute(
+        update(UserStats).where(UserStats.user_id.in_(select(InterviewStats.user_id).where(scoped)))
+        .values(**values).execution_options(synchronize_session=False)
+    )
+    db.execute(delete(InterviewStats).where(scoped).execution_options(synchronize_session=False))
+
+def rebuild(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute the stats rows of one user (or everyone) from their interviews; returns interviews counted"""
+    interview_scope = Interview.user_id == user_id if user_id is not None else Interview.user_id.is_not(None)
+    stats_scope = InterviewStats.user_id == user_id if user_id is not None else true()
+    db.execute(delete(InterviewStats).where(stats_scope))
+    db.execute(delete(UserStats).where(UserStats.user_id == user_id if user_id is not None else true()))
+
+    answered = InterviewQuestion.user_response.is_not(None)
+    per_interview = select(
+        Interview.id,
+        Interview.user_id,
+        func.coalesce(func.sum(case((InterviewQuestion.question_type != "planned", 1), else_=0)), 0),
+        func.count(InterviewQuestion.user_response),
+        func.coalesce(func.sum(func.length(InterviewQuestion.user_response)), 0),
+        func.coalesce(func.sum(case(
+            (answered, _elapsed(db, InterviewQuestion.created_at, InterviewQuestion.response_timestamp)), else_=0
+        )), 0),
+        case((Interview.completed_at.is_not(None), _elapsed(db, Interview.started_at, Interview.completed_at))),
+    ).outerjoin(InterviewQuestion, InterviewQuestion.interview_id == Interview.id).where(
+        interview_scope
+    ).group_by(Interview.id)
+    counted = db.execute(insert(InterviewStats).from_select(
+        ["interview_id", "user_id", *SUMMED_COLUMNS, "completion_seconds"], per_interview
+    )).rowcount
+
+    per_user = select(
+        InterviewStats.user_id,
+        func.count(),
+        func.count(InterviewStats.completion_seconds),
+        *(func.sum(getattr(InterviewStats, name)) for name in SUMMED_COLUMNS),
+        func.coalesce(func.sum(InterviewStats.completion_seconds), 0),
+    ).where(stats_scope).group_by(InterviewStats.user_id)
+    db.execute(insert(UserStats).from_select(
+        ["user_id", "interviews_started", "interviews_completed", *SUMMED_COLUMNS, "completion_seconds"], per_user
+    ))
+    return counted
+
+def backfill() -> int:
+    """Rebuild all stats if there are interviews but no stats rows yet; returns interviews counted"""
+    with SessionLocal() as db:
+        if db.scalar(select(InterviewStats.interview_id).limit(1)) is not None:
+            return 0
+        if db.scalar(select(Interview.id).limit(1)) is None:
+            return 0
+        try:
+            counted = rebuild(db)
+            db.commit()
+        except IntegrityError:
+            # Another worker starting at the same time backfilled first
+            db.rollback()
+            return 0
+    logger.info("Backfilled interview stats", extra={"fields": {"interviews": counted}})
+    return counted
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild interview and user statistics")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--email", help="Rebuild one user's statistics only")
+    args = parser.parse_args()
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+    with SessionLocal() as db:
+        user_id = None
+        if args.email:
+            user_id = db.scalar(select(User.id).where(User.email == args.email))
+            if user_id is None:
+                parser.error(f"No user with email {args.email}")
+        counted = rebuild(db, user_id)
+        db.commit()
+    print(f"Rebuilt stats for {counted} interviews")
+
+if __name__ == "__main__":
+    main()
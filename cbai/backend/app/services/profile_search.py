@@ -0,0 +1,118 @@
+import re
+from typing import Dict, List, NamedTuple, Optional
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models.profile_search import SEARCH_TABLE
+
+# Quoted phrases, or runs of anything but whitespace, commas and quotes
+_TOKEN_RE = re.compile(r'"([^"]*)"|([^\s,"]+)')
+_WORD_RE = re.compile(r"[\w+#]+")
+_OPERATORS = {"AND", "OR", "NOT"}
+
+class SearchTerm(NamedTuple):
+    operator: str  # How the term joins the previous one: "AND", "OR" or "NOT" (and not)
+    words: List[str]  # One word, or several for a phrase
+    prefix: bool  # Trailing "*": match words starting with the last word
+
+def parse_query(query: str) -> List[SearchTerm]:
+    """Parse recruiter-style queries: kubernetes AND go, "site reliability" OR sre NOT junior, kube*
+
+    Commas and whitespace mean AND. Operators are upper-case keywords. Only
+    word characters (plus "+" and "#") are kept, so the result is safe to
+    render into either dialect's query syntax.
+    """
+    terms = []
+    operator = "AND"
+    for match in _TOKEN_RE.finditer(query):
+        phrase, bare = match.groups()
+        if bare in _OPERATORS:
+            operator = bare
+            continue
+        raw = phrase if phrase is not None else bare
+        words = _WORD_RE.findall(raw.lower())
+        if not words:
+            continue
+        # A leading NOT has nothing to exclude from, so it is dropped
+        terms.append(SearchTerm(operator if terms else "AND", words, bare is not None and bare.endswith("*")))
+        operator = "AND"
+    return terms
+
+def to_fts5(terms: List[SearchTerm]) -> str:
+    parts = []
+    for term in terms:
+        rendered = '"' + " ".join(term.words) + '"' + ("*" if term.prefix else "")
+        parts.append(rendered if not parts else f"{term.operator} {rendered}")
+    return " ".join(parts)
+
+def to_tsquery(terms: List[SearchTerm]) -> str:
+    operators = {"AND": "&", "OR": "|", "NOT": "& !"}
+    parts = []
+    for term in terms:
+        words = [f"'{word}'" for word in term.words]
+        if term.prefix:
+            words[-1] += ":*"
+        rendered = words[0] if len(words) == 1 else "(" + " <-> ".join(words) + ")"
+        parts.append(rendered if not parts else f"{operators[term.operator]} {rendered}")
+    return " ".join(parts)
+
+# Column weights for bm25, in SEARCH_COLUMNS order: name, role, declared skills, resume
+_SQLITE_SEARCH = f"""
+    SELECT p.id, p.user_id, p.full_name, p.career_role,
+           -bm25({SEARCH_TABLE}, 10.0, 10.0, 5.0, 1.0) AS rank,
+           snippet({SEARCH_TABLE}, 3, '[', ']', '…', 16) AS snippet
+    FROM {SEARCH_TABLE} JOIN profiles p ON p.id = {SEARCH_TABLE}.rowid
+    WHERE {SEARCH_TABLE} MATCH :query {{scope}}
+    ORDER BY rank DESC, p.id
+    LIMIT :limit OFFSET :offset
+"""
+_SQLITE_COUNT = f"""
+    SELECT count(*) FROM {SEARCH_TABLE} JOIN profiles p ON p.id = {SEARCH_TABLE}.rowid
+    WHERE {SEARCH_TABLE} MATCH :query {{scope}}
+"""
+# Postgres evaluates ts_headline after the sort and limit, so only for the returned page
+_POSTGRES_SEARCH = """
+    SELECT p.id, p.user_id, p.full_name, p.career_role,
+           ts_rank_cd(p.search_vector, q) AS rank,
+           ts_headline('english', coalesce(p.resume_content, ''), q,
+                       'StartSel=[, StopSel=], MaxWords=24, MinWords=8, MaxFragments=1') AS snippet
+    FROM profiles p, to_tsquery('english', :query) q
+    WHERE p.search_vector @@ q {scope}
+    ORDER BY rank DESC, p.id
+    LIMIT :limit OFFSET :offset
+"""
+_POSTGRES_COUNT = """
+    SELECT count(*) FROM profiles p, to_tsquery('english', :query) q
+    WHERE p.search_vector @@ q {scope}
+"""
+
+def search_profiles(
+    db: Session,
+    query: str,
+    page: int = 1,
+    page_size: int = 20,
+    user_id: Optional[int] = None
+) -> Dict:
+    """Ranked, paginated full-text search; user_id limits results to that user's profiles"""
+    terms = parse_query(query)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query has no searchable terms")
+    if db.bind.dialect.name == "postgresql":
+        search_sql, count_sql, rendered = _POSTGRES_SEARCH, _POSTGRES_COUNT, to_tsquery(terms)
+    else:
+        search_sql, count_sql, rendered = _SQLITE_SEARCH, _SQLITE_COUNT, to_fts5(terms)
+    scope = "AND p.user_id = :user_id" if user_id is not None else ""
+    params = {"query": rendered, "user_id": user_id, "limit": page_size, "offset": (page - 1) * page_size}
+    rows = db.execute(text(search_sql.format(scope=scope)), params).mappings().all()
+    # The first page usually answers the question; only count when there may be more
+    if page == 1 and len(rows) < page_size:
+        total = len(rows)
+    else:
+        total = db.execute(text(count_sql.format(scope=scope)), params).scalar()
+    return {
+        "query": query,
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "results": [dict(row) for row in rows],
+    }
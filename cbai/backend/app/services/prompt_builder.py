@@ -0,0 +1,125 @@
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from textwrap import dedent
+from typing import Dict, List, Optional
+
+# Bump a template's version whenever its wording changes, so stored or logged
+# prompts can be traced back to the template that produced them.
+INTERVIEWER_VERSION = "interviewer/2"
+QUESTION_SET_VERSION = "question-set/1"
+EVALUATOR_VERSION = "evaluator/2"
+
+# Static sections are dedented once at import time; rendering only joins strings.
+_INTERVIEWER_HEADER = "You are a world-class interviewer conducting a technical and behavioral interview."
+
+_INTERVIEWER_RULES = dedent("""\
+    - For every question, you must generate a follow-up that references specific details from the candidate's resume and/or their previous answers.
+    - Do not ask generic questions. Every question should be tailored to the candidate's unique background and the flow of the interview so far.
+    - If clarification is needed, ask for it in a way that builds on what the candidate has already said.
+    - Only output the next interview question, nothing else.""")
+
+_QUESTION_SET_HEADER = "You are a world-class interviewer planning a technical and behavioral interview."
+
+_QUESTION_SET_RULES = dedent("""\
+    - Write exactly {num_questions} interview questions, in the order they should be asked.
+    - Start with an opener about the candidate's background, then move from technical depth to behavioral questions.
+    - Every question must reference specific details from the candidate's resume or the job description.
+    - Return only a JSON array of strings, nothing else.""")
+
+_EVALUATOR_HEADER = dedent("""\
+    You are an expert technical interviewer and evaluator.
+    For each question and answer pair below, provide a brief, constructive feedback on the answer's relevance, completeness, and quality with respect to the question asked.
+    If the answer is missing, say 'No answer given.'""")
+
+_EVALUATOR_FOOTER = "Return a numbered list of feedback, one for each answer."
+
+_ALLOWED_MESSAGE_KEYS = {'role', 'content', 'name'}
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """A fully rendered prompt together with the template version that produced it"""
+    text: str
+    version: str
+
+@lru_cache(maxsize=256)
+def candidate_section(resume_content: str, job_role: str, job_description: Optional[str] = None) -> str:
+    """Render the per-interview candidate section; memoized since it repeats every turn"""
+    lines = [
+        "CANDIDATE BACKGROUND:",
+        f"- Resume Content: {resume_content}",
+        f"- Target Job Role: {job_role}",
+    ]
+    if job_description:
+        lines.append(f"- Job Description: {job_description}")
+    return "\n".join(lines)
+
+@lru_cache(maxsize=256)
+def _evaluation_context(resume_content: Optional[str], job_role: Optional[str], job_description: Optional[str]) -> str:
+    lines = []
+    if resume_content:
+        lines.append(f"Resume Content: {resume_content}")
+    if job_role:
+        lines.append(f"Target Job Role: {job_role}")
+    if job_description:
+        lines.append(f"Job Description: {job_description}")
+    return "\n".join(lines)
+
+def serialize_history(conversation_history: Optional[List[Dict]]) -> str:
+    """Serialize the conversation history the same way for every interviewer prompt"""
+    return json.dumps(conversation_history, indent=1) if conversation_history else '[]'
+
+def build_question_prompt(
+    resume_content: str,
+    job_role: str,
+    job_description: Optional[str] = None,
+    conversation_history: Optional[List[Dict]] = None
+) -> RenderedPrompt:
+    """Build the interviewer system prompt for the next (initial or follow-up) question"""
+    text = "\n\n".join([
+        _INTERVIEWER_HEADER,
+        candidate_section(resume_content, job_role, job_description or None),
+        "INTERVIEW CONTEXT:\n"
+        "- Here is the full conversation history so far (questions and answers):\n"
+        + serialize_history(conversation_history) + "\n"
+        + _INTERVIEWER_RULES,
+    ])
+    return RenderedPrompt(text=text, version=INTERVIEWER_VERSION)
+
+def build_question_set_prompt(
+    resume_content: str,
+    job_role: str,
+    num_questions: int,
+    job_description: Optional[str] = None
+) -> RenderedPrompt:
+    """Build the system prompt that plans a guided interview's whole question set"""
+    text = "\n\n".join([
+        _QUESTION_SET_HEADER,
+        candidate_section(resume_content, job_role, job_description or None),
+        "INTERVIEW PLAN:\n" + _QUESTION_SET_RULES.format(num_questions=num_questions),
+    ])
+    return RenderedPrompt(text=text, version=QUESTION_SET_VERSION)
+
+def build_evaluation_prompt(
+    resume_content: Optional[str] = None,
+    job_role: Optional[str] = None,
+    job_description: Optional[str] = None
+) -> RenderedPrompt:
+    """Build the evaluator system prompt used for answer feedback"""
+    sections = [_EVALUATOR_HEADER]
+    context = _evaluation_context(resume_content, job_role, job_description)
+    if context:
+        sections.append(context)
+    sections.append(_EVALUATOR_FOOTER)
+    return RenderedPrompt(text="\n".join(sections), version=EVALUATOR_VERSION)
+
+def build_messages(system_prompt: str, conversation_history: Optional[List[Dict]] = None) -> List[Dict]:
+    """Build the chat messages for Groq, sanitizing copies of the history entries"""
+    messages = [{"role": "system", "content": system_prompt}]
+    for msg in conversation_history or []:
+        # Only allow supported keys and ensure 'role' and 'content' exist
+        clean = {key: value for key, value in msg.items() if key in _ALLOWED_MESSAGE_KEYS}
+        clean.setdefault('role', 'user')
+        clean.setdefault('content', '')
+        messages.append(clean)
+    return messages
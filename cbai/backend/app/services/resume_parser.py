@@ -1,95 +1,134 @@
 import PyPDF2
 import docx
+import hashlib
 import io
+import time
+from dataclasses import asdict, dataclass
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
 from fastapi import UploadFile
-from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from typing import Iterable, Iterator, List, Optional
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.metrics import RESUME_PARSE_DURATION
+from app.services.resume_sections import ResumeSection, section_text, segment_resume
+from app.services.skill_matcher import get_skill_matcher
+
+def resume_kind(filename: str) -> str:
+    """"pdf" or "docx", by file extension"""
+    if filename.lower().endswith('.pdf'):
+        return "pdf"
+    if filename.lower().endswith(('.docx', '.doc')):
+        return "docx"
+    raise ValueError(f"Unsupported file type: {filename}")
+
+@dataclass
+class ParsedResume:
+    text: str
+    pages: int  # PDF pages or DOCX blocks read
+    truncated: bool  # A page or character budget cut the document short
 
 class ResumeParser:
     """Service for parsing resume files (PDF and DOCX)"""
     
+    def __init__(self, max_pages: Optional[int] = None, max_chars: Optional[int] = None):
+        self.max_pages = max_pages or settings.resume_max_pages
+        self.max_chars = max_chars or settings.resume_max_chars
+    
     async def parse_file(self, file: UploadFile) -> str:
         """Parse resume file and extract text content"""
+        return (await self.parse_upload(file)).text
+    
+    async def parse_upload(self, file: UploadFile) -> ParsedResume:
+        """Parse resume file, reporting whether the budgets truncated it.
+
+        Results are cached cluster-wide by file hash, so a re-uploaded resume
+        is parsed once rather than once per upload.
+        """
         content = await file.read()
-        
-        if file.filename.lower().endswith('.pdf'):
-            return self._parse_pdf(content)
-        elif file.filename.lower().endswith(('.docx', '.doc')):
-            return self._parse_docx(content)
-        else:
-            raise ValueError(f"Unsupported file type: {file.filename}")
+        kind = resume_kind(file.filename)
+        parsed = await run_in_threadpool(
+            get_cache().get_or_compute, self.cache_key(kind, content),
+            lambda: asdict(self.parse(kind, content)), settings.cache_resume_ttl_seconds
+        )
+        return ParsedResume(**parsed)
     
-    def _parse_pdf(self, content: bytes) -> str:
-        """Parse PDF content"""
+    def cache_key(self, kind: str, content: bytes) -> str:
+        return f"resume:{kind}:{self.max_pages}:{self.max_chars}:{hashlib.sha256(content).hexdigest()}"
+    
+    def parse(self, kind: str, content: bytes) -> ParsedResume:
+        """Parse a "pdf" or "docx" document, recording the parse duration"""
+        started = time.perf_counter()
+        parsed = self.parse_pdf(content) if kind == "pdf" else self.parse_docx(content)
+        RESUME_PARSE_DURATION.labels(kind).observe(time.perf_counter() - started)
+        return parsed
+    
+    def iter_pdf_pages(self, content: bytes) -> Iterator[str]:
+        """Yield the text of each PDF page; pages are only decoded as they are consumed"""
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ""
+    
+    def iter_docx_blocks(self, content: bytes) -> Iterator[str]:
+        """Yield paragraphs and table rows in document order"""
+        doc = docx.Document(io.BytesIO(content))
+        for child in doc.element.body.iterchildren():
+            if child.tag == qn('w:p'):
+                yield Paragraph(child, doc).text
+            elif child.tag == qn('w:tbl'):
+                # Walk rows and cells directly; python-docx's row.cells rebuilds the grid per row
+                for tr in child.iterchildren(qn('w:tr')):
+                    cells = []
+                    for tc in tr.iterchildren(qn('w:tc')):
+                        text = "\n".join(Paragraph(p, doc).text for p in tc.iter(qn('w:p'))).strip()
+                        if text:
+                            cells.append(text)
+                    yield " | ".join(cells)
+    
+    def _collect(self, blocks: Iterable[str], max_pages: Optional[int]) -> ParsedResume:
+        """Join blocks in linear time, stopping at the page or character budget"""
+        parts = []
+        chars = 0
+        count = 0
+        for block in blocks:
+            if max_pages is not None and count >= max_pages:
+                return ParsedResume("\n".join(parts).strip(), count, True)
+            count += 1
+            if chars + len(block) > self.max_chars:
+                parts.append(block[:self.max_chars - chars])
+                return ParsedResume("\n".join(parts).strip(), count, True)
+            parts.append(block)
+            chars += len(block) + 1
+        return ParsedResume("\n".join(parts).strip(), count, False)
+    
+    def parse_pdf(self, content: bytes) -> ParsedResume:
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            return self._collect(self.iter_pdf_pages(content), self.max_pages)
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
     
-    def _parse_docx(self, content: bytes) -> str:
-        """Parse DOCX content"""
+    def parse_docx(self, content: bytes) -> ParsedResume:
         try:
-            doc = docx.Document(io.BytesIO(content))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return self._collect(self.iter_docx_blocks(content), None)
         except Exception as e:
             raise Exception(f"Error parsing DOCX: {str(e)}")
     
+    def _parse_pdf(self, content: bytes) -> str:
+        """Parse PDF content"""
+        return self.parse_pdf(content).text
+    
+    def _parse_docx(self, content: bytes) -> str:
+        """Parse DOCX content"""
+        return self.parse_docx(content).text
+    
     def extract_skills(self, text: str) -> list:
         """Extract skills from resume text"""
-        # Common technical skills
-        common_skills = [
-            "Python", "JavaScript", "Java", "C++", "C#", "React", "Angular", "Vue.js",
-            "Node.js", "Express", "Django", "Flask", "FastAPI", "PostgreSQL", "MySQL",
-            "MongoDB", "Redis", "Docker", "Kubernetes", "AWS", "Azure", "GCP",
-            "Git", "GitHub", "CI/CD", "Jenkins", "Agile", "Scrum", "REST API",
-            "GraphQL", "Microservices", "Machine Learning", "AI", "Data Science",
-            "SQL", "NoSQL", "HTML", "CSS", "TypeScript", "PHP", "Ruby", "Go",
-            "Rust", "Swift", "Kotlin", "Scala", "R", "MATLAB", "TensorFlow",
-            "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Jupyter"
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in common_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        return get_skill_matcher().find(text)
     
-    def extract_experience(self, text: str) -> str:
-        """Extract work experience section from resume"""
-        # Simple extraction - look for common experience keywords
-        experience_keywords = [
-            "experience", "work history", "employment", "career", "professional background"
-        ]
-        
-        lines = text.split('\n')
-        experience_lines = []
-        in_experience_section = False
-        
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # Check if we're entering experience section
-            if any(keyword in line_lower for keyword in experience_keywords):
-                in_experience_section = True
-                continue
-            
-            # If we're in experience section, collect lines
-            if in_experience_section and line.strip():
-                experience_lines.append(line.strip())
-            
-            # Stop if we hit another major section
-            if in_experience_section and any(keyword in line_lower for keyword in [
-                "education", "skills", "projects", "certifications", "awards"
-            ]):
-                break
-        
-        return '\n'.join(experience_lines) if experience_lines else "No experience section found" 
\ No newline at end of file
+    def extract_experience(self, text: str, sections: Optional[List[ResumeSection]] = None) -> str:
+        """Extract work experience sections from resume"""
+        if sections is None:
+            sections = segment_resume(text)
+        experience = section_text(text, sections, ["experience"])
+        return experience if experience else "No experience section found"
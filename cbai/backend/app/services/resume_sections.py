@@ -0,0 +1,78 @@
+import json
+import re
+from typing import Iterable, List, NamedTuple, Optional
+
+# Heading phrases per section kind; "other" headings only close the previous section
+SECTION_HEADINGS = {
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience", "work history",
+        "employment", "employment history", "career history", "professional background",
+    ],
+    "education": ["education", "academic background", "education and training", "academics"],
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills", "core competencies", "competencies",
+        "technologies", "tech stack", "tools and technologies",
+    ],
+    "projects": ["projects", "personal projects", "selected projects", "key projects", "side projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications", "certifications and licenses"],
+    "other": [
+        "summary", "professional summary", "profile", "objective", "about me", "awards", "honors",
+        "achievements", "publications", "languages", "interests", "hobbies", "volunteer experience",
+        "volunteering", "references", "activities", "leadership",
+    ],
+}
+
+# Sections that list a candidate's skills, as opposed to headers, contact details or education
+SKILL_SECTION_KINDS = ("skills", "experience", "projects", "certifications")
+
+_KIND_BY_HEADING = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# A heading is a line holding only a known phrase, optionally decorated ("## Skills", "EXPERIENCE:")
+# or followed by inline content after a colon ("Skills: Python, Go")
+_HEADING_RE = re.compile(
+    r"^[ \t#*\-=•]*(?P<heading>"
+    + "|".join(re.escape(h).replace(r"\ ", r"\s+") for h in sorted(_KIND_BY_HEADING, key=len, reverse=True))
+    + r")[ \t]*(?:$|:[ \t]*)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+class ResumeSection(NamedTuple):
+    kind: str
+    heading: str
+    start: int  # Offset of the section body in the resume text
+    end: int
+
+def segment_resume(text: str) -> List[ResumeSection]:
+    """Split a resume into sections in one pass over its heading lines"""
+    sections = []
+    matches = list(_HEADING_RE.finditer(text))
+    for i, match in enumerate(matches):
+        heading = match.group("heading")
+        kind = _KIND_BY_HEADING[" ".join(heading.lower().split())]
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections.append(ResumeSection(kind, heading.strip(), match.end(), end))
+    return [s for s in sections if s.kind != "other"]
+
+def section_text(text: str, sections: Iterable[ResumeSection], kinds: Iterable[str]) -> str:
+    """Concatenated bodies of the sections of the given kinds"""
+    kinds = set(kinds)
+    return "\n".join(text[s.start:s.end].strip() for s in sections if s.kind in kinds).strip()
+
+def sections_to_json(sections: List[ResumeSection]) -> str:
+    return json.dumps([list(s) for s in sections])
+
+def sections_from_json(value: Optional[str]) -> Optional[List[ResumeSection]]:
+    if not value:
+        return None
+    return [ResumeSection(*s) for s in json.loads(value)]
+
+def apply_resume_sections(profile):
+    """Segment a profile's resume and store the section offsets on it"""
+    profile.resume_sections = sections_to_json(segment_resume(profile.resume_content)) if profile.resume_content else None
+
+def profile_sections(profile) -> List[ResumeSection]:
+    """Sections stored with a profile, segmenting on the fly for rows saved before they were stored"""
+    stored = sections_from_json(profile.resume_sections)
+    if stored is not None:
+        return stored
+    return segment_resume(profile.resume_content or "")
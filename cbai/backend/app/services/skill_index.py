@@ -0,0 +1,125 @@
+"""Normalized skills storage: one row per skill, one link per (profile, skill).
+
+    python -m app.services.skill_index backfill   # index profiles saved before the tables existed
+"""
+import argparse
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.database import Base, SessionLocal, engine, upgrade_schema
+from app.models.profile import Profile
+from app.models.skill import ProfileSkill, Skill
+from app.services.resume_sections import SKILL_SECTION_KINDS, profile_sections, section_text
+from app.services.skill_matcher import get_skill_matcher
+
+logger = logging.getLogger(__name__)
+
+def declared_skills(value: Optional[str]) -> List[str]:
+    """Skills from the profile's skills field, which holds a JSON list or free text"""
+    if not value:
+        return []
+    matcher = get_skill_matcher()
+    try:
+        items = json.loads(value)
+    except ValueError:
+        return matcher.find(value)
+    if not isinstance(items, list):
+        return matcher.find(value)
+    names = []
+    for item in items:
+        if isinstance(item, str) and item.strip():
+            names.append(matcher.canonical(item) or " ".join(item.split()))
+    return list(dict.fromkeys(names))
+
+def profile_skill_sources(profile: Profile) -> Dict[str, str]:
+    """Skill name -> source for one profile; declared skills win over resume mentions"""
+    resume = profile.resume_content or ""
+    sections = profile_sections(profile)
+    if sections:
+        resume = section_text(resume, sections, SKILL_SECTION_KINDS) or resume
+    sources = {name: "resume" for name in get_skill_matcher().find(resume)}
+    sources.update({name: "declared" for name in declared_skills(profile.skills)})
+    return sources
+
+def ensure_skills(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """Skill ids by name, inserting the missing skills in one statement (and racing saves safely)"""
+    names = set(names)
+    if not names:
+        return {}
+    ids = dict(db.execute(select(Skill.name, Skill.id).where(Skill.name.in_(names))).all())
+    missing = names - ids.keys()
+    if missing:
+        categories = get_skill_matcher().categories
+        dialect_insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+        # A concurrent save may add the same new skill first; its row is then returned by neither
+        ids.update(db.execute(
+            dialect_insert(Skill).on_conflict_do_nothing(index_elements=[Skill.name]).returning(Skill.name, Skill.id),
+            [{"name": name, "category": categories.get(name, "other")} for name in sorted(missing)]
+        ).all())
+        if len(ids) < len(names):
+            ids.update(db.execute(select(Skill.name, Skill.id).where(Skill.name.in_(names - ids.keys()))).all())
+    return ids
+
+def sync_profile_skills(db: Session, profiles: List[Profile], replace: bool = True):
+    """Replace the skill links of the given (flushed) profiles in bulk; new profiles pass replace=False"""
+    sources = {profile.id: profile_skill_sources(profile) for profile in profiles}
+    ids = ensure_skills(db, {name for skills in sources.values() for name in skills})
+    if replace:
+        db.execute(delete(ProfileSkill).where(ProfileSkill.profile_id.in_(list(sources))))
+    rows = [
+        {"profile_id": profile_id, "skill_id": ids[name], "source": source}
+        for profile_id, skills in sources.items()
+        for name, source in skills.items()
+    ]
+    if rows:
+        db.execute(insert(ProfileSkill), rows)
+
+def profile_ids_with_skills(db: Session, names: Iterable[str]) -> List[int]:
+    """Ids of profiles linked to every one of the given skills (index lookups only)"""
+    matcher = get_skill_matcher()
+    names = {matcher.canonical(name) or name for name in names}
+    query = (
+        select(ProfileSkill.profile_id)
+        .join(Skill, Skill.id == ProfileSkill.skill_id)
+        .where(Skill.name.in_(names))
+        .group_by(ProfileSkill.profile_id)
+        .having(func.count() == len(names))
+    )
+    return list(db.scalars(query))
+
+def backfill(batch_size: int = 500) -> int:
+    """Index every profile that has no skill links yet, in batches"""
+    indexed = 0
+    last_id = 0
+    with SessionLocal() as db:
+        while True:
+            profiles = db.scalars(
+                select(Profile)
+                .where(Profile.id > last_id, ~Profile.skill_links.any())
+                .order_by(Profile.id)
+                .limit(batch_size)
+            ).all()
+            if not profiles:
+                return indexed
+            sync_profile_skills(db, profiles, replace=False)
+            db.commit()
+            indexed += len(profiles)
+            last_id = profiles[-1].id
+            logger.info("Backfilled profile skills", extra={"fields": {"profiles": indexed, "last_id": last_id}})
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the normalized profile skills tables")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    # Create the skills tables (and new columns) on databases from older versions
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+    print(f"Indexed skills for {backfill(args.batch_size)} profiles")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'skill_taxonomy.json')
+
+# Skill terms contain characters such as "+", "#" and "." ("C++", "C#", "Node.js"),
+# so boundaries are defined on those as well as on word characters
+_BEFORE = r"(?<![\w+#])"
+_AFTER = r"(?![\w+#]|\.\w)"
+
+def _trie_pattern(terms: List[str]) -> str:
+    """Compile terms into a prefix-sharing regex so matching cost follows term length, not term count"""
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node: Dict) -> str:
+        ends_here = "" in node
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + render(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        # Greedy optional group: the longest term wins, shorter ones on backtracking
+        return group + "?" if ends_here else group
+
+    return render(trie)
+
+class SkillMatcher:
+    """Single-pass skill extraction over a taxonomy of skills and aliases"""
+
+    def __init__(self, skills: List[Dict]):
+        self.categories: Dict[str, str] = {}
+        self._folded: Dict[str, str] = {}  # lower-cased term -> canonical name
+        self._exact: Dict[str, str] = {}  # case-sensitive term -> canonical name
+        for skill in skills:
+            name = skill["name"]
+            self.categories[name] = skill.get("category", "other")
+            exact = set(skill.get("exact", []))
+            for term in [name] + skill.get("aliases", []):
+                term = " ".join(term.split())
+                if term in exact:
+                    self._exact[term] = name
+                else:
+                    self._folded.setdefault(term.lower(), name)
+
+        alternatives = []
+        if self._folded:
+            alternatives.append(_trie_pattern(list(self._folded)))
+        if self._exact:
+            alternatives.append("(?-i:" + _trie_pattern(list(self._exact)) + ")")
+        pattern = _BEFORE + "(?:" + "|".join(alternatives) + ")" + _AFTER if alternatives else r"(?!)"
+        self._regex = re.compile(pattern, re.IGNORECASE)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["skills"])
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Canonical skill name for a term or alias, if it is in the taxonomy"""
+        term = " ".join(term.split())
+        return self._exact.get(term) or self._folded.get(term.lower())
+
+    def find(self, text: str) -> List[str]:
+        """Canonical skills mentioned in the text, in order of first mention"""
+        found = {}
+        for match in self._regex.finditer(text):
+            name = self.canonical(match.group())
+            if name:
+                found.setdefault(name, None)
+        return list(found)
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Process-wide matcher, compiled once from the configured taxonomy"""
+    return SkillMatcher.from_file(settings.skill_taxonomy_path or DEFAULT_TAXONOMY_PATH)
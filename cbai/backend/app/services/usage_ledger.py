@@ -0,0 +1,133 @@
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import insert, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.interview import Interview
+from app.models.llm_usage import LLMUsage
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+class UsageLedger:
+    """Buffers LLM usage records in memory and writes them in batches on a background thread"""
+
+    def __init__(self, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Dict] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(
+        self,
+        user_id: Optional[int],
+        interview_id: Optional[int],
+        model: str,
+        purpose: str,
+        usage: Optional[Dict],
+        latency_ms: float
+    ):
+        """Queue one call's usage; never touches the database on the caller's path"""
+        usage = usage or {}
+        entry = {
+            "user_id": user_id,
+            "interview_id": interview_id,
+            "model": model,
+            "purpose": purpose,
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+            "latency_ms": latency_ms,
+            "queue_time": usage.get("queue_time"),
+            "prompt_time": usage.get("prompt_time"),
+            "completion_time": usage.get("completion_time"),
+            "total_time": usage.get("total_time"),
+            "created_at": datetime.utcnow(),
+        }
+        with self._lock:
+            self._pending.append(entry)
+            pending = len(self._pending)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="usage-ledger", daemon=True)
+                self._thread.start()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def pending_tokens(self, user_id: int) -> int:
+        """Tokens recorded for a user that have not been written yet"""
+        with self._lock:
+            return sum(e["total_tokens"] for e in self._pending if e["user_id"] == user_id)
+
+    def flush(self):
+        """Write all buffered records in one bulk insert"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        db = SessionLocal()
+        try:
+            for attempt in range(2):
+                try:
+                    db.execute(insert(LLMUsage), _live_references(db, batch))
+                    db.commit()
+                    break
+                except IntegrityError:
+                    # A user or interview was deleted between the check and the insert
+                    db.rollback()
+                    if attempt:
+                        raise
+        except Exception as e:
+            logger.error("Error writing LLM usage ledger: %s", e, extra={"fields": {"records": len(batch)}})
+        finally:
+            db.close()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+def _existing(db: Session, column, ids: set) -> set:
+    return set(db.scalars(select(column).where(column.in_(ids)))) if ids else set()
+
+def _live_references(db: Session, batch: List[Dict]) -> List[Dict]:
+    """The batch with references to users and interviews deleted since the call set to NULL, as ON DELETE SET NULL would"""
+    users = _existing(db, User.id, {e["user_id"] for e in batch if e["user_id"] is not None})
+    interviews = _existing(db, Interview.id, {e["interview_id"] for e in batch if e["interview_id"] is not None})
+    return [
+        {**e, "user_id": e["user_id"] if e["user_id"] in users else None,
+         "interview_id": e["interview_id"] if e["interview_id"] in interviews else None}
+        for e in batch
+    ]
+
+usage_ledger = UsageLedger(
+    batch_size=settings.usage_flush_batch_size,
+    flush_interval=settings.usage_flush_interval_seconds
+)
+atexit.register(usage_ledger.flush)
+
+def tokens_used(db: Session, user_id: int) -> int:
+    """Tokens a user has used within the quota window, including unflushed records"""
+    since = datetime.utcnow() - timedelta(hours=settings.llm_quota_window_hours)
+    written = db.query(func.coalesce(func.sum(LLMUsage.total_tokens), 0)).filter(
+        LLMUsage.user_id == user_id,
+        LLMUsage.created_at >= since
+    ).scalar()
+    return int(written) + usage_ledger.pending_tokens(user_id)
+
+def enforce_token_quota(db: Session, user: User):
+    """Raise 429 when the user has used up their LLM token quota"""
+    quota = settings.llm_guest_token_quota if user.is_guest else settings.llm_user_token_quota
+    if quota and tokens_used(db, user.id) >= quota:
+        raise HTTPException(
+            status_code=429,
+            detail=f"LLM token quota of {quota} tokens per {settings.llm_quota_window_hours}h exceeded"
+        )
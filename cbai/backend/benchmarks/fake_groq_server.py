@@ -0,0 +1,121 @@
+"""Local stand-in for the Groq chat completions API, for offline benchmarks.
+
+Serves POST /openai/v1/chat/completions with a configurable latency
+distribution, SSE streaming and injected 429 responses. Replies are canned
+but shaped like the real ones (question text, JSON question sets, numbered
+feedback) and carry a realistic `usage` block.
+
+    python -m benchmarks.fake_groq_server --port 8090 --latency-ms 800 --rate-429 0.02
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+class FakeGroqConfig:
+    def __init__(
+        self,
+        latency_ms: float = 800.0,
+        latency_sigma: float = 0.5,
+        rate_429: float = 0.0,
+        stream_chunk_delay_ms: float = 15.0,
+        seed: int = 0
+    ):
+        self.latency_ms = latency_ms  # Median time to the first byte
+        self.latency_sigma = latency_sigma  # Log-normal spread; 0 gives a fixed latency
+        self.rate_429 = rate_429  # Fraction of requests rejected as rate limited
+        self.stream_chunk_delay_ms = stream_chunk_delay_ms
+        self.random = random.Random(seed)
+
+    def sample_latency(self) -> float:
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return self.random.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000
+
+def _reply_for(messages: list) -> str:
+    system = messages[0]["content"] if messages else ""
+    if "JSON array" in system:
+        match = re.search(r"exactly (\d+) interview questions", system)
+        count = int(match.group(1)) if match else 5
+        return json.dumps([f"Planned question {i + 1}: walk me through a project from your resume?" for i in range(count)])
+    if "evaluator" in system:
+        user = messages[-1]["content"] if len(messages) > 1 else ""
+        count = max(1, len(re.findall(r"^\d+\. Q:", user, flags=re.MULTILINE)))
+        return "\n".join(f"{i + 1}. Feedback: Relevant answer; add a concrete metric." for i in range(count))
+    return "Can you describe a technically difficult problem from your last role and how you solved it?"
+
+def _usage(messages: list, reply: str, elapsed: float) -> dict:
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+    completion_tokens = max(1, len(reply) // 4)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "queue_time": 0.001,
+        "prompt_time": elapsed * 0.2,
+        "completion_time": elapsed * 0.8,
+        "total_time": elapsed,
+    }
+
+def create_app(config: FakeGroqConfig) -> Starlette:
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if config.random.random() < config.rate_429:
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": "1"}
+            )
+        started = time.perf_counter()
+        await asyncio.sleep(config.sample_latency())
+        messages = body.get("messages", [])
+        reply = _reply_for(messages)
+        model = body.get("model", "fake-model")
+
+        if not body.get("stream"):
+            return JSONResponse({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                "usage": _usage(messages, reply, time.perf_counter() - started),
+            })
+
+        async def events():
+            for word in re.findall(r"\S+\s*", reply):
+                chunk = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "model": model,
+                         "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(config.stream_chunk_delay_ms / 1000)
+            final = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "model": model,
+                     "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                     "x_groq": {"usage": _usage(messages, reply, time.perf_counter() - started)}}
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return Starlette(routes=[Route("/openai/v1/chat/completions", chat_completions, methods=["POST"])])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--stream-chunk-delay-ms", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    config = FakeGroqConfig(args.latency_ms, args.latency_sigma, args.rate_429, args.stream_chunk_delay_ms, args.seed)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
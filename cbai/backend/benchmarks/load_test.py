@@ -0,0 +1,278 @@
+"""End-to-end load test of full interview flows.
+
+Each flow is what a guest does in the frontend: create a guest session,
+upload a resume, create a profile and an interview, answer N questions
+(generate-question, reload the interview, respond), then request feedback
+and complete the interview. Flows run at the given concurrency and the
+report gives throughput, p50/p95/p99 latency and error rate per endpoint.
+
+By default the API and a simulated Groq server (benchmarks/fake_groq_server.py)
+are started locally on a throwaway SQLite database, so the run is offline
+and reproducible:
+
+    python -m benchmarks.load_test --flows 200 --concurrency 20 --turns 5 --json results.json
+
+Use --base-url to drive an already running API instead.
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import docx
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Recorder:
+    """Collects latency samples, status codes and errors per endpoint"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.status_codes: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.samples[endpoint].append(time.perf_counter() - started)
+            self.errors[endpoint] += 1
+            raise
+        self.samples[endpoint].append(time.perf_counter() - started)
+        self.status_codes[endpoint][response.status_code] += 1
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+        return response
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def resume_docx() -> bytes:
+    document = docx.Document()
+    document.add_heading("Jordan Lee", 0)
+    document.add_heading("Experience", 1)
+    for i in range(8):
+        document.add_paragraph(f"Built service {i} in Python and FastAPI, deployed on Kubernetes with Docker and PostgreSQL.")
+    document.add_heading("Skills", 1)
+    document.add_paragraph("Python, FastAPI, PostgreSQL, Redis, Docker, Kubernetes, AWS")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+async def run_flow(client: httpx.AsyncClient, recorder: Recorder, turns: int, mode: str, resume: bytes):
+    """One guest's full interview; raises on the first failed step"""
+    api = "/api/v1"
+    response = await recorder.call(client, "POST /auth/guest", "POST", f"{api}/auth/guest")
+    response.raise_for_status()
+    token = response.json()["access_token"]
+    response = await recorder.call(client, "GET /auth/me", "GET", f"{api}/auth/me",
+                                   headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    headers = {"X-User-Email": response.json()["email"]}
+
+    response = await recorder.call(
+        client, "POST /profiles/upload-resume", "POST", f"{api}/profiles/upload-resume",
+        files={"file": ("resume.docx", resume, "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}
+    )
+    response.raise_for_status()
+    resume_content = response.json()["resume_content"]
+    response = await recorder.call(client, "POST /profiles/guest", "POST", f"{api}/profiles/guest", headers=headers, json={
+        "full_name": "Jordan Lee", "career_role": "Backend Engineer", "skills": "[]", "resume_content": resume_content,
+    })
+    response.raise_for_status()
+    profile_id = response.json()["id"]
+
+    response = await recorder.call(client, "POST /interviews/", "POST", f"{api}/interviews/", headers=headers, json={
+        "profile_id": profile_id, "job_role": "Backend Engineer", "interview_mode": mode, "duration_minutes": 15,
+    })
+    response.raise_for_status()
+    interview_id = response.json()["id"]
+
+    history = []
+    for _ in range(turns):
+        response = await recorder.call(
+            client, "POST /interviews/{id}/generate-question", "POST",
+            f"{api}/interviews/{interview_id}/generate-question", headers=headers,
+            json={"conversation_history": history, "resume_content": resume_content, "job_role": "Backend Engineer"}
+        )
+        response.raise_for_status()
+        response = await recorder.call(client, "GET /interviews/{id}", "GET", f"{api}/interviews/{interview_id}", headers=headers)
+        response.raise_for_status()
+        question = response.json()["questions"][-1]
+        answer = "I designed the ingestion pipeline in Python, profiled it and cut p95 latency by 40%."
+        response = await recorder.call(
+            client, "POST /interviews/{id}/questions/{qid}/respond", "POST",
+            f"{api}/interviews/{interview_id}/questions/{question['id']}/respond", headers=headers, json=answer
+        )
+        response.raise_for_status()
+        history.append({"question": question["question_text"], "answer": answer})
+
+    response = await recorder.call(client, "POST /interviews/{id}/feedback", "POST",
+                                   f"{api}/interviews/{interview_id}/feedback", headers=headers)
+    response.raise_for_status()
+    response = await recorder.call(client, "POST /interviews/{id}/complete", "POST",
+                                   f"{api}/interviews/{interview_id}/complete", headers=headers)
+    response.raise_for_status()
+
+async def run_load(base_url: str, flows: int, concurrency: int, turns: int, mode: str) -> Dict:
+    recorder = Recorder()
+    resume = resume_docx()
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(flows):
+        queue.put_nowait(i)
+    failed_flows = 0
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal failed_flows
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await run_flow(client, recorder, turns, mode, resume)
+            except (httpx.HTTPError, KeyError, IndexError, ValueError):
+                failed_flows += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    total_requests = 0
+    for endpoint, samples in sorted(recorder.samples.items()):
+        ordered = sorted(samples)
+        total_requests += len(ordered)
+        endpoints[endpoint] = {
+            "requests": len(ordered),
+            "errors": recorder.errors[endpoint],
+            "error_rate": recorder.errors[endpoint] / len(ordered),
+            "status_codes": dict(recorder.status_codes[endpoint]),
+            "p50_ms": percentile(ordered, 50) * 1000,
+            "p95_ms": percentile(ordered, 95) * 1000,
+            "p99_ms": percentile(ordered, 99) * 1000,
+            "max_ms": ordered[-1] * 1000,
+        }
+    return {
+        "elapsed_seconds": elapsed,
+        "flows": flows,
+        "failed_flows": failed_flows,
+        "flows_per_second": (flows - failed_flows) / elapsed,
+        "requests": total_requests,
+        "requests_per_second": total_requests / elapsed,
+        "endpoints": endpoints,
+    }
+
+def print_report(report: Dict):
+    print(f"\n{report['flows']} flows ({report['failed_flows']} failed) in {report['elapsed_seconds']:.1f}s: "
+          f"{report['flows_per_second']:.2f} flows/s, {report['requests_per_second']:.1f} req/s\n")
+    print(f"{'endpoint':<48} {'n':>6} {'err%':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for endpoint, stats in report["endpoints"].items():
+        print(f"{endpoint:<48} {stats['requests']:>6} {stats['error_rate'] * 100:>5.1f}% "
+              f"{stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms")
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(url: str, timeout: float = 20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+def start_local_stack(args, workdir: str) -> Tuple[str, List[subprocess.Popen]]:
+    """Start the simulated Groq server and the API on free local ports"""
+    groq_port, api_port = free_port(), free_port()
+    groq = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fake_groq_server", "--port", str(groq_port),
+        "--latency-ms", str(args.groq_latency_ms), "--latency-sigma", str(args.groq_latency_sigma),
+        "--rate-429", str(args.groq_429_rate), "--seed", str(args.seed),
+    ], cwd=BACKEND_DIR)
+    database_url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        DIRECT_URL=database_url,
+        # Empty values override .env, so the run never touches a developer's Redis or replica
+        REDIS_URL="",
+        READ_REPLICA_URL="",
+        GROQ_BASE_URL=f"http://127.0.0.1:{groq_port}/openai/v1",
+        GROQ_API_KEY="benchmark",
+        UPLOAD_DIR=os.path.join(workdir, "uploads"),
+        LLM_USER_TOKEN_QUOTA="0",
+        LLM_GUEST_TOKEN_QUOTA="0",
+        LOG_LEVEL="WARNING",
+        DEBUG="false",
+    )
+    processes = [groq]
+    try:
+        processes.insert(0, subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "main:app", "--port", str(api_port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ], cwd=BACKEND_DIR, env=env))
+        base_url = f"http://127.0.0.1:{api_port}"
+        wait_for(f"{base_url}/health")
+    except BaseException:
+        stop_processes(processes)
+        raise
+    return base_url, processes
+
+def stop_processes(processes: List[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test of full interview flows")
+    parser.add_argument("--base-url", help="Drive a running API instead of starting a local one")
+    parser.add_argument("--flows", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=3, help="Question/answer turns per interview")
+    parser.add_argument("--mode", choices=["real", "guided"], default="real")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local API")
+    parser.add_argument("--groq-latency-ms", type=float, default=300.0)
+    parser.add_argument("--groq-latency-sigma", type=float, default=0.5)
+    parser.add_argument("--groq-429-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    processes: List[subprocess.Popen] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            base_url = args.base_url
+            if not base_url:
+                base_url, processes = start_local_stack(args, workdir)
+            report = asyncio.run(run_load(base_url, args.flows, args.concurrency, args.turns, args.mode))
+        finally:
+            stop_processes(processes)
+    report["config"] = {key: value for key, value in vars(args).items() if key != "json_path"}
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Synthetic resume corpus for parser benchmarks.
+
+Generates PDF and DOCX resumes of a given page count, optionally with
+tables and with many embedded images. PDFs are written directly (one
+Helvetica text stream per page plus image XObjects), so no PDF library is
+needed beyond what the backend already installs.
+"""
+import io
+import random
+import struct
+import zlib
+from typing import Dict, List
+import docx
+from docx.shared import Inches
+
+LINES_PER_PAGE = 48
+SECTIONS = ["Experience", "Projects", "Education", "Skills", "Certifications"]
+SKILL_WORDS = [
+    "Python", "Go", "Java", "TypeScript", "React", "Django", "FastAPI", "PostgreSQL", "Redis",
+    "Docker", "Kubernetes", "AWS", "GCP", "Terraform", "Kafka", "Spark", "PyTorch", "GraphQL",
+]
+FILLER = (
+    "designed built owned migrated scaled profiled automated led mentored shipped reduced improved "
+    "latency throughput pipeline service platform cluster dashboard api workflow reliability cost"
+).split()
+
+def resume_lines(pages: int, seed: int = 0) -> List[str]:
+    """Plausible resume text: section headings followed by bullet lines"""
+    rng = random.Random(seed)
+    lines = ["Jordan Lee", "jordan.lee@example.com | +1 555 010 0000"]
+    while len(lines) < pages * LINES_PER_PAGE:
+        lines.append(SECTIONS[(len(lines) // 12) % len(SECTIONS)])
+        for _ in range(11):
+            words = rng.sample(FILLER, 6) + rng.sample(SKILL_WORDS, 2)
+            rng.shuffle(words)
+            lines.append("- " + " ".join(words).capitalize() + ".")
+    return lines[:pages * LINES_PER_PAGE]
+
+def _png(width: int, height: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + bytes(rng.randrange(256) for _ in range(width * 3)) for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf(pages: int, tables: bool = False, images_per_page: int = 0, seed: int = 0) -> bytes:
+    lines = resume_lines(pages, seed)
+    rng = random.Random(seed)
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    page_tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    image_ids = []
+    for i in range(images_per_page and 4):
+        pixels = bytes(rng.randrange(256) for _ in range(32 * 32 * 3))
+        data = zlib.compress(pixels)
+        image_ids.append(add(
+            b"<< /Type /XObject /Subtype /Image /Width 32 /Height 32 /ColorSpace /DeviceRGB "
+            b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+        ))
+
+    page_ids = []
+    for page in range(pages):
+        ops = ["BT /F1 10 Tf 12 TL 50 760 Td"]
+        for line in lines[page * LINES_PER_PAGE:(page + 1) * LINES_PER_PAGE]:
+            if tables and line.startswith("- "):
+                # Render bullets as a three-column table row
+                cells = line[2:].split(" ", 2)
+                for offset, cell in zip((0, 120, 240), cells):
+                    ops.append(f"{offset} 0 Td ({_pdf_escape(cell)}) Tj {-offset} 0 Td")
+                ops.append("T*")
+            else:
+                ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        for i in range(images_per_page):
+            x, y = 50 + (i % 8) * 60, 40 + (i // 8) * 60
+            ops.append(f"q 48 0 0 48 {x} {y} cm /Im{i % len(image_ids)} Do Q")
+        content = "\n".join(ops).encode("latin-1")
+        stream = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        xobjects = " ".join(f"/Im{i} {obj} 0 R" for i, obj in enumerate(image_ids))
+        resources = f"<< /Font << /F1 {font} 0 R >> /XObject << {xobjects} >> >>".encode()
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Resources " % page_tree
+            + resources + b" /Contents %d 0 R >>" % stream
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    kids = " ".join(f"{p} 0 R" for p in page_ids).encode()
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+def make_docx(pages: int, tables: bool = False, images_per_page: int = 0, seed: int = 0) -> bytes:
+    lines = resume_lines(pages, seed)
+    document = docx.Document()
+    image = _png(64, 64, seed)
+    table = None
+    for i, line in enumerate(lines):
+        if tables and line.startswith("- "):
+            if table is None:
+                table = document.add_table(rows=0, cols=3)
+            cells = table.add_row().cells
+            for cell, text in zip(cells, line[2:].split(" ", 2)):
+                cell.text = text
+            continue
+        table = None
+        document.add_paragraph(line)
+        if images_per_page and i % LINES_PER_PAGE == 0:
+            for _ in range(images_per_page):
+                document.add_picture(io.BytesIO(image), width=Inches(0.5))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def build_corpus(seed: int = 0) -> Dict[str, bytes]:
+    """Named corpus documents: plain at 1/5/30 pages, plus table-heavy and image-heavy variants"""
+    corpus = {}
+    for pages in (1, 5, 30):
+        corpus[f"pdf-{pages}p"] = make_pdf(pages, seed=seed)
+        corpus[f"docx-{pages}p"] = make_docx(pages, seed=seed)
+    corpus["pdf-5p-tables"] = make_pdf(5, tables=True, seed=seed)
+    corpus["docx-5p-tables"] = make_docx(5, tables=True, seed=seed)
+    corpus["pdf-5p-images"] = make_pdf(5, images_per_page=16, seed=seed)
+    corpus["docx-5p-images"] = make_docx(5, images_per_page=8, seed=seed)
+    return corpus
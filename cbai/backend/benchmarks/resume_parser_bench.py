@@ -0,0 +1,80 @@
+"""Micro-benchmark of ResumeParser stages over a generated resume corpus.
+
+For every corpus document (PDF and DOCX at 1, 5 and 30 pages, plus table-
+and image-heavy variants) it times the parse stage (_parse_pdf /
+_parse_docx) and the text stages (extract_skills, extract_experience),
+reporting median time, peak traced memory and characters per second.
+
+    python -m benchmarks.resume_parser_bench --repeat 5 --json parser.json
+
+The JSON output is stable across versions so runs can be diffed to catch
+regressions.
+"""
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from app.services.resume_parser import ResumeParser
+from benchmarks.resume_corpus import build_corpus
+
+def measure(stage: Callable[[], object], repeat: int) -> Dict:
+    """Median wall time over `repeat` runs, plus peak memory of one traced run"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = stage()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"result": result, "median_s": statistics.median(timings), "min_s": min(timings), "peak_bytes": peak}
+
+def run(repeat: int, seed: int) -> List[Dict]:
+    parser = ResumeParser()
+    results = []
+    for name, content in build_corpus(seed).items():
+        parse = parser._parse_pdf if name.startswith("pdf") else parser._parse_docx
+        parsed = measure(lambda: parse(content), repeat)
+        text = parsed.pop("result")
+        stages = {"parse": parsed}
+        for stage_name, stage in (("extract_skills", parser.extract_skills), ("extract_experience", parser.extract_experience)):
+            stages[stage_name] = measure(lambda: stage(text), repeat)
+            stages[stage_name].pop("result")
+        for stats in stages.values():
+            stats["chars_per_s"] = len(text) / stats["median_s"] if stats["median_s"] else None
+        results.append({"document": name, "bytes": len(content), "chars": len(text), "stages": stages})
+    return results
+
+def print_report(results: List[Dict]):
+    print(f"{'document':<18} {'stage':<20} {'median':>10} {'peak':>10} {'chars/s':>14}")
+    for doc in results:
+        for stage, stats in doc["stages"].items():
+            print(f"{doc['document']:<18} {stage:<20} {stats['median_s'] * 1000:>8.2f}ms "
+                  f"{stats['peak_bytes'] / 1024:>8.0f}KB {stats['chars_per_s'] or 0:>14,.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume parser micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this path")
+    args = parser.parse_args()
+    results = run(args.repeat, args.seed)
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "benchmark": "resume_parser",
+                "python": platform.python_version(),
+                "repeat": args.repeat,
+                "seed": args.seed,
+                "results": results,
+            }, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Micro-benchmark of response serialization for GET /interviews/{id}.
+
+Builds an interview with 50 answered questions as ORM objects (no database)
+and times three ways of turning it into response bytes:
+
+    validated_stdlib  FastAPI's response_model path rendered by JSONResponse
+    validated_orjson  the same path rendered by the app's FastJSONResponse
+    trusted_orjson    trusted_response: ORM fields straight to orjson bytes
+
+    python -m benchmarks.serialization_bench --repeat 200 --json serialization.json
+
+Every stage must produce the same JSON document; the benchmark checks this
+before timing anything.
+"""
+import argparse
+import json
+import platform
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.core.responses import FastJSONResponse, trusted_response
+from app.models import Interview, InterviewQuestion
+from app.schemas.interview import InterviewWithQuestions
+from benchmarks.resume_parser_bench import measure
+
+WORDS = (
+    "designed built migrated scaled services python postgres kafka latency throughput team "
+    "customers incident rollout kubernetes caching queue api tests reliability budget"
+).split()
+
+def build_interview(questions: int, seed: int) -> Interview:
+    rng = random.Random(seed)
+    started = datetime(2024, 5, 1, 9, 30)
+    interview = Interview(
+        id=1, user_id=1, profile_id=1, job_role="Backend Engineer",
+        job_description=" ".join(rng.choice(WORDS) for _ in range(400)),
+        interview_mode="guided", duration_minutes=30, is_completed=True,
+        started_at=started, completed_at=started + timedelta(minutes=30),
+    )
+    interview.questions = [
+        InterviewQuestion(
+            id=i + 1, interview_id=1, question_type="guided",
+            question_text=" ".join(rng.choice(WORDS) for _ in range(30)) + "?",
+            user_response=" ".join(rng.choice(WORDS) for _ in range(150)),
+            created_at=started + timedelta(seconds=30 * i),
+            response_timestamp=started + timedelta(seconds=30 * i + 20),
+        )
+        for i in range(questions)
+    ]
+    return interview
+
+def _run(coroutine):
+    """Drive a coroutine that never suspends, without an event loop's overhead"""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+def stages(interview: Interview) -> Dict:
+    field = create_response_field(name="response", type_=InterviewWithQuestions)
+
+    def validated():
+        return _run(serialize_response(field=field, response_content=interview, is_coroutine=True))
+
+    return {
+        "validated_stdlib": lambda: JSONResponse(validated()).body,
+        "validated_orjson": lambda: FastJSONResponse(validated()).body,
+        "trusted_orjson": lambda: trusted_response(InterviewWithQuestions, interview).body,
+    }
+
+def run(repeat: int, seed: int, questions: int) -> List[Dict]:
+    interview = build_interview(questions, seed)
+    benchmarks = stages(interview)
+    documents = {name: json.loads(stage()) for name, stage in benchmarks.items()}
+    baseline = documents["validated_stdlib"]
+    mismatched = [name for name, document in documents.items() if document != baseline]
+    if mismatched:
+        raise SystemExit(f"serialization differs from the response_model path: {', '.join(mismatched)}")
+    results = []
+    for name, stage in benchmarks.items():
+        stats = measure(stage, repeat)
+        stats["bytes"] = len(stats.pop("result"))
+        results.append({"stage": name, **stats})
+    for stats in results:
+        stats["speedup"] = results[0]["median_s"] / stats["median_s"] if stats["median_s"] else None
+    return results
+
+def print_report(results: List[Dict], questions: int):
+    print(f"InterviewWithQuestions, {questions} questions, {results[0]['bytes']:,} bytes")
+    print(f"{'stage':<18} {'median':>10} {'min':>10} {'peak':>10} {'speedup':>8}")
+    for stats in results:
+        print(f"{stats['stage']:<18} {stats['median_s'] * 1000:>8.3f}ms {stats['min_s'] * 1000:>8.3f}ms "
+              f"{stats['peak_bytes'] / 1024:>8.0f}KB {stats['speedup'] or 0:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Response serialization micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this path")
+    args = parser.parse_args()
+    results = run(args.repeat, args.seed, args.questions)
+    print_report(results, args.questions)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "benchmark": "serialization",
+                "python": platform.python_version(),
+                "repeat": args.repeat,
+                "seed": args.seed,
+                "questions": args.questions,
+                "results": results,
+            }, f, indent=2)
+
+if __name__ == "__main__":
+    main()
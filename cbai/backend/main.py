@@ -1,21 +1,45 @@
+import secrets
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import users, auth, profiles, interviews
-from app.database import engine, Base
-from app.models import User, Profile, Interview, InterviewQuestion
-from fastapi.responses import JSONResponse
+from app.routers import users, auth, profiles, interviews, fit
+from app.database import engine, Base, upgrade_schema
+from app.models import User, Profile, Interview, InterviewQuestion, LLMUsage, Skill, ProfileSkill
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi import Request, HTTPException
 from starlette.status import HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN
+from app.core.config import settings
+from app.core.logs import setup_logging, RequestIdMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics, METRICS_CONTENT_TYPE
+from app.core.query_tracking import QueryTrackingMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.responses import FastJSONResponse
+from app.services.account_deletion import account_purger
+from app.services import interview_stats
+from app.services.skill_matcher import get_skill_matcher
+
+# Structured, queue-backed logging
+setup_logging()
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+upgrade_schema()
+
+# Build interview statistics for databases upgraded from before they existed
+interview_stats.backfill()
+
+# Finish account purges interrupted by a restart; each worker queues them, and one claims each account
+account_purger.resume_pending()
+
+# Compile the skill taxonomy once per process rather than on the first upload
+get_skill_matcher()
 
 # Create FastAPI app
 app = FastAPI(
     title="CareerBuildAI API",
     description="AI-Powered Mock Interview Platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -36,11 +60,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (brotli or gzip, per Accept-Encoding)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency, in-flight and DB metrics
+app.add_middleware(MetricsMiddleware, routes=app.routes)
+
+# Per-request query counts, N+1 detection and (debug) query totals in headers
+app.add_middleware(QueryTrackingMiddleware)
+
+# Tag every request (and its log records) with a request id; outermost so
+# every other middleware's records carry it too
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(users.router)
 app.include_router(auth.router)
 app.include_router(profiles.router)
 app.include_router(interviews.router)
+app.include_router(fit.router)
 
 @app.get("/")
 def read_root():
@@ -50,6 +88,17 @@ def read_root():
 def health_check():
     return {"status": "healthy", "message": "CareerBuildAI API is running"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    # Route names, latencies and traffic are not for the public internet
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.metrics_token and not secrets.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {settings.metrics_token}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     # Ensure CORS headers are present in error responses
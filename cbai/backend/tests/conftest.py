@@ -0,0 +1,198 @@
+import asyncio
+import json
+import os
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, Optional
+
+# Point the app at a private in-memory database before anything imports it
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["DIRECT_URL"] = "sqlite://"
+os.environ["DEBUG"] = "true"
+os.environ["GROQ_API_KEY"] = "test"
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.websockets import WebSocketDisconnect
+
+import main
+from app.core import cache as cache_module
+from app.core.cache import MemoryBackend, TwoTierCache
+from app.core.query_tracking import QueryStats, current_query_stats
+from app.database import engine
+from app.models import Base
+from app.routers import fit as fit_router
+from app.routers import interviews as interviews_router
+from app.routers import profiles as profiles_router
+from app.services import fit_scoring
+from app.services.fit_scoring import FitIndex
+from tests.fakes import FakeGroqService
+
+class Measurement:
+    def __init__(self, response: httpx.Response, stats: Optional[QueryStats], peak_bytes: int):
+        self.response = response
+        # Counted once the whole body has been read: the headers miss queries run while streaming
+        self.queries = stats.queries if stats else 0
+        self.repeated_queries = len(stats.repeated_shapes()) if stats else 0
+        self.peak_kb = peak_bytes / 1024
+
+class WebSocketSession:
+    """Client side of one WebSocket connection, driven through the app's ASGI interface"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, app, url: str, headers: dict):
+        self.loop = loop
+        self.to_app: asyncio.Queue = asyncio.Queue()
+        self.from_app: asyncio.Queue = asyncio.Queue()
+        path, _, query = url.partition("?")
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "http_version": "1.1",
+            "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+            "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+            "client": ("testclient", 50000), "server": ("testserver", 80), "subprotocols": [],
+        }
+        self.task = loop.create_task(app(scope, self.to_app.get, self.from_app.put))
+        self.to_app.put_nowait({"type": "websocket.connect"})
+        self._expect("websocket.accept")
+
+    def _receive(self) -> dict:
+        # The app only runs while the loop does, so wait here for its next message
+        return self.loop.run_until_complete(asyncio.wait_for(self.from_app.get(), timeout=10))
+
+    def _expect(self, message_type: str) -> dict:
+        message = self._receive()
+        if message["type"] == "websocket.close":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        assert message["type"] == message_type, message
+        return message
+
+    def send_json(self, data):
+        self.to_app.put_nowait({"type": "websocket.receive", "text": json.dumps(data)})
+
+    def receive_json(self):
+        return json.loads(self._expect("websocket.send")["text"])
+
+    def close(self):
+        self.to_app.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        self.loop.run_until_complete(asyncio.wait_for(self.task, timeout=10))
+
+class ApiClient:
+    """Synchronous wrapper around an in-process ASGI client"""
+
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return self.loop.run_until_complete(self.client.request(method, url, **kwargs))
+
+    def measure(self, method: str, url: str, **kwargs) -> Measurement:
+        """Issue a request, recording its queries (body included) and peak Python allocation"""
+        # The request's own QueryStats, as the app's middleware fills it in; background threads have none
+        seen: List[QueryStats] = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            stats = current_query_stats.get()
+            if stats is not None and not seen:
+                seen.append(stats)
+
+        event.listen(Engine, "after_cursor_execute", capture)
+        tracemalloc.start()
+        try:
+            response = self.request(method, url, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            event.remove(Engine, "after_cursor_execute", capture)
+        return Measurement(response, seen[0] if seen else None, peak)
+
+    @contextmanager
+    def websocket(self, url: str, headers: dict = None):
+        """Open a WebSocket to the app; raises WebSocketDisconnect if it is refused"""
+        session = WebSocketSession(self.loop, self.app, url, headers or {})
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def close(self):
+        self.loop.run_until_complete(self.client.aclose())
+        self.loop.close()
+
+@pytest.fixture(autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(autouse=True)
+def fake_groq(monkeypatch):
+    monkeypatch.setattr(interviews_router, "GroqService", FakeGroqService)
+    return FakeGroqService
+
+@pytest.fixture(autouse=True)
+def upload_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiles_router, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+@pytest.fixture(autouse=True)
+def fit_index(monkeypatch):
+    # The process-wide index would otherwise outlive each test's database
+    index = FitIndex()
+    monkeypatch.setattr(fit_router, "fit_index", index)
+    monkeypatch.setattr(fit_scoring, "fit_index", index)
+    return index
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    # A private in-memory cache per test, whatever redis_url says
+    instance = TwoTierCache(MemoryBackend())
+    monkeypatch.setattr(cache_module, "_cache", instance)
+    return instance
+
+@pytest.fixture
+def client():
+    api = ApiClient(main.app)
+    yield api
+    api.close()
+
+@pytest.fixture
+def guest(client):
+    """A guest user with a profile, as created by the guest flow"""
+    token = client.request("POST", "/api/v1/auth/guest").json()["access_token"]
+    user = client.request("GET", "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}).json()
+    headers = {"X-User-Email": user["email"]}
+    profile = client.request("POST", "/api/v1/profiles/guest", headers=headers, json={
+        "full_name": "Guest User",
+        "career_role": "Backend Engineer",
+        "skills": "[\"Python\", \"Docker\"]",
+        "resume_content": "Backend engineer with Python, FastAPI, Docker and Kubernetes experience.",
+    }).json()
+    return {"token": token, "user": user, "headers": headers, "profile": profile}
+
+@pytest.fixture
+def interview(client, guest):
+    """A real-mode interview with two answered questions"""
+    headers = guest["headers"]
+    interview = client.request("POST", "/api/v1/interviews/", headers=headers, json={
+        "profile_id": guest["profile"]["id"],
+        "job_role": "Backend Engineer",
+        "interview_mode": "real",
+        "duration_minutes": 15,
+    }).json()
+    history = []
+    for _ in range(2):
+        client.request("POST", f"/api/v1/interviews/{interview['id']}/generate-question", headers=headers, json={
+            "conversation_history": history,
+            "resume_content": guest["profile"]["resume_content"],
+            "job_role": "Backend Engineer",
+        })
+        question = client.request("GET", f"/api/v1/interviews/{interview['id']}", headers=headers).json()["questions"][-1]
+        client.request(
+            "POST", f"/api/v1/interviews/{interview['id']}/questions/{question['id']}/respond",
+            headers=headers, json="I built the service in Python and deployed it with Docker."
+        )
+        history.append({"question": question["question_text"], "answer": "I built the service in Python."})
+    return interview
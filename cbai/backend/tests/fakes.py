@@ -0,0 +1,35 @@
+from typing import Dict, List, Optional
+from app.services.prompt_builder import build_question_prompt
+
+class FakeGroqService:
+    """Stand-in for GroqService that answers instantly without network access"""
+
+    def __init__(self, user_id: Optional[int] = None, interview_id: Optional[int] = None):
+        self.user_id = user_id
+        self.interview_id = interview_id
+
+    async def generate_question(self, resume_content: str, job_role: str, job_description: Optional[str] = None,
+                                conversation_history: Optional[List[Dict]] = None, return_prompt: bool = False):
+        question = f"Question {len(conversation_history or []) + 1} about your {job_role} experience?"
+        if return_prompt:
+            return question, build_question_prompt(resume_content, job_role, job_description, conversation_history)
+        return question
+
+    async def generate_follow_up_question(self, resume_content: str, job_role: str, conversation_history: List[Dict],
+                                          job_description: Optional[str] = None, return_prompt: bool = False):
+        return await self.generate_question(resume_content, job_role, job_description, conversation_history, return_prompt)
+
+    async def stream_follow_up_question(self, resume_content: str, job_role: str, conversation_history: List[Dict],
+                                        job_description: Optional[str] = None):
+        for delta in ("Tell me ", "more about ", f"your {job_role} work?"):
+            yield delta
+
+    async def generate_question_set(self, resume_content: str, job_role: str, num_questions: int,
+                                    job_description: Optional[str] = None) -> List[str]:
+        return [f"Planned question {i + 1}?" for i in range(num_questions)]
+
+    async def evaluate_answers(self, qa_pairs: List[Dict], resume_content: Optional[str] = None,
+                               job_role: Optional[str] = None, job_description: Optional[str] = None,
+                               return_raw_response: bool = False):
+        feedback = ["Clear and relevant answer."] * len(qa_pairs)
+        return (feedback, {"usage": {"total_tokens": 0}}) if return_raw_response else feedback
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, text
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models import Interview, InterviewQuestion, LLMUsage, Profile, ProfileSkill, User
+from app.services.account_deletion import account_purger, claim_purge, purge_orphans
+from app.services.usage_ledger import usage_ledger
+
+def _counts():
+    with SessionLocal() as db:
+        return {model.__tablename__: db.scalar(select(func.count()).select_from(model))
+                for model in (User, Profile, ProfileSkill, Interview, InterviewQuestion)}
+
+def _add_usage(guest, interview):
+    with SessionLocal() as db:
+        user_id = db.scalar(select(User.id).where(User.email == guest["user"]["email"]))
+        db.add(LLMUsage(user_id=user_id, interview_id=interview["id"], model="test", total_tokens=42))
+        db.commit()
+
+def _usage():
+    with SessionLocal() as db:
+        return db.execute(select(LLMUsage.user_id, LLMUsage.interview_id, LLMUsage.total_tokens)).all()
+
+def test_profile_delete_removes_its_interviews(client, guest, interview):
+    _add_usage(guest, interview)
+    response = client.request("DELETE", f"/api/v1/profiles/{guest['profile']['id']}", headers=guest["headers"])
+    assert response.status_code == 200
+    counts = _counts()
+    assert counts["users"] == 1
+    assert counts["profiles"] == counts["profile_skills"] == counts["interviews"] == counts["interview_questions"] == 0
+    # Usage survives for token totals, detached from the interview
+    assert [(row.interview_id, row.total_tokens) for row in _usage()] == [(None, 42)]
+
+    again = client.request("DELETE", f"/api/v1/profiles/{guest['profile']['id']}", headers=guest["headers"])
+    assert again.status_code == 404
+
+def test_interview_delete_is_scoped_to_its_owner(client, guest, interview):
+    other = {"X-User-Email": "someone@example.com"}
+    client.request("POST", "/api/v1/users/", json={
+        "email": "someone@example.com", "username": "someone", "full_name": "Someone", "password": "s3cret-pass",
+    })
+    assert client.request("DELETE", f"/api/v1/interviews/{interview['id']}", headers=other).status_code == 404
+    assert _counts()["interviews"] == 1
+
+    assert client.request("DELETE", f"/api/v1/interviews/{interview['id']}", headers=guest["headers"]).status_code == 200
+    assert _counts()["interviews"] == _counts()["interview_questions"] == 0
+
+def _bearer(guest):
+    return {"Authorization": f"Bearer {guest['token']}"}
+
+def test_account_deletion_requires_the_token(client, guest, interview):
+    # The email header alone names an account; it does not prove the caller owns it
+    response = client.request("DELETE", "/api/v1/users/me", headers=guest["headers"])
+    assert response.status_code == 403
+    response = client.request("DELETE", "/api/v1/users/me", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+    assert _counts()["users"] == 1
+
+def test_deactivated_accounts_are_refused(client, guest, interview):
+    with SessionLocal() as db:
+        db.query(User).update({User.is_active: False, User.purge_requested_at: func.now()})
+        db.commit()
+    response = client.request("POST", "/api/v1/interviews/", headers=guest["headers"], json={
+        "profile_id": guest["profile"]["id"], "job_role": "Backend Engineer", "interview_mode": "real", "duration_minutes": 15,
+    })
+    assert (response.status_code, response.json()["detail"]) == (400, "Inactive user")
+    response = client.request("GET", f"/api/v1/interviews/{interview['id']}", headers=guest["headers"])
+    assert response.status_code == 400
+    assert client.request("DELETE", "/api/v1/users/me", headers=_bearer(guest)).status_code == 400
+
+def test_small_account_is_deleted_inline(client, guest, interview):
+    _add_usage(guest, interview)
+    response = client.request("DELETE", "/api/v1/users/me", headers=_bearer(guest))
+    assert response.status_code == 200
+    assert set(_counts().values()) == {0}
+    assert [(row.user_id, row.interview_id) for row in _usage()] == [(None, None)]
+
+def test_large_account_is_purged_in_the_background(client, guest, interview, monkeypatch):
+    monkeypatch.setattr(settings, "purge_inline_max_rows", 0)
+    monkeypatch.setattr(settings, "purge_batch_size", 1)
+    # Hold the job until the request's session has closed: the test database is one shared connection
+    queued = []
+    monkeypatch.setattr(account_purger, "enqueue", queued.append)
+    response = client.request("DELETE", "/api/v1/users/me", headers=_bearer(guest))
+    assert response.status_code == 202
+    with SessionLocal() as db:
+        assert db.scalar(select(User.is_active)) is False
+    monkeypatch.undo()
+    monkeypatch.setattr(settings, "purge_batch_size", 1)
+    for user_id in queued:
+        account_purger.enqueue(user_id)
+    account_purger.join()
+    assert set(_counts().values()) == {0}
+
+def test_usage_recorded_for_a_deleted_interview_is_kept(client, guest, interview):
+    with SessionLocal() as db:
+        user_id = db.scalar(select(User.id).where(User.email == guest["user"]["email"]))
+    usage_ledger.flush()
+    client.request("DELETE", f"/api/v1/interviews/{interview['id']}", headers=guest["headers"])
+    # A call that finished after the delete, in the same batch as one that is still valid
+    usage_ledger.record(user_id, interview["id"], "test", "question", {"total_tokens": 7}, 1.0)
+    usage_ledger.record(user_id, None, "test", "question", {"total_tokens": 5}, 1.0)
+    usage_ledger.flush()
+    assert sorted(_usage()) == [(user_id, None, 5), (user_id, None, 7)]
+
+def test_pending_purges_resume(client, guest, interview):
+    with SessionLocal() as db:
+        db.query(User).update({User.is_active: False, User.purge_requested_at: func.now()})
+        db.commit()
+    account_purger.resume_pending()
+    account_purger.join()
+    assert _counts()["users"] == 0
+
+def test_a_claimed_purge_is_left_to_its_purger(client, guest, interview):
+    with SessionLocal() as db:
+        db.query(User).update({User.is_active: False, User.purge_requested_at: func.now()})
+        db.commit()
+        user_id = db.scalar(select(User.id))
+    # Two workers resuming at startup: only the first claims the account
+    assert claim_purge(user_id)
+    assert not claim_purge(user_id)
+    account_purger.resume_pending()
+    account_purger.join()
+    assert _counts()["users"] == 1
+
+    # A claim not renewed within the timeout is taken over
+    with SessionLocal() as db:
+        db.query(User).update({User.purge_started_at: datetime.utcnow() - timedelta(hours=1)})
+        db.commit()
+    account_purger.resume_pending()
+    account_purger.join()
+    assert _counts()["users"] == 0
+
+def test_foreign_keys_cascade(client, guest, interview):
+    # The database enforces the tree too, for deletes made outside the services
+    with SessionLocal() as db:
+        db.execute(text("DELETE FROM users"))
+        db.commit()
+    assert set(_counts().values()) == {0}
+
+def test_purge_orphans(client, guest, interview):
+    with SessionLocal() as db:
+        db.execute(text("PRAGMA foreign_keys=OFF"))
+        db.execute(text("DELETE FROM profiles"))
+        db.commit()
+        db.execute(text("PRAGMA foreign_keys=ON"))
+    assert _counts()["interviews"] == 1
+
+    with SessionLocal() as db:
+        counts = purge_orphans(db)
+        db.commit()
+    assert counts == {"interviews": 1, "profiles": 0, "questions": 0, "profile_skills": 4}
+    remaining = _counts()
+    assert remaining["users"] == 1
+    assert remaining["interviews"] == remaining["interview_questions"] == remaining["profile_skills"] == 0
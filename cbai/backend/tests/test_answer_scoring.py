@@ -0,0 +1,77 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from app.services.answer_scoring import prescore_answers
+
+RESUME = "Skills: Python, Docker, Kubernetes"
+ASKED_AT = datetime(2026, 1, 1, 12, 0)
+
+def _question(id, text, answer, latency=None):
+    answered_at = ASKED_AT + timedelta(seconds=latency) if latency is not None else None
+    return SimpleNamespace(
+        id=id, question_text=text, user_response=answer, created_at=ASKED_AT, response_timestamp=answered_at
+    )
+
+def test_scores_combine_length_overlap_and_skills():
+    questions = [
+        _question(1, "Describe your Python and Docker deployment pipeline?",
+                  "I built the deployment pipeline in Python.", latency=42),
+        _question(2, "How do you scale services?", "With Kubernetes and Docker, services scale out.", latency=18),
+    ]
+    result = prescore_answers(questions, RESUME)
+    first, second = result["scores"]
+    # 3 of python, docker, deployment, pipeline; 1 of 2 target skills; 7 of 80 target words
+    assert first == {
+        "question_id": 1, "answer_length": 7, "response_latency_seconds": 42.0, "keyword_overlap": 0.75,
+        "skills_mentioned": ["Python"], "score": 43.5,
+    }
+    assert second["skills_mentioned"] == ["Docker", "Kubernetes"]
+    assert second["keyword_overlap"] == 1.0
+    assert result["summary"] == {
+        "answered": 2, "total": 2, "average_answer_length": 7.0, "average_response_latency_seconds": 30.0,
+        "resume_skill_coverage": 1.0, "score": round((43.5 + second["score"]) / 2, 1),
+    }
+
+def test_unanswered_questions_score_zero_and_are_left_out_of_averages():
+    questions = [
+        _question(1, "Describe your Python work?", "Python services, mostly.", latency=10),
+        _question(2, "How do you scale services?", None),
+        _question(3, "Anything else?", "   "),
+    ]
+    result = prescore_answers(questions, RESUME)
+    scores, summary = result["scores"], result["summary"]
+    assert [s["score"] for s in scores[1:]] == [0.0, 0.0]
+    assert [s["response_latency_seconds"] for s in scores[1:]] == [None, None]
+    assert (summary["answered"], summary["total"]) == (1, 3)
+    assert summary["average_answer_length"] == 3.0
+    assert summary["average_response_latency_seconds"] == 10.0
+    assert summary["resume_skill_coverage"] == round(1 / 3, 3)
+
+def test_latency_across_naive_and_aware_timestamps():
+    question = _question(1, "Why Docker?", "Reproducible builds.")
+    question.response_timestamp = (ASKED_AT + timedelta(seconds=5)).replace(tzinfo=timezone.utc)
+    assert prescore_answers([question], RESUME)["scores"][0]["response_latency_seconds"] == 5.0
+
+def test_empty_batch_and_resume():
+    assert prescore_answers([], None) == {"scores": [], "summary": {
+        "answered": 0, "total": 0, "average_answer_length": 0.0, "average_response_latency_seconds": None,
+        "resume_skill_coverage": 0.0, "score": 0.0,
+    }}
+    score = prescore_answers([_question(1, "Why Docker?", "Docker keeps builds reproducible.")], "")["scores"][0]
+    assert score["skills_mentioned"] == []
+
+def test_progressive_feedback_streams_the_prescore_first(client, guest, interview):
+    response = client.request(
+        "POST", f"/api/v1/interviews/{interview['id']}/feedback", headers=guest["headers"],
+        params={"progressive": "true"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    prescore, feedback = [json.loads(line) for line in response.text.splitlines()]
+    assert prescore["type"] == "prescore"
+    assert prescore["summary"]["answered"] == prescore["summary"]["total"] == 2
+    questions = client.request("GET", f"/api/v1/interviews/{interview['id']}", headers=guest["headers"]).json()["questions"]
+    assert [s["question_id"] for s in prescore["scores"]] == [q["id"] for q in questions]
+    assert all(s["skills_mentioned"] == ["Python", "Docker"] for s in prescore["scores"])
+    assert feedback["type"] == "feedback"
+    assert feedback["feedback"] == ["Clear and relevant answer."] * 2
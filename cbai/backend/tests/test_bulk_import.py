@@ -0,0 +1,117 @@
+import json
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models import Profile, ProfileSkill, Skill, User
+from app.services import bulk_import
+from app.services.bulk_import import import_users, read_records
+from benchmarks.resume_corpus import make_docx
+
+CSV = (
+    "email,username,full_name,password,career_role,skills,resume_file\n"
+    "ada@example.com,ada,Ada Lovelace,s3cret-pass,Backend Engineer,\"[\"\"Python\"\", \"\"Docker\"\"]\",\n"
+    "grace@example.com,grace,Grace Hopper,s3cret-pass,Data Engineer,,grace.docx\n"
+    "linus@example.com,linus,Linus T,s3cret-pass,,,\n"
+)
+
+@pytest.fixture(autouse=True)
+def shared_pool():
+    yield
+    if bulk_import._shared_pool is not None:
+        bulk_import._shared_pool.shutdown()
+        bulk_import._shared_pool = None
+
+def _superuser(guest):
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.email == guest["user"]["email"]).values(is_superuser=True))
+        db.commit()
+    return guest["headers"]
+
+def _import(client, headers, name, content, resumes=()):
+    files = [("file", (name, content))] + [("resumes", resume) for resume in resumes]
+    return client.request("POST", "/api/v1/users/import", headers=headers, files=files)
+
+def test_csv_import_creates_users_profiles_and_skills(client, guest, monkeypatch):
+    # With import_api_workers=1 the API imports inline, starting no processes
+    monkeypatch.setattr(settings, "import_api_workers", 1)
+    monkeypatch.setattr(bulk_import, "ProcessPoolExecutor", None)
+    response = _import(client, _superuser(guest), "cohort.csv", CSV.encode(), [("grace.docx", make_docx(1))])
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["created"] == 3 and result["errors"] == []
+    users = {user["email"]: user for user in result["users"]}
+    assert users["linus@example.com"]["profile_id"] is None
+
+    login = client.request("POST", "/api/v1/auth/login", json={"email": "ada@example.com", "password": "s3cret-pass"})
+    assert login.status_code == 200
+    with SessionLocal() as db:
+        grace = db.get(Profile, users["grace@example.com"]["profile_id"])
+        assert grace.resume_file_name == "grace.docx"
+        assert grace.resume_content.startswith("Jordan Lee")
+        skills = db.scalars(select(Skill.name).join(ProfileSkill).where(
+            ProfileSkill.profile_id == users["ada@example.com"]["profile_id"]
+        )).all()
+    assert {"Python", "Docker"} <= set(skills)
+
+def test_bad_rows_are_reported_without_stopping_the_import(client, guest):
+    rows = [
+        {"email": guest["user"]["email"], "username": "taken", "full_name": "Taken", "password": "pw"},
+        {"email": "new@example.com", "username": "new", "full_name": "New", "password": "pw"},
+        {"email": "new@example.com", "username": "new2", "full_name": "Again", "password": "pw"},
+        {"email": "not-an-email", "username": "bad", "full_name": "Bad", "password": "pw"},
+        {"email": "cv@example.com", "username": "cv", "full_name": "CV", "password": "pw", "resume_file": "cv.pdf"},
+    ]
+    content = "\n".join(json.dumps(row) for row in rows) + "\n{not json\n"
+    result = _import(client, _superuser(guest), "cohort.jsonl", content.encode()).json()
+    assert result["created"] == 1
+    assert [user["email"] for user in result["users"]] == ["new@example.com"]
+    errors = {error["row"]: error["error"] for error in result["errors"]}
+    assert errors[1] == "Email already registered"
+    assert errors[3] == "Email appears earlier in the file"
+    assert errors[4].startswith("email:")
+    assert errors[5] == "Resume file not uploaded: cv.pdf"
+    assert errors[6].startswith("Invalid JSON")
+
+def test_import_in_worker_processes(client, guest):
+    # As the CLI runs it
+    records, errors = read_records(CSV.encode(), "cohort.csv")
+    with SessionLocal() as db, bulk_import.worker_pool(2) as pool:
+        result = import_users(db, records, {"grace.docx": make_docx(1)}, errors, batch_size=2, pool=pool)
+    assert result.created == 3, result.errors
+    login = client.request("POST", "/api/v1/auth/login", json={"email": "linus@example.com", "password": "s3cret-pass"})
+    assert login.status_code == 200
+
+def test_api_imports_reuse_one_pool(client, guest, monkeypatch):
+    monkeypatch.setattr(settings, "import_api_workers", 2)
+    headers = _superuser(guest)
+    assert _import(client, headers, "a.csv", CSV.encode(), [("grace.docx", make_docx(1))]).json()["created"] == 3
+    pool = bulk_import._shared_pool
+    assert pool is not None
+    row = "email,username,full_name,password\nalan@example.com,alan,Alan Turing,s3cret-pass\n"
+    assert _import(client, headers, "b.csv", row.encode()).json()["created"] == 1
+    assert bulk_import._shared_pool is pool
+
+def test_large_files_are_left_to_the_cli(client, guest, monkeypatch):
+    monkeypatch.setattr(settings, "import_max_rows", 2)
+    response = _import(client, _superuser(guest), "cohort.csv", CSV.encode())
+    assert response.status_code == 413
+    with SessionLocal() as db:
+        assert db.scalar(select(User).where(User.email == "ada@example.com")) is None
+
+def test_failed_insert_reports_the_database_error(client, guest, monkeypatch):
+    def fail(db, ready, parsed):
+        raise IntegrityError("INSERT INTO profiles", {}, Exception("CHECK constraint failed: career_role"))
+    monkeypatch.setattr(bulk_import, "_insert", fail)
+    records, errors = read_records(CSV.encode(), "cohort.csv")
+    with SessionLocal() as db:
+        result = import_users(db, records, {"grace.docx": make_docx(1)}, errors)
+    assert result.created == 0
+    assert {error.error for error in result.errors} == {"Could not be saved: CHECK constraint failed: career_role"}
+
+def test_only_superusers_can_import(client, guest):
+    response = _import(client, guest["headers"], "cohort.csv", CSV.encode())
+    assert response.status_code == 403
+    response = _import(client, _superuser(guest), "cohort.xlsx", b"")
+    assert response.status_code == 400
@@ -0,0 +1,152 @@
+import io
+import threading
+import time
+from datetime import datetime, timezone
+import docx
+import pytest
+from app.core.cache import MemoryBackend, TwoTierCache
+from app.services.resume_parser import ResumeParser
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+def backend(clock):
+    return MemoryBackend(clock)
+
+def _worker(backend, clock, **kwargs):
+    """One worker process's cache over the shared backend"""
+    return TwoTierCache(backend, namespace="test", clock=clock, **kwargs)
+
+def test_values_are_shared_through_the_backend(backend, clock):
+    first, second = _worker(backend, clock), _worker(backend, clock)
+    calls = []
+
+    assert first.get_or_compute("k", lambda: calls.append(1) or {"n": 1}, ttl=60) == {"n": 1}
+    assert second.get_or_compute("k", lambda: calls.append(2) or {"n": 2}, ttl=60) == {"n": 1}
+    assert calls == [1]
+
+    clock.now += 61
+    assert first.get("k") is None
+    assert second.get("k") is None
+
+def test_both_tiers_return_the_same_decoded_value(backend, clock):
+    first, second = _worker(backend, clock), _worker(backend, clock)
+    value = {"at": datetime(2026, 1, 1, tzinfo=timezone.utc), "ids": (1, 2), "by_id": {7: "x"}}
+
+    computed = first.get_or_compute("k", lambda: value, ttl=60)
+    # The local tier holds what Redis returns to other workers, not the caller's object
+    expected = {"at": "2026-01-01T00:00:00Z", "ids": [1, 2], "by_id": {"7": "x"}}
+    assert computed == first.get("k") == second.get("k") == expected
+    value["ids"] = ()
+    assert first.get("k")["ids"] == [1, 2]
+
+def test_invalidation_reaches_every_workers_local_tier(backend, clock):
+    first, second = _worker(backend, clock), _worker(backend, clock)
+    first.set("profile", "old", ttl=60)
+    assert second.get("profile") == "old"  # Now also in second's local tier
+
+    first.invalidate("profile")
+    assert second.get("profile") is None
+    assert first.get("profile") is None
+
+def test_local_tier_is_bounded_by_its_ttl(backend, clock):
+    worker = _worker(backend, clock, local_ttl=5)
+    worker.set("k", "v1", ttl=60)
+    # A write the local tier never heard about (e.g. a lost invalidation)
+    _worker(backend, clock).backend.set("test:k", b'{"v":"v2","s":2000,"h":2000}', 60)
+    assert worker.get("k") == "v1"
+    clock.now += 6
+    assert worker.get("k") == "v2"
+
+def test_stale_values_are_refreshed_by_one_caller(backend, clock):
+    worker = _worker(backend, clock)
+    worker.set("k", "v1", ttl=60, soft_ttl=10)
+    clock.now += 11
+
+    # Another worker holds the refresh lock: the stale value is served, nothing recomputed
+    token = backend.acquire("test:lock:k", 30)
+    assert worker.get_or_compute("k", lambda: pytest.fail("recomputed while locked"), ttl=60) == "v1"
+    backend.release("test:lock:k", token)
+
+    assert worker.get_or_compute("k", lambda: "v2", ttl=60, soft_ttl=10) == "v2"
+    assert worker.get_or_compute("k", lambda: pytest.fail("fresh value recomputed"), ttl=60) == "v2"
+
+def test_failed_refresh_serves_the_stale_value(backend, clock):
+    worker = _worker(backend, clock)
+    worker.set("k", "v1", ttl=60, soft_ttl=10)
+    clock.now += 11
+
+    def broken():
+        raise RuntimeError("upstream down")
+    assert worker.get_or_compute("k", broken, ttl=60) == "v1"
+
+def test_cold_miss_is_computed_once(backend):
+    worker = TwoTierCache(backend, namespace="test")
+    other = TwoTierCache(backend, namespace="test")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda cache=cache: results.append(cache.get_or_compute("k", compute, ttl=60)))
+        for cache in [worker, other] * 4
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+def test_reuploaded_resume_is_parsed_once(client, monkeypatch):
+    document = docx.Document()
+    document.add_paragraph("Experience")
+    document.add_paragraph("Backend engineer, Python and Docker")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    parse_docx = ResumeParser.parse_docx
+    calls = []
+    monkeypatch.setattr(ResumeParser, "parse_docx", lambda self, content: calls.append(1) or parse_docx(self, content))
+
+    bodies = [
+        client.request("POST", "/api/v1/profiles/upload-resume", files={"file": ("resume.docx", buffer.getvalue())}).json()
+        for _ in range(2)
+    ]
+    assert bodies[0]["resume_content"] == bodies[1]["resume_content"] == "Experience\nBackend engineer, Python and Docker"
+    assert len(calls) == 1
+
+def test_repeat_reads_skip_loading_rows(client, guest, interview):
+    for url in (f"/api/v1/profiles/{guest['profile']['id']}", f"/api/v1/interviews/{interview['id']}"):
+        first = client.measure("GET", url, headers=guest["headers"])
+        second = client.measure("GET", url, headers=guest["headers"])
+        assert second.response.json() == first.response.json()
+        assert second.queries == 2  # The user and the ETag validators only
+
+def test_recreated_profile_is_not_served_from_the_cache(client, guest):
+    def create(name):
+        return client.request("POST", "/api/v1/profiles/", headers=guest["headers"], json={
+            "full_name": name, "career_role": "Engineer", "skills": "[]", "resume_content": "Python",
+        }).json()["id"]
+
+    profile_id = create("First")
+    url = f"/api/v1/profiles/{profile_id}"
+    first = client.request("GET", url, headers=guest["headers"])
+    client.request("DELETE", url, headers=guest["headers"])
+    # SQLite reuses the id, and the new row is created within the same second
+    assert create("Second") == profile_id
+    second = client.request("GET", url, headers=guest["headers"])
+    assert second.json()["full_name"] == "Second"
+    assert second.headers["etag"] != first.headers["etag"]
@@ -0,0 +1,82 @@
+from sqlalchemy import text
+from app.database import SessionLocal
+
+SRE_JD = {
+    "job_role": "Site Reliability Engineer",
+    "job_description": "Run Kubernetes clusters, write Go services and manage infrastructure with Terraform.",
+}
+
+def _add_profile(client, guest, role, resume):
+    return client.request("POST", "/api/v1/profiles/", headers=guest["headers"], json={
+        "full_name": "Guest User", "career_role": role, "skills": "[]", "resume_content": resume,
+    }).json()
+
+def _rank(client, guest, **body):
+    return client.request("POST", "/api/v1/fit/rank-profiles", headers=guest["headers"], json={**SRE_JD, **body}).json()
+
+def test_rank_profiles_against_one_jd(client, guest):
+    sre = _add_profile(client, guest, "SRE", "Operated Kubernetes clusters and wrote Go services for on-call tooling.")
+    analyst = _add_profile(client, guest, "Data Analyst", "Built Tableau dashboards and SQL reports.")
+
+    ranking = _rank(client, guest)
+    assert [r["profile_id"] for r in ranking][0] == sre["id"]
+    assert ranking[-1]["profile_id"] == analyst["id"]
+    best = ranking[0]
+    assert best["matching_skills"] == ["Go", "Kubernetes"]  # Rarer skills first
+    assert best["missing_skills"] == ["Terraform"]
+    assert 0 < best["score"] <= 100
+    assert len(_rank(client, guest, limit=1)) == 1
+
+def test_index_follows_profile_changes(client, guest):
+    analyst = _add_profile(client, guest, "Data Analyst", "Built Tableau dashboards and SQL reports.")
+    before = {r["profile_id"]: r["score"] for r in _rank(client, guest)}
+
+    client.request("PUT", f"/api/v1/profiles/{analyst['id']}", headers=guest["headers"], json={
+        "resume_content": "Moved into platform work: Terraform, Kubernetes and Go.",
+    })
+    after = _rank(client, guest)
+    assert after[0]["profile_id"] == analyst["id"]
+    assert after[0]["score"] > before[analyst["id"]]
+    assert after[0]["missing_skills"] == []
+
+    client.request("DELETE", f"/api/v1/profiles/{analyst['id']}", headers=guest["headers"])
+    assert analyst["id"] not in {r["profile_id"] for r in _rank(client, guest)}
+
+def test_score_profile_against_many_jds(client, guest, interview):
+    url = f"/api/v1/fit/profiles/{guest['profile']['id']}"
+    jobs = [SRE_JD, {"job_role": "Backend Engineer", "job_description": "Python and FastAPI services on Docker."}]
+    scores = client.request("POST", url, headers=guest["headers"], json={"jobs": jobs}).json()
+    assert [s["job_role"] for s in scores] == ["Site Reliability Engineer", "Backend Engineer"]
+    assert scores[1]["score"] > scores[0]["score"]
+    assert set(scores[1]["matching_skills"]) == {"Python", "FastAPI", "Docker"}
+    assert scores[1]["missing_skills"] == []
+
+    # Without jobs, the user's interview job descriptions are used (the fixture's interview has none)
+    assert client.request("POST", url, headers=guest["headers"], json={}).json() == []
+
+def test_rank_is_scoped_to_own_profiles(client, guest):
+    token = client.request("POST", "/api/v1/auth/guest").json()["access_token"]
+    email = client.request("GET", "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}).json()["email"]
+    assert _rank(client, {"headers": {"X-User-Email": email}}) == []
+    assert len(_rank(client, guest)) == 1
+
+def test_index_loads_rows_committed_late_by_other_workers(client, guest):
+    first = _add_profile(client, guest, "SRE", "Operated Kubernetes clusters and wrote Go services.")
+    last = _add_profile(client, guest, "SRE", "Ran Terraform and Kubernetes for a payments team.")
+    with SessionLocal() as db:
+        db.execute(text("DELETE FROM profiles WHERE id = :id"), {"id": first["id"]})
+        db.commit()
+    assert len(_rank(client, guest)) == 2
+
+    # Another worker's insert, committed after our refresh with a lower id and an older timestamp;
+    # plain SQL, so this process's change tracking never sees it
+    with SessionLocal() as db:
+        db.execute(text(
+            "INSERT INTO profiles (id, user_id, full_name, career_role, skills, resume_content, created_at, row_version) "
+            "SELECT :id, user_id, 'Late', 'SRE', '[]', 'Go and Kubernetes on call.', '2000-01-01 00:00:00', 1 "
+            "FROM profiles WHERE id = :last"
+        ), {"id": first["id"], "last": last["id"]})
+        db.commit()
+    assert first["id"] in {r["profile_id"] for r in _rank(client, guest)}
+    url = f"/api/v1/fit/profiles/{first['id']}"
+    assert client.request("POST", url, headers=guest["headers"], json={"jobs": [SRE_JD]}).status_code == 200
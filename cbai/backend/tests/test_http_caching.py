@@ -0,0 +1,87 @@
+from app.core.compression import negotiate_encoding
+
+LONG_RESUME = "Backend engineer building Python services on Kubernetes. " * 200
+
+def _get(client, guest, url, **headers):
+    return client.request("GET", url, headers={**guest["headers"], **headers})
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("br;q=0, gzip") == "gzip"
+    assert negotiate_encoding("gzip;q=0.5, br;q=0.8") == "br"
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+def test_profile_etag_revalidates_until_updated(client, guest):
+    url = f"/api/v1/profiles/{guest['profile']['id']}"
+    first = _get(client, guest, url)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    cached = _get(client, guest, url, **{"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    client.request("PUT", url, headers=guest["headers"], json={"career_role": "Platform Engineer"})
+    fresh = _get(client, guest, url, **{"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["career_role"] == "Platform Engineer"
+    assert fresh.headers["etag"] != etag
+
+def test_interview_etag_tracks_answers(client, guest, interview):
+    url = f"/api/v1/interviews/{interview['id']}"
+    etag = _get(client, guest, url).headers["etag"]
+    assert _get(client, guest, url, **{"If-None-Match": etag}).status_code == 304
+
+    question = _get(client, guest, url).json()["questions"][0]
+    client.request(
+        "POST", f"{url}/questions/{question['id']}/respond", headers=guest["headers"], json="A revised answer."
+    )
+    fresh = _get(client, guest, url, **{"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["questions"][0]["user_response"] == "A revised answer."
+
+def test_list_etags_track_new_rows(client, guest, interview):
+    for url in ("/api/v1/profiles/", "/api/v1/interviews/"):
+        etag = _get(client, guest, url).headers["etag"]
+        assert _get(client, guest, url, **{"If-None-Match": f'"other", {etag}'}).status_code == 304
+
+    profiles_etag = _get(client, guest, "/api/v1/profiles/").headers["etag"]
+    client.request("POST", "/api/v1/profiles/", headers=guest["headers"], json={
+        "full_name": "Guest User", "career_role": "Engineer", "skills": "[]", "resume_content": "Go",
+    })
+    assert _get(client, guest, "/api/v1/profiles/", **{"If-None-Match": profiles_etag}).status_code == 200
+
+def test_large_responses_are_compressed(client, guest):
+    url = f"/api/v1/profiles/{guest['profile']['id']}"
+    client.request("PUT", url, headers=guest["headers"], json={"resume_content": LONG_RESUME})
+
+    for encoding in ("gzip", "br"):
+        response = _get(client, guest, url, **{"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert int(response.headers["content-length"]) < len(LONG_RESUME) / 10
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json()["resume_content"] == LONG_RESUME
+        etag = response.headers["etag"]
+        assert etag.endswith(f'-{encoding}"')
+        # The encoded variant's tag revalidates too, and the 304 echoes it back
+        cached = _get(client, guest, url, **{"Accept-Encoding": encoding, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+    plain = _get(client, guest, url, **{"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json()["resume_content"] == LONG_RESUME
+
+    small = client.request("GET", "/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+def test_streamed_responses_are_not_buffered(client, guest, interview):
+    response = client.request(
+        "POST", f"/api/v1/interviews/{interview['id']}/feedback", headers={**guest["headers"], "Accept-Encoding": "gzip"},
+        params={"progressive": "true"}
+    )
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
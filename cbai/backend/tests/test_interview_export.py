@@ -0,0 +1,68 @@
+import csv
+import gzip
+import io
+import json
+from sqlalchemy import insert, select
+from app.database import SessionLocal
+from app.models import Interview, InterviewQuestion, User
+
+ANSWER = "I designed and ran Python services on Kubernetes for a payments team. " * 10
+
+def _export(client, guest, **params):
+    return client.request("GET", "/api/v1/interviews/export", headers=guest["headers"], params=params)
+
+def _seed(guest, interviews: int, questions: int):
+    with SessionLocal() as db:
+        user_id = db.scalar(select(User.id).where(User.email == guest["user"]["email"]))
+        ids = db.scalars(insert(Interview).returning(Interview.id), [
+            {"user_id": user_id, "profile_id": guest["profile"]["id"], "job_role": f"Role {n}",
+             "interview_mode": "real", "duration_minutes": 15}
+            for n in range(interviews)
+        ]).all()
+        db.execute(insert(InterviewQuestion), [
+            {"interview_id": interview_id, "question_text": f"Question {n}?", "question_type": "follow_up",
+             "user_response": ANSWER}
+            for interview_id in ids for n in range(questions)
+        ])
+        db.commit()
+
+def test_ndjson_has_one_line_per_interview(client, guest, interview):
+    response = _export(client, guest)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="interviews.ndjson"'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["interview_id"] for line in lines] == [interview["id"]]
+    detail = client.request("GET", f"/api/v1/interviews/{interview['id']}", headers=guest["headers"]).json()
+    assert [q["question_text"] for q in lines[0]["questions"]] == [q["question_text"] for q in detail["questions"]]
+    assert lines[0]["questions"][0]["user_response"] == detail["questions"][0]["user_response"]
+
+def test_csv_has_one_row_per_question(client, guest, interview):
+    client.request("POST", "/api/v1/interviews/", headers=guest["headers"], json={
+        "profile_id": guest["profile"]["id"], "job_role": "Data Engineer", "interview_mode": "real", "duration_minutes": 15,
+    })
+    response = _export(client, guest, format="csv")
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    # Two answered questions, then the new interview with none
+    assert [row["job_role"] for row in rows] == ["Backend Engineer", "Backend Engineer", "Data Engineer"]
+    assert rows[0]["question_id"] and rows[0]["user_response"]
+    assert rows[2]["question_id"] == ""
+
+def test_gzip_export_matches_plain(client, guest, interview):
+    plain = _export(client, guest, format="csv").content
+    compressed = _export(client, guest, format="csv", gzip="true")
+    assert compressed.headers["content-type"] == "application/gzip"
+    assert compressed.headers["content-disposition"] == 'attachment; filename="interviews.csv.gz"'
+    assert gzip.decompress(compressed.content) == plain
+
+def test_export_memory_does_not_grow_with_history(client, guest):
+    # Past the first cursor batch and chunk, memory should level off
+    _seed(guest, 300, 5)
+    medium = client.measure("GET", "/api/v1/interviews/export", headers=guest["headers"], params={"gzip": "true"})
+    _seed(guest, 900, 5)
+    large = client.measure("GET", "/api/v1/interviews/export", headers=guest["headers"], params={"gzip": "true"})
+    exported = gzip.decompress(large.response.content)
+    assert exported.count(b"\n") == 1200
+    assert len(exported) > 4 * 1024 * 1024
+    assert large.peak_kb < medium.peak_kb * 1.25, f"peak {large.peak_kb:.0f} KB vs {medium.peak_kb:.0f} KB"
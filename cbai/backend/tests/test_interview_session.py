@@ -0,0 +1,69 @@
+import pytest
+from starlette.websockets import WebSocketDisconnect
+from app.database import SessionLocal
+from app.models import Interview, InterviewQuestion
+from app.services.interview_session import InterviewSession
+
+def _url(interview, **params):
+    query = "&".join(f"{name}={value}" for name, value in params.items())
+    return f"/api/v1/interviews/{interview['id']}/session" + (f"?{query}" if query else "")
+
+def _close_code(client, url, **kwargs) -> int:
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket(url, **kwargs) as websocket:
+            websocket.receive_json()
+    return closed.value.code
+
+def _next_question(websocket) -> dict:
+    websocket.send_json({"type": "next"})
+    assert websocket.receive_json()["type"] == "question_start"
+    while True:
+        message = websocket.receive_json()
+        if message["type"] == "question_end":
+            return message
+        assert message["type"] == "question_delta"
+
+def test_session_requires_a_known_user(client, guest, interview):
+    assert _close_code(client, _url(interview)) == 4401
+    assert _close_code(client, _url(interview, token="not-a-token")) == 4401
+    # Emails are not accepted in the URL, where they would end up in access logs
+    assert _close_code(client, _url(interview, email=guest["user"]["email"])) == 4401
+    assert _close_code(client, _url(interview), headers={"X-User-Email": "nobody@example.com"}) == 4404
+    assert _close_code(client, _url({"id": interview["id"] + 100}, token=guest["token"])) == 4404
+
+def test_session_persists_questions_answers_and_completion(client, guest, interview):
+    with client.websocket(_url(interview, token=guest["token"])) as websocket:
+        session = websocket.receive_json()
+        assert session["type"] == "session"
+        assert len(session["questions"]) == 2
+
+        question = _next_question(websocket)
+        assert question == {
+            "type": "question_end", "question": "Tell me more about your Backend Engineer work?",
+            "question_type": "follow_up", "index": 2,
+        }
+        websocket.send_json({"type": "answer", "answer": "I split the monolith.", "next": False})
+        assert websocket.receive_json() == {"type": "answer_recorded", "index": 2}
+        websocket.send_json({"type": "complete"})
+        assert websocket.receive_json() == {"type": "completed"}
+
+    with SessionLocal() as db:
+        assert db.get(Interview, interview["id"]).is_completed
+        last = db.query(InterviewQuestion).order_by(InterviewQuestion.id.desc()).first()
+        assert (last.question_type, last.user_response) == ("follow_up", "I split the monolith.")
+    stats = client.request("GET", f"/api/v1/interviews/{interview['id']}/stats", headers=guest["headers"]).json()
+    assert stats["questions_asked"] == stats["questions_answered"] == 3
+    assert stats["completion_seconds"] is not None
+
+def test_failed_write_is_reported_and_closes_the_session(client, guest, interview, monkeypatch):
+    def fail(self, write):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(InterviewSession, "_apply", fail)
+
+    with client.websocket(_url(interview, token=guest["token"])) as websocket:
+        websocket.receive_json()
+        _next_question(websocket)
+        assert websocket.receive_json() == {"type": "error", "fatal": True, "detail": "Could not save the interview"}
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+    assert closed.value.code == 1011
@@ -0,0 +1,107 @@
+import pytest
+from app.database import SessionLocal, engine
+from app.models import InterviewStats, UserStats
+from app.services.interview_stats import backfill, rebuild
+
+def _stats(client, guest, interview=None):
+    url = f"/api/v1/interviews/{interview['id']}/stats" if interview else "/api/v1/interviews/stats"
+    response = client.request("GET", url, headers=guest["headers"])
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def _rebuilt(client, guest, interview):
+    with SessionLocal() as db:
+        rebuild(db)
+        db.commit()
+    return _stats(client, guest), _stats(client, guest, interview)
+
+def _assert_same(incremental, rebuilt):
+    assert incremental.keys() == rebuilt.keys()
+    for name, value in incremental.items():
+        assert value == pytest.approx(rebuilt[name], abs=0.01), name
+
+def test_new_user_has_empty_stats(client, guest):
+    stats = _stats(client, guest)
+    assert stats["interviews_started"] == stats["questions_asked"] == 0
+    assert stats["answer_rate"] is None
+
+def test_stats_follow_questions_answers_and_completion(client, guest, interview):
+    url = f"/api/v1/interviews/{interview['id']}"
+    stats = _stats(client, guest, interview)
+    assert stats["questions_asked"] == stats["questions_answered"] == 2
+    assert stats["answer_rate"] == 1.0
+    assert stats["completion_seconds"] is None
+
+    # A third question left unanswered, and a revised answer that replaces the first
+    client.request("POST", f"{url}/generate-question", headers=guest["headers"], json={
+        "conversation_history": [], "resume_content": "Python", "job_role": "Backend Engineer",
+    })
+    first = client.request("GET", url, headers=guest["headers"]).json()["questions"][0]
+    client.request("POST", f"{url}/questions/{first['id']}/respond", headers=guest["headers"], json="Short.")
+    client.request("POST", f"{url}/complete", headers=guest["headers"])
+
+    stats = _stats(client, guest, interview)
+    assert stats["questions_asked"] == 3
+    assert stats["questions_answered"] == 2
+    assert stats["answer_rate"] == pytest.approx(2 / 3)
+    assert stats["completion_seconds"] >= 0
+    totals = _stats(client, guest)
+    assert totals["interviews_started"] == totals["interviews_completed"] == 1
+    assert totals["questions_asked"] == 3
+
+    incremental = (totals, stats)
+    for current, rebuilt in zip(incremental, _rebuilt(client, guest, interview)):
+        _assert_same(current, rebuilt)
+
+def test_guided_planning_runs_outside_a_transaction(client, guest, fake_groq, monkeypatch):
+    # The interview and its stats are committed before the LLM call, which may take up to its timeout
+    open_transactions = []
+    plan = fake_groq.generate_question_set
+
+    async def generate_question_set(self, *args, **kwargs):
+        connection = engine.raw_connection()
+        open_transactions.append(connection.driver_connection.in_transaction)
+        connection.close()
+        return await plan(self, *args, **kwargs)
+
+    monkeypatch.setattr(fake_groq, "generate_question_set", generate_question_set)
+    response = client.request("POST", "/api/v1/interviews/", headers=guest["headers"], json={
+        "profile_id": guest["profile"]["id"], "job_role": "Backend Engineer", "interview_mode": "guided", "duration_minutes": 15,
+    })
+    assert response.status_code == 200, response.text
+    assert open_transactions == [False]
+    assert _stats(client, guest)["interviews_started"] == 1
+    assert client.request("GET", f"/api/v1/interviews/{response.json()['id']}", headers=guest["headers"]).status_code == 200
+
+def test_deleting_an_interview_removes_it_from_the_totals(client, guest, interview):
+    client.request("POST", "/api/v1/interviews/", headers=guest["headers"], json={
+        "profile_id": guest["profile"]["id"], "job_role": "Data Engineer", "interview_mode": "real", "duration_minutes": 15,
+    })
+    assert _stats(client, guest)["interviews_started"] == 2
+
+    client.request("DELETE", f"/api/v1/interviews/{interview['id']}", headers=guest["headers"])
+    totals = _stats(client, guest)
+    assert totals["interviews_started"] == 1
+    assert totals["questions_asked"] == totals["questions_answered"] == 0
+    assert client.request("GET", f"/api/v1/interviews/{interview['id']}/stats", headers=guest["headers"]).status_code == 404
+
+def test_backfill_builds_stats_for_existing_history(client, guest, interview):
+    # A database upgraded from before the stats tables existed
+    with SessionLocal() as db:
+        db.query(InterviewStats).delete()
+        db.query(UserStats).delete()
+        db.commit()
+    assert backfill() == 1
+    assert _stats(client, guest, interview)["questions_answered"] == 2
+    assert _stats(client, guest)["interviews_started"] == 1
+    # Only once: later starts find the rows in place
+    assert backfill() == 0
+
+def test_other_users_cannot_read_interview_stats(client, guest, interview):
+    client.request("POST", "/api/v1/users/", json={
+        "email": "someone@example.com", "username": "someone", "full_name": "Someone", "password": "s3cret-pass",
+    })
+    response = client.request(
+        "GET", f"/api/v1/interviews/{interview['id']}/stats", headers={"X-User-Email": "someone@example.com"}
+    )
+    assert response.status_code == 404
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import httpx
+import pytest
+from sqlalchemy import text
+from app.core import query_tracking
+from app.core.config import settings
+from app.core.query_tracking import QueryTrackingMiddleware
+from app.database import SessionLocal
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+@pytest.fixture
+def warnings_logged():
+    # The app's loggers hand records to a queue instead of propagating to the root logger
+    handler = _Records()
+    query_tracking.logger.addHandler(handler)
+    yield handler
+    query_tracking.logger.removeHandler(handler)
+
+def _lookup_each_user(count: int):
+    """A bare ASGI app that loads users one query at a time, as an N+1 would"""
+    async def app(scope, receive, send):
+        with SessionLocal() as db:
+            for user_id in range(count):
+                db.execute(text("SELECT email FROM users WHERE id = :id"), {"id": user_id})
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return QueryTrackingMiddleware(app)
+
+def _get(app) -> httpx.Response:
+    async def request():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.get("/users")
+    return asyncio.run(request())
+
+def test_metrics_are_off_unless_enabled(client):
+    assert client.request("GET", "/metrics").status_code == 404
+
+def test_metrics_report_routes_and_database_work(client, guest, interview, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_enabled", True)
+    monkeypatch.setattr(settings, "metrics_token", "scrape-me")
+    assert client.request("GET", "/metrics").status_code == 401
+    assert client.request("GET", "/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.request("GET", "/metrics", headers={"Authorization": "Bearer scrape-me"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    # Labelled by route template, not by the ids in the URL
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/interviews/{interview_id}",status="200"}' in response.text
+    assert f"/api/v1/interviews/{interview['id']}\"" not in response.text
+    assert 'db_queries_per_request_count{route="/api/v1/interviews/{interview_id}/generate-question"}' in response.text
+
+def test_repeated_statements_are_flagged(warnings_logged, monkeypatch):
+    monkeypatch.setattr(settings, "n_plus_one_threshold", 5)
+    response = _get(_lookup_each_user(4))
+    assert (response.headers["x-db-query-count"], response.headers["x-db-repeated-queries"]) == ("4", "0")
+    assert not [r for r in warnings_logged.records if r.getMessage() == "Possible N+1 queries"]
+
+    response = _get(_lookup_each_user(6))
+    assert response.headers["x-db-repeated-queries"] == "1"
+    [flagged] = [r for r in warnings_logged.records if r.getMessage() == "Possible N+1 queries"]
+    assert flagged.fields == {
+        "path": "/users", "queries": 6, "repeated": {"SELECT email FROM users WHERE id = ?": 6},
+    }
+
+def test_slow_queries_are_logged_without_their_values(warnings_logged, monkeypatch):
+    monkeypatch.setattr(settings, "slow_query_ms", 0)
+    with SessionLocal() as db:
+        db.execute(text("SELECT email FROM users WHERE email = :email"), {"email": "ada@example.com"})
+    [slow] = [r for r in warnings_logged.records if r.getMessage() == "Slow query" and "email" in r.fields["statement"]]
+    assert slow.fields["statement"] == "SELECT email FROM users WHERE email = ?"
+    assert slow.fields["parameters"] in (["str"], ("str",))
+    assert "ada@example.com" not in str(slow.fields)
@@ -0,0 +1,54 @@
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.profile_search import parse_query, to_fts5, to_tsquery
+
+def _search(client, guest, q, **params):
+    return client.request("GET", "/api/v1/profiles/search", headers=guest["headers"], params={"q": q, **params})
+
+def _add_profile(client, guest, role, resume):
+    return client.request("POST", "/api/v1/profiles/", headers=guest["headers"], json={
+        "full_name": "Guest User", "career_role": role, "skills": "[]", "resume_content": resume,
+    }).json()
+
+def test_query_rendering():
+    terms = parse_query('kubernetes AND go, "site reliability" OR sre NOT junior kube*')
+    assert to_fts5(terms) == '"kubernetes" AND "go" AND "site reliability" OR "sre" NOT "junior" AND "kube"*'
+    assert to_tsquery(terms) == "'kubernetes' & 'go' & ('site' <-> 'reliability') | 'sre' & ! 'junior' & 'kube':*"
+    assert to_fts5(parse_query('NOT "); DROP TABLE profiles; --')) == '"drop" AND "table" AND "profiles"'
+
+def test_search_ranks_and_tracks_updates(client, guest):
+    senior = _add_profile(client, guest, "Senior SRE", "Kubernetes and Go at scale. Kubernetes operators in Go.")
+    _add_profile(client, guest, "Data Analyst", "SQL, Tableau and a little Go.")
+
+    body = _search(client, guest, "kubernetes AND go, senior").json()
+    assert [r["id"] for r in body["results"]] == [senior["id"]]
+    assert "[Kubernetes]" in body["results"][0]["snippet"]
+
+    assert [r["id"] for r in _search(client, guest, "go").json()["results"]][0] == senior["id"]
+    assert _search(client, guest, "go NOT tableau").json()["total"] == 1
+
+    client.request("PUT", f"/api/v1/profiles/{senior['id']}", headers=guest["headers"], json={"resume_content": "Terraform"})
+    assert _search(client, guest, "operators").json()["total"] == 0
+    assert _search(client, guest, "terraform").json()["total"] == 1
+
+    client.request("DELETE", f"/api/v1/profiles/{senior['id']}", headers=guest["headers"])
+    assert _search(client, guest, "terraform").json()["total"] == 0
+
+def test_search_pagination_and_scope(client, guest):
+    for i in range(5):
+        _add_profile(client, guest, f"Engineer {i}", "Python services")
+    page = _search(client, guest, "python", page=2, page_size=2).json()
+    assert page["total"] == 6  # Including the fixture's profile
+    assert len(page["results"]) == 2
+
+    other = client.request("POST", "/api/v1/auth/guest").json()["access_token"]
+    email = client.request("GET", "/api/v1/auth/me", headers={"Authorization": f"Bearer {other}"}).json()["email"]
+    other_guest = {"headers": {"X-User-Email": email}}
+    assert _search(client, other_guest, "python").json()["total"] == 0
+    with SessionLocal() as db:
+        db.query(User).filter(User.email == email).update({"is_superuser": True})
+        db.commit()
+    assert _search(client, other_guest, "python").json()["total"] == 6
+
+def test_search_rejects_queries_without_terms(client, guest):
+    assert _search(client, guest, "AND , *").status_code == 400
@@ -0,0 +1,42 @@
+from sqlalchemy import event
+from app.database import SessionLocal, engine
+from app.models.skill import ProfileSkill
+from app.services.skill_index import backfill, ensure_skills, profile_ids_with_skills
+
+def _skills(client, guest):
+    return client.request("GET", f"/api/v1/profiles/{guest['profile']['id']}/skills", headers=guest["headers"]).json()
+
+def test_profile_save_indexes_declared_and_resume_skills(client, guest):
+    skills = {s["name"]: s["source"] for s in _skills(client, guest)}
+    assert skills == {"Python": "declared", "Docker": "declared", "FastAPI": "resume", "Kubernetes": "resume"}
+
+def test_update_replaces_links(client, guest):
+    client.request("PUT", f"/api/v1/profiles/{guest['profile']['id']}", headers=guest["headers"], json={
+        "skills": "Go and k8s", "resume_content": "Terraform",
+    })
+    assert {s["name"] for s in _skills(client, guest)} == {"Go", "Kubernetes", "Terraform"}
+
+def test_skill_lookup_and_backfill(client, guest):
+    with SessionLocal() as db:
+        assert profile_ids_with_skills(db, ["python", "k8s"]) == [guest["profile"]["id"]]
+        assert profile_ids_with_skills(db, ["python", "Rust"]) == []
+        db.query(ProfileSkill).delete()
+        db.commit()
+    assert backfill(batch_size=1) == 1
+    assert len(_skills(client, guest)) == 4
+
+def test_skill_added_by_a_concurrent_save_is_reused(client, guest):
+    # Another session commits "Rust" after this one looked for it, just before it inserts it
+    def add_rust(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO skills"):
+            cursor.connection.execute("INSERT INTO skills (name, category) VALUES ('Rust', 'language')")
+    event.listen(engine, "before_cursor_execute", add_rust)
+    try:
+        with SessionLocal() as db:
+            ids = ensure_skills(db, ["Rust", "Elixir"])
+            db.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", add_rust)
+    assert set(ids) == {"Rust", "Elixir"}
+    with SessionLocal() as db:
+        assert ensure_skills(db, ["Rust", "Elixir"]) == ids
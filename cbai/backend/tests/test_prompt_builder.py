@@ -0,0 +1,112 @@
+"""The rendered prompts, pinned per template version.
+
+A failure here means a template's wording changed: bump its version in
+prompt_builder and update the expected text below together.
+"""
+import asyncio
+from app.services import groq_service
+from app.services.groq_service import GroqService
+from app.services.prompt_builder import (
+    build_evaluation_prompt, build_messages, build_question_prompt, build_question_set_prompt
+)
+
+HISTORY = [{"question": "Q1?", "answer": "A1"}]
+
+INTERVIEWER_2 = """\
+You are a world-class interviewer conducting a technical and behavioral interview.
+
+CANDIDATE BACKGROUND:
+- Resume Content: Python dev
+- Target Job Role: Backend Engineer
+- Job Description: Build APIs
+
+INTERVIEW CONTEXT:
+- Here is the full conversation history so far (questions and answers):
+[
+ {
+  "question": "Q1?",
+  "answer": "A1"
+ }
+]
+- For every question, you must generate a follow-up that references specific details from the candidate's resume and/or their previous answers.
+- Do not ask generic questions. Every question should be tailored to the candidate's unique background and the flow of the interview so far.
+- If clarification is needed, ask for it in a way that builds on what the candidate has already said.
+- Only output the next interview question, nothing else."""
+
+QUESTION_SET_1 = """\
+You are a world-class interviewer planning a technical and behavioral interview.
+
+CANDIDATE BACKGROUND:
+- Resume Content: Python dev
+- Target Job Role: Backend Engineer
+
+INTERVIEW PLAN:
+- Write exactly 3 interview questions, in the order they should be asked.
+- Start with an opener about the candidate's background, then move from technical depth to behavioral questions.
+- Every question must reference specific details from the candidate's resume or the job description.
+- Return only a JSON array of strings, nothing else."""
+
+EVALUATOR_2 = """\
+You are an expert technical interviewer and evaluator.
+For each question and answer pair below, provide a brief, constructive feedback on the answer's relevance, completeness, and quality with respect to the question asked.
+If the answer is missing, say 'No answer given.'
+Resume Content: Python dev
+Target Job Role: Backend Engineer
+Return a numbered list of feedback, one for each answer."""
+
+def test_interviewer_prompt():
+    prompt = build_question_prompt("Python dev", "Backend Engineer", "Build APIs", HISTORY)
+    assert (prompt.version, prompt.text) == ("interviewer/2", INTERVIEWER_2)
+    # An empty job description is left out rather than rendered blank
+    first = build_question_prompt("Python dev", "Backend Engineer", "", None).text
+    assert "Job Description" not in first
+    assert "(questions and answers):\n[]\n" in first
+
+def test_question_set_prompt():
+    prompt = build_question_set_prompt("Python dev", "Backend Engineer", 3)
+    assert (prompt.version, prompt.text) == ("question-set/1", QUESTION_SET_1)
+
+def test_evaluation_prompt():
+    prompt = build_evaluation_prompt("Python dev", "Backend Engineer")
+    assert (prompt.version, prompt.text) == ("evaluator/2", EVALUATOR_2)
+
+def test_messages_keep_only_supported_keys():
+    messages = build_messages("system", [{"role": "assistant", "content": "Q1?", "extra": 1}, {"question": "Q2?"}])
+    assert messages == [
+        {"role": "system", "content": "system"},
+        {"role": "assistant", "content": "Q1?"},
+        {"role": "user", "content": ""},
+    ]
+
+def test_generate_question_returns_the_prompt_it_sent(monkeypatch):
+    sent = []
+
+    async def chat_completion(self, payload, purpose):
+        sent.append(payload)
+        return {"choices": [{"message": {"content": " Why FastAPI? "}}]}
+    monkeypatch.setattr(groq_service.GroqService, "_chat_completion", chat_completion)
+
+    service = GroqService()
+    question, prompt = asyncio.run(service.generate_question(
+        "Python dev", "Backend Engineer", "Build APIs", HISTORY, return_prompt=True
+    ))
+    assert question == "Why FastAPI?"
+    assert (prompt.version, prompt.text) == ("interviewer/2", INTERVIEWER_2)
+    assert sent[0]["messages"][0] == {"role": "system", "content": INTERVIEWER_2}
+    assert asyncio.run(service.generate_question("Python dev", "Backend Engineer")) == "Why FastAPI?"
+
+def test_question_endpoint_echoes_the_prompt_on_request(client, guest):
+    headers = guest["headers"]
+    interview = client.request("POST", "/api/v1/interviews/", headers=headers, json={
+        "profile_id": guest["profile"]["id"], "job_role": "Backend Engineer", "interview_mode": "real",
+        "duration_minutes": 15,
+    }).json()
+    url = f"/api/v1/interviews/{interview['id']}/generate-question"
+    body = {"conversation_history": [], "resume_content": "Python dev", "job_role": "Backend Engineer"}
+
+    plain = client.request("POST", url, headers=headers, json=body).json()
+    assert (plain["prompt"], plain["prompt_version"]) == (None, None)
+
+    echoed = client.request("POST", url, headers=headers, json={**body, "include_prompt": True}).json()
+    assert echoed["prompt_version"] == "interviewer/2"
+    assert echoed["prompt"] == build_question_prompt("Python dev", "Backend Engineer").text
@@ -0,0 +1,161 @@
+"""Query and allocation budgets for the API's endpoints.
+
+Each case runs one endpoint against the in-memory database and fails when it
+issues more queries, or allocates more memory, than its budget. Queries are
+counted until the whole body has been read, so streamed responses such as the
+export are measured in full, not just up to their headers. Adding an
+N+1 or an extra round trip to a hot path should break the build: raise a
+budget only when the extra work is intended.
+"""
+import io
+import docx
+import pytest
+from sqlalchemy import update
+from app.database import SessionLocal
+from app.models import User
+
+def _login(client, guest, interview):
+    client.request("POST", "/api/v1/auth/register", json={
+        "email": "ada@example.com", "username": "ada", "full_name": "Ada", "password": "s3cret-pass",
+    })
+    return "POST", "/api/v1/auth/login", {"json": {"email": "ada@example.com", "password": "s3cret-pass"}}
+
+def _docx_resume() -> bytes:
+    document = docx.Document()
+    document.add_paragraph("Experience")
+    document.add_paragraph("Backend engineer, Python and Docker")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def _question_body(guest, history=()):
+    return {
+        "conversation_history": list(history),
+        "resume_content": guest["profile"]["resume_content"],
+        "job_role": "Backend Engineer",
+    }
+
+def _revalidate(url):
+    """Request url again with the ETag of a first fetch, which should answer 304 from the validators alone"""
+    def build(client, guest, interview):
+        etag = client.request("GET", url.format(g=guest, i=interview), headers=guest["headers"]).headers["etag"]
+        return "GET", url.format(g=guest, i=interview), {"headers": {**guest["headers"], "If-None-Match": etag}}
+    return build
+
+def _import(client, guest, interview):
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.email == guest["user"]["email"]).values(is_superuser=True))
+        db.commit()
+    rows = "".join(
+        f"user{n}@example.com,user{n}, User {n},s3cret-pass,Engineer,\"[\"\"Python\"\"]\"\n" for n in range(5)
+    )
+    content = "email,username,full_name,password,career_role,skills\n" + rows
+    return "POST", "/api/v1/users/import", {"headers": guest["headers"], "files": {"file": ("users.csv", content)}}
+
+def _first_question_id(client, guest, interview):
+    return client.request("GET", f"/api/v1/interviews/{interview['id']}", headers=guest["headers"]).json()["questions"][0]["id"]
+
+# name -> (build request(client, guest, interview) -> (method, url, kwargs), max queries, max peak KB)
+CASES = {
+    "auth_register": (
+        lambda c, g, i: ("POST", "/api/v1/auth/register", {"json": {
+            "email": "new@example.com", "username": "new", "full_name": "New", "password": "s3cret-pass"}}),
+        4, 128),
+    "auth_login": (_login, 1, 128),
+    "auth_guest": (lambda c, g, i: ("POST", "/api/v1/auth/guest", {}), 4, 128),
+    "auth_me": (
+        lambda c, g, i: ("GET", "/api/v1/auth/me", {"headers": {"Authorization": f"Bearer {g['token']}"}}),
+        1, 128),
+    "profiles_create": (
+        lambda c, g, i: ("POST", "/api/v1/profiles/", {"headers": g["headers"], "json": {
+            "full_name": "Guest User", "career_role": "Engineer", "skills": "[]", "resume_content": "Python"}}),
+        5, 128),
+    "profiles_list": (lambda c, g, i: ("GET", "/api/v1/profiles/", {"headers": g["headers"]}), 3, 128),
+    "profiles_list_not_modified": (_revalidate("/api/v1/profiles/"), 2, 128),
+    "profiles_get": (
+        lambda c, g, i: ("GET", f"/api/v1/profiles/{g['profile']['id']}", {"headers": g["headers"]}),
+        3, 128),
+    "profiles_get_not_modified": (_revalidate("/api/v1/profiles/{g[profile][id]}"), 2, 128),
+    "profiles_skills": (
+        lambda c, g, i: ("GET", f"/api/v1/profiles/{g['profile']['id']}/skills", {"headers": g["headers"]}),
+        2, 128),
+    "profiles_update_skills": (
+        lambda c, g, i: ("PUT", f"/api/v1/profiles/{g['profile']['id']}", {
+            "headers": g["headers"], "json": {"skills": "[\"Go\", \"k8s\", \"Terraform\"]"}}),
+        8, 128),
+    "profiles_search": (
+        lambda c, g, i: ("GET", "/api/v1/profiles/search", {"headers": g["headers"], "params": {"q": "python AND docker"}}),
+        2, 128),
+    "profiles_update": (
+        lambda c, g, i: ("PUT", f"/api/v1/profiles/{g['profile']['id']}", {
+            "headers": g["headers"], "json": {"career_role": "Platform Engineer"}}),
+        4, 128),
+    "profiles_upload_resume": (
+        lambda c, g, i: ("POST", "/api/v1/profiles/upload-resume", {"files": {"file": (
+            "resume.docx", _docx_resume(),
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}}),
+        0, 4096),
+    "fit_rank_profiles": (
+        lambda c, g, i: ("POST", "/api/v1/fit/rank-profiles", {"headers": g["headers"], "json": {
+            "job_role": "Backend Engineer", "job_description": "Python, FastAPI and Docker services."}}),
+        4, 512),
+    "fit_score_profile": (
+        lambda c, g, i: ("POST", f"/api/v1/fit/profiles/{g['profile']['id']}", {"headers": g["headers"], "json": {
+            "jobs": [{"job_description": "Python, FastAPI and Docker services."}]}}),
+        5, 512),
+    "interviews_create": (
+        lambda c, g, i: ("POST", "/api/v1/interviews/", {"headers": g["headers"], "json": {
+            "profile_id": g["profile"]["id"], "job_role": "Backend Engineer",
+            "interview_mode": "real", "duration_minutes": 15}}),
+        6, 128),
+    "interviews_create_guided": (
+        lambda c, g, i: ("POST", "/api/v1/interviews/", {"headers": g["headers"], "json": {
+            "profile_id": g["profile"]["id"], "job_role": "Backend Engineer",
+            "interview_mode": "guided", "duration_minutes": 15}}),
+        8, 256),
+    "interviews_list": (lambda c, g, i: ("GET", "/api/v1/interviews/", {"headers": g["headers"]}), 3, 128),
+    "interviews_list_not_modified": (_revalidate("/api/v1/interviews/"), 2, 128),
+    "interviews_get": (
+        lambda c, g, i: ("GET", f"/api/v1/interviews/{i['id']}", {"headers": g["headers"]}),
+        4, 128),
+    "interviews_get_not_modified": (_revalidate("/api/v1/interviews/{i[id]}"), 2, 128),
+    "interviews_export": (lambda c, g, i: ("GET", "/api/v1/interviews/export", {"headers": g["headers"]}), 2, 256),
+    "interviews_stats": (lambda c, g, i: ("GET", "/api/v1/interviews/stats", {"headers": g["headers"]}), 2, 128),
+    "interviews_get_stats": (
+        lambda c, g, i: ("GET", f"/api/v1/interviews/{i['id']}/stats", {"headers": g["headers"]}),
+        2, 128),
+    "interviews_generate_question": (
+        lambda c, g, i: ("POST", f"/api/v1/interviews/{i['id']}/generate-question", {
+            "headers": g["headers"], "json": _question_body(g, [{"question": "Q?", "answer": "A."}])}),
+        8, 128),
+    "interviews_respond": (
+        lambda c, g, i: ("POST", f"/api/v1/interviews/{i['id']}/questions/{_first_question_id(c, g, i)}/respond", {
+            "headers": g["headers"], "json": "A longer answer about Python services."}),
+        6, 128),
+    "interviews_complete": (
+        lambda c, g, i: ("POST", f"/api/v1/interviews/{i['id']}/complete", {"headers": g["headers"]}),
+        5, 128),
+    "interviews_feedback": (
+        lambda c, g, i: ("POST", f"/api/v1/interviews/{i['id']}/feedback", {"headers": g["headers"]}),
+        5, 256),
+    "interviews_delete": (
+        lambda c, g, i: ("DELETE", f"/api/v1/interviews/{i['id']}", {"headers": g["headers"]}),
+        6, 256),
+    "profiles_delete": (
+        lambda c, g, i: ("DELETE", f"/api/v1/profiles/{g['profile']['id']}", {"headers": g["headers"]}),
+        8, 256),
+    "users_delete": (lambda c, g, i: ("DELETE", "/api/v1/users/me", {"headers": {"Authorization": f"Bearer {g['token']}"}}), 17, 256),
+    "users_import": (_import, 6, 768),
+}
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_endpoint_budget(name, client, guest, interview):
+    build, max_queries, max_peak_kb = CASES[name]
+    method, url, kwargs = build(client, guest, interview)
+
+    measured = client.measure(method, url, **kwargs)
+
+    assert measured.response.status_code < 400, measured.response.text
+    assert measured.queries <= max_queries, f"{name}: {measured.queries} queries, budget {max_queries}"
+    assert measured.repeated_queries == 0, f"{name}: repeated statement shapes (possible N+1)"
+    assert measured.peak_kb <= max_peak_kb, f"{name}: peak {measured.peak_kb:.0f} KB, budget {max_peak_kb} KB"
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from app import database
+from app.database import ReadRouter
+from app.models import Base
+
+@pytest.fixture
+def replica(monkeypatch):
+    """An empty second database standing in for a replica that has not caught up"""
+    replica_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=replica_engine)
+    router = ReadRouter(replica_engine)
+    monkeypatch.setattr(database, "read_router", router)
+    yield router
+    Base.metadata.drop_all(bind=replica_engine)
+
+def _list_profiles(client, guest):
+    return client.request("GET", "/api/v1/profiles/", headers=guest["headers"])
+
+def test_reads_follow_the_callers_writes(replica, client, guest, cache):
+    # The guest just created a profile on the primary, so their reads stay there
+    assert [p["id"] for p in _list_profiles(client, guest).json()] == [guest["profile"]["id"]]
+
+    # Once the read-your-writes window has passed, reads go to the replica
+    cache.invalidate(f"recent-write:{guest['user']['email']}")
+    assert _list_profiles(client, guest).status_code == 404
+
+    # Writes always use the primary, and pull the caller's reads back to it
+    client.request("PUT", f"/api/v1/profiles/{guest['profile']['id']}", headers=guest["headers"], json={"career_role": "SRE"})
+    assert _list_profiles(client, guest).json()[0]["career_role"] == "SRE"
+
+def test_lagging_replica_falls_back_to_primary(replica, client, guest, cache, monkeypatch):
+    cache.invalidate(f"recent-write:{guest['user']['email']}")
+    monkeypatch.setattr(replica, "replica_lag", lambda: 30.0)
+    assert _list_profiles(client, guest).status_code == 200
+    monkeypatch.setattr(replica, "replica_lag", lambda: None)  # Lag check failed
+    assert _list_profiles(client, guest).status_code == 200
+    monkeypatch.setattr(replica, "replica_lag", lambda: 0.1)
+    assert _list_profiles(client, guest).status_code == 404
+
+def test_replica_lag_is_checked_periodically(replica):
+    assert replica.replica_lag() == 0.0
+    replica._lag = 5.0  # Within the check interval the cached value is reused
+    assert replica.replica_lag() == 5.0
+
+def test_without_a_replica_reads_use_the_primary(client, guest):
+    assert database.read_router.replica_sessions is None
+    assert _list_profiles(client, guest).status_code == 200
+
+def test_interview_session_writes_count_as_the_users(replica, client, guest, interview, cache):
+    email = guest["user"]["email"]
+    cache.invalidate(f"recent-write:{email}")
+    url = f"/api/v1/interviews/{interview['id']}/session?token={guest['token']}"
+    with client.websocket(url) as websocket:
+        websocket.receive_json()
+        websocket.send_json({"type": "complete"})
+        assert websocket.receive_json() == {"type": "completed"}
+    assert database.recently_wrote(email)
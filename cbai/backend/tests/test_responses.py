@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+import orjson
+from app.core.responses import trusted_response
+from app.models import Interview, InterviewQuestion, Profile
+from app.schemas.interview import InterviewWithQuestions
+from app.schemas.profile import ProfileResponse
+
+def test_trusted_response_matches_validated_json():
+    interview = Interview(
+        id=3, user_id=1, profile_id=None, job_role="SRE", job_description=None, interview_mode="real",
+        duration_minutes=15, is_completed=False, started_at=datetime(2024, 5, 1, 9, 30, tzinfo=timezone.utc),
+    )
+    interview.questions = [
+        InterviewQuestion(id=7, interview_id=3, question_text="Why?", question_type="initial",
+                          created_at=datetime(2024, 5, 1, 9, 31, 5, 120000)),
+    ]
+    expected = InterviewWithQuestions.model_validate(interview).model_dump(mode="json")
+    assert orjson.loads(trusted_response(InterviewWithQuestions, interview).body) == expected
+    assert expected["started_at"] == "2024-05-01T09:30:00Z"
+
+    profiles = [
+        Profile(id=1, user_id=1, full_name="A", career_role="Dev", skills="[]", created_at=datetime(2024, 1, 1)),
+        Profile(id=2, user_id=1, full_name="B", career_role="Dev", skills="[]", resume_content="Go",
+                created_at=datetime(2024, 1, 2), updated_at=datetime(2024, 1, 3)),
+    ]
+    expected = [ProfileResponse.model_validate(p).model_dump(mode="json") for p in profiles]
+    assert orjson.loads(trusted_response(ProfileResponse, profiles, many=True).body) == expected
+
+def test_trusted_routes_keep_their_schema(client, guest, interview):
+    body = client.request("GET", f"/api/v1/interviews/{interview['id']}", headers=guest["headers"]).json()
+    assert InterviewWithQuestions.model_validate(body).model_dump(mode="json") == body
+    assert [q["user_response"] for q in body["questions"]] == ["I built the service in Python and deployed it with Docker."] * 2
+
+    profiles = client.request("GET", "/api/v1/profiles/", headers=guest["headers"]).json()
+    assert [ProfileResponse.model_validate(p).model_dump(mode="json") for p in profiles] == profiles
@@ -0,0 +1,66 @@
+from app.services.resume_parser import ResumeParser
+from app.services.resume_sections import segment_resume
+from benchmarks.resume_corpus import make_docx, make_pdf
+
+def test_pdf_reads_every_page_within_budget():
+    parsed = ResumeParser().parse_pdf(make_pdf(5))
+    assert parsed.pages == 5
+    assert not parsed.truncated
+    assert parsed.text.startswith("Jordan Lee")
+
+def test_pdf_stops_at_page_budget():
+    parsed = ResumeParser(max_pages=3).parse_pdf(make_pdf(30))
+    assert parsed.pages == 3
+    assert parsed.truncated
+
+def test_char_budget_truncates_text():
+    parsed = ResumeParser(max_chars=500).parse_pdf(make_pdf(5))
+    assert parsed.truncated
+    assert parsed.pages == 1
+    assert len(parsed.text) <= 500
+
+def test_docx_includes_table_cells():
+    text = ResumeParser().parse_docx(make_docx(1, tables=True)).text
+    assert " | " in text
+    assert len(text.splitlines()) > 40
+
+def test_skills_respect_word_boundaries():
+    skills = ResumeParser().extract_skills("Managed a category of goals and ran a dragon boat team.")
+    assert "Go" not in skills
+    assert "R" not in skills
+    assert "AI" not in skills
+
+def test_skills_resolve_aliases_and_symbols():
+    skills = ResumeParser().extract_skills("Ran k8s clusters, wrote C++ and C# services, built UIs in React.js and Node.js.")
+    assert skills == ["Kubernetes", "C++", "C#", "React", "Node.js"]
+
+def test_short_skills_match_case_exactly():
+    assert ResumeParser().extract_skills("Backend in Go and R; shipped AI features") == ["Go", "R", "AI"]
+    assert ResumeParser().extract_skills("go to market with r&d and ai research") == []
+
+RESUME = """Jordan Lee
+jordan@example.com
+
+SUMMARY
+Backend engineer with experience in distributed systems.
+
+## Work Experience
+Acme Corp - Built billing APIs in Go.
+
+Education
+BSc Computer Science
+
+Skills: Python, Kubernetes
+Projects
+Open-source Redis client
+"""
+
+def test_segmenter_returns_every_section_with_offsets():
+    sections = segment_resume(RESUME)
+    assert [s.kind for s in sections] == ["experience", "education", "skills", "projects"]
+    experience = sections[0]
+    assert RESUME[experience.start:experience.end].strip() == "Acme Corp - Built billing APIs in Go."
+    assert RESUME[sections[2].start:sections[2].end].strip() == "Python, Kubernetes"
+
+def test_extract_experience_ignores_experience_mentioned_in_prose():
+    assert ResumeParser().extract_experience(RESUME) == "Acme Corp - Built billing APIs in Go."
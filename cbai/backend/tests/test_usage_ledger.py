@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import func, select, update
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models import LLMUsage, User
+from app.services.usage_ledger import tokens_used, usage_ledger
+
+@pytest.fixture
+def ledger():
+    yield usage_ledger
+    # Records left pending would be flushed into the next test's database
+    with usage_ledger._lock:
+        usage_ledger._pending.clear()
+
+def _user_id(email: str) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(User.id).where(User.email == email))
+
+def _next_question(client, guest, interview):
+    return client.request("POST", f"/api/v1/interviews/{interview['id']}/generate-question", headers=guest["headers"], json={
+        "conversation_history": [],
+        "resume_content": guest["profile"]["resume_content"],
+        "job_role": "Backend Engineer",
+    })
+
+def test_flushed_records_sum_per_user(client, guest, ledger):
+    client.request("POST", "/api/v1/auth/register", json={
+        "email": "ada@example.com", "username": "ada", "full_name": "Ada", "password": "s3cret-pass",
+    })
+    guest_id, user_id = _user_id(guest["user"]["email"]), _user_id("ada@example.com")
+    for tokens in (120, 80):
+        ledger.record(guest_id, None, "test", "question", {"prompt_tokens": tokens - 20, "completion_tokens": 20,
+                                                           "total_tokens": tokens}, 5.0)
+    ledger.record(user_id, None, "test", "feedback", {"total_tokens": 1000}, 5.0)
+
+    with SessionLocal() as db:
+        # Pending records already count towards the quota
+        assert (tokens_used(db, guest_id), tokens_used(db, user_id)) == (200, 1000)
+        ledger.flush()
+        assert (tokens_used(db, guest_id), tokens_used(db, user_id)) == (200, 1000)
+        totals = dict(db.execute(
+            select(LLMUsage.user_id, func.sum(LLMUsage.total_tokens)).group_by(LLMUsage.user_id)
+        ).all())
+        assert totals == {guest_id: 200, user_id: 1000}
+        assert db.scalar(select(func.sum(LLMUsage.completion_tokens)).where(LLMUsage.user_id == guest_id)) == 40
+
+def test_over_quota_is_refused_with_429(client, guest, interview, ledger):
+    guest_id = _user_id(guest["user"]["email"])
+    ledger.record(guest_id, interview["id"], "test", "question", {"total_tokens": settings.llm_guest_token_quota}, 5.0)
+    response = _next_question(client, guest, interview)
+    assert response.status_code == 429
+    assert str(settings.llm_guest_token_quota) in response.json()["detail"]
+
+    # Still refused once written, and registered users get the larger quota
+    ledger.flush()
+    assert _next_question(client, guest, interview).status_code == 429
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.id == guest_id).values(is_guest=False))
+        db.commit()
+    assert _next_question(client, guest, interview).status_code == 200